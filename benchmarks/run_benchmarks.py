@@ -0,0 +1,356 @@
+"""Benchmark suite for the Numerical Integration Toolbox.
+
+Times every rule in source/ over a matrix of integrand classes, orders n, tolerances and batch sizes, and reports
+the wall time, number of function evaluations and achieved error of each case.
+
+    python benchmarks/run_benchmarks.py                          # run everything, print a table
+    python benchmarks/run_benchmarks.py --quick -k adaptive      # smaller matrix, only cases matching 'adaptive'
+    python benchmarks/run_benchmarks.py --save baseline.json     # store a baseline
+    python benchmarks/run_benchmarks.py --compare baseline.json  # flag regressions against it (exit status 1)
+
+A case regresses if it became slower than 'time_threshold' times its baseline (ignoring cases faster than
+'min_time' in both runs, which are dominated by noise), needs more function evaluations, or its achieved error
+grew beyond 'error_threshold' times the baseline error (errors below 'error_floor' count as exact).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict
+from typing import Any, Callable
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import source  # noqa: E402
+from source import lambdify_cache  # noqa: E402
+
+
+class Counted:
+    """Wraps an integrand and counts the number of points it is evaluated at, for array and scalar calls."""
+
+    def __init__(self, f: Callable):
+        self.f = f
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += int(np.size(args[0]))
+        return self.f(*args)
+
+
+class CountedAsync(Counted):
+    """Async version of Counted."""
+
+    async def __call__(self, *args):
+        self.count += int(np.size(args[0]))
+        await asyncio.sleep(0)
+        return self.f(*args)
+
+
+@dataclass
+class Integrand:
+    """One integrand class. 'make' returns a fresh integrand: a callable, or a SymPy expression for 'sympy'."""
+    name: str
+    make: Callable[[], Any]
+    a: float
+    b: float
+    exact: float
+    vectorized: bool = True  # accepts arrays of abscissae
+
+
+def _sympy_exp_cos():
+    import sympy
+    x = sympy.Symbol('x')
+    return sympy.exp(x) * sympy.cos(x)
+
+
+INTEGRANDS = [
+    Integrand('numpy', lambda: np.exp, 0.0, 1.0, math.e - 1),
+    Integrand('scalar', lambda: math.exp, 0.0, 1.0, math.e - 1, vectorized=False),
+    Integrand('sympy', _sympy_exp_cos, 0.0, 1.0, (math.e * (math.cos(1) + math.sin(1)) - 1) / 2),
+    Integrand('oscillatory', lambda: (lambda x: np.cos(50 * np.asarray(x))), 0.0, 1.0, math.sin(50) / 50),
+    Integrand('singular', lambda: np.sqrt, 0.0, 1.0, 2 / 3),  # derivative singular at 0
+]
+
+
+@dataclass
+class Case:
+    """A single benchmark: 'run(f)' integrates f and returns the value compared with 'exact'."""
+    name: str
+    integrand: str
+    params: dict
+    run: Callable[[Any], Any]
+    make: Callable[[], Any]
+    exact: Any
+
+    @property
+    def key(self) -> str:
+        params = ','.join(f'{k}={v}' for k, v in self.params.items())
+        return f'{self.name}|{self.integrand}|{params}'
+
+
+@dataclass
+class Measurement:
+    time: float | None = None
+    evals: int | None = None
+    error: float | None = None
+    status: str = 'ok'
+
+
+def _counted(f, is_async: bool = False):
+    """Compiles SymPy expressions first, so their evaluations can be counted too."""
+    f = lambdify_cache.as_callable(f)
+    return CountedAsync(f) if is_async else Counted(f)
+
+
+def _scalar(value) -> float:
+    """Extracts the integral from the return value of a rule (float, (value, error), result object or table)."""
+    if isinstance(value, tuple):
+        value = value[0]
+    if hasattr(value, 'estimate'):
+        value = value.estimate
+    value = np.asarray(value, dtype=float)
+    return float(value[-1, -1]) if value.ndim == 2 else value
+
+
+def build_cases(quick: bool = False) -> list[Case]:
+    """The benchmark matrix."""
+    orders = (4, 16) if quick else (4, 16, 64, 256)
+    tolerances = (1e-6,) if quick else (1e-4, 1e-8, 1e-12)
+    batch_sizes = (100,) if quick else (1, 100, 10_000)
+    cases = []
+
+    def add(name, integrand, params, run, exact=None):
+        cases.append(Case(name, integrand.name, params, run, integrand.make,
+                          integrand.exact if exact is None else exact))
+
+    def add_integrand(integrand):
+        a, b = integrand.a, integrand.b
+
+        for name in ('midpoint', 'trapezoidal', 'simpson'):
+            add(name, integrand, {}, lambda f, fun=getattr(source, name): fun(f, a, b))
+
+        for n in orders:
+            for name in ('composite_midpoint', 'composite_trapezoid', 'gauss_legendre', 'clenshaw_curtis', 'fejer'):
+                add(name, integrand, {'n': n}, lambda f, fun=getattr(source, name), n=n: fun(f, a, b, n))
+            add('composite_simpson', integrand, {'n': n}, lambda f, n=n: source.composite_simpson(f, a, b, n))
+
+        for n in (7, 15, 30):
+            add('gauss_kronrod', integrand, {'n': n}, lambda f, n=n: source.gauss_kronrod(f, a, b, n))
+
+        for n in ((4, 8) if quick else (4, 8, 12)):
+            add('romberg', integrand, {'n': n}, lambda f, n=n: source.romberg(f, a, b, n))
+
+        for tol in tolerances:
+            add('romberg_incremental', integrand, {'tol': tol},
+                lambda f, tol=tol: source.romberg_incremental(f, a, b, tol))
+            for name in ('clenshaw_curtis_incremental', 'fejer_incremental'):
+                add(name, integrand, {'tol': tol}, lambda f, fun=getattr(source, name), tol=tol: fun(f, a, b, tol))
+            for name in ('adaptive_simpson', 'adaptive_trapezoidal', 'adaptive_midpoint',
+                         'adaptive_composite_simpson'):
+                for mode in ('local', 'global', 'sweep'):
+                    if name == 'adaptive_midpoint' and tol < 1e-8:
+                        continue  # needs millions of evaluations
+                    add(name, integrand, {'tol': tol, 'mode': mode},
+                        lambda f, fun=getattr(source, name), tol=tol, mode=mode: fun(f, a, b, tol, mode=mode))
+            for rule in ('gauss_legendre', 'gauss_kronrod'):
+                add('global_adaptive', integrand, {'tol': tol, 'rule': rule},
+                    lambda f, tol=tol, rule=rule: source.global_adaptive(f, a, b, tol, rule=rule))
+
+        # Batch rules: one integrand over many intervals [a, a + k (b - a) / size]
+        for size in batch_sizes:
+            upper = a + (b - a) * np.arange(1, size + 1) / size
+            exact = _batch_exact(integrand, upper)
+            for name in ('batch_simpson', 'batch_midpoint'):
+                add(name, integrand, {'intervals': size}, lambda f, fun=getattr(source, name), upper=upper:
+                    fun(f, a, upper), exact)
+            for name in ('batch_composite_simpson', 'batch_gauss_legendre'):
+                add(name, integrand, {'intervals': size, 'n': 16}, lambda f, fun=getattr(source, name), upper=upper:
+                    fun(f, a, upper, 16), exact)
+
+        # Many independent integrals through a thread pool
+        for size in batch_sizes[:2]:
+            add('integrate_many', integrand, {'jobs': size, 'method': 'gauss_kronrod'},
+                lambda f, size=size: source.integrate_many([(f, a, b)] * size, method='gauss_kronrod',
+                                                           executor='thread', max_workers=4),
+                [(integrand.exact, 0.0)] * size)
+
+        # Async counterparts awaited with a concurrency limit, one point or one batch per call
+        for batch_size in (None, 64):
+            if batch_size is not None and not integrand.vectorized:
+                continue  # a batch is one call with an array of abscissae
+            add('gauss_legendre_async', integrand, {'n': 64, 'batch_size': batch_size},
+                lambda f, bs=batch_size: asyncio.run(source.gauss_legendre_async(f, a, b, 64, batch_size=bs)))
+            add('adaptive_async', integrand, {'tol': 1e-8, 'batch_size': batch_size},
+                lambda f, bs=batch_size: asyncio.run(source.adaptive_async(f, a, b, 1e-8, batch_size=bs)))
+
+    for integrand in INTEGRANDS:
+        add_integrand(integrand)
+
+    # Double integrals: exp(x + y) over the unit square, and over the triangle 0 <= x <= y <= 1
+    for n in orders[:3]:
+        square = Integrand('numpy2d', lambda: (lambda x, y: np.exp(x + y)), 0.0, 1.0, (math.e - 1) ** 2)
+        add('double_gauss_legendre', square, {'n': n},
+            lambda f, n=n: source.double_gauss_legendre(f, 0, 1, 0, 1, n, n))
+        triangle = Integrand('numpy2d_triangle', square.make, 0.0, 1.0, (math.e - 1) ** 2 / 2)
+        add('double_gauss_legendre', triangle, {'n': n},
+            lambda f, n=n: source.double_gauss_legendre(f, 0, 1, 0, lambda y: y, n, n))
+
+    # Sampled data, streamed in chunks: samples of exp on [0, 1]
+    for size in ((10_001,) if quick else (10_001, 1_000_001)):
+        for chunk_size in (1_000, 1 << 20):
+            sampled = Integrand(f'samples{size}', lambda size=size: np.exp(np.linspace(0, 1, size)), 0.0, 1.0,
+                                math.e - 1)
+            params = {'samples': size, 'chunk_size': chunk_size}
+            dx = 1 / (size - 1)
+            add('sampled_trapezoid', sampled, params,
+                lambda y, dx=dx, cs=chunk_size: source.sampled_trapezoid(y, dx=dx, chunk_size=cs))
+            add('sampled_simpson', sampled, params,
+                lambda y, dx=dx, cs=chunk_size: source.sampled_simpson(y, dx=dx, chunk_size=cs))
+            add('cumulative_trapezoid', sampled, params,
+                lambda y, dx=dx, cs=chunk_size: source.cumulative_trapezoid(y, dx=dx, chunk_size=cs)[-1])
+
+    return cases
+
+
+def _batch_exact(integrand: Integrand, upper: np.ndarray) -> np.ndarray:
+    """Exact integrals of an integrand class from integrand.a to every upper limit."""
+    a = integrand.a
+    antiderivatives = {
+        'numpy': np.exp, 'scalar': np.exp,
+        'sympy': lambda x: np.exp(x) * (np.cos(x) + np.sin(x)) / 2,
+        'oscillatory': lambda x: np.sin(50 * x) / 50,
+        'singular': lambda x: 2 / 3 * x ** 1.5,
+    }
+    F = antiderivatives[integrand.name]
+    return F(upper) - F(a)
+
+
+def measure(case: Case, repeat: int) -> Measurement:
+    """Runs a case: one counted run for evaluations and error, then the best wall time of 'repeat' timed runs.
+
+        The counted run gets a wrapper that counts evaluation points, the timed runs the integrand as the user
+        would pass it (e.g. a SymPy expression). The counted run also warms the node and lambdify caches, so the
+        timings are steady-state figures.
+    """
+    is_async = 'async' in case.name
+    result = Measurement()
+    try:
+        f = case.make()
+        if callable(f) or not isinstance(f, np.ndarray):
+            f = _counted(f, is_async)
+        value = case.run(f)
+        result.evals = getattr(f, 'count', None)
+
+        if case.name == 'integrate_many':
+            value = np.array([_scalar(v) for v in value])
+            exact = np.array([e for e, _ in case.exact])
+        elif case.name.startswith('batch_'):
+            exact = case.exact
+        else:
+            value = _scalar(value)
+            exact = case.exact
+        result.error = float(np.max(np.abs(np.asarray(value) - exact)))
+
+        times = []
+        for _ in range(repeat):
+            f = case.make()
+            if is_async and callable(f):
+                f = CountedAsync(f)  # coroutine function wrapping the synchronous integrand
+            start = time.perf_counter()
+            case.run(f)
+            times.append(time.perf_counter() - start)
+        result.time = min(times)
+    except Exception as exc:  # a failing case is reported, not fatal
+        result.status = f'{type(exc).__name__}: {exc}'[:120]
+
+    return result
+
+
+def compare(current: dict, baseline: dict, time_threshold: float, error_threshold: float, error_floor: float,
+            min_time: float) -> list[str]:
+    """Lists the regressions of 'current' against 'baseline' (both mapping case keys to measurements)."""
+    regressions = []
+    for key, new in current.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        if old['status'] == 'ok' and new['status'] != 'ok':
+            regressions.append(f'{key}: now fails ({new["status"]})')
+            continue
+        if new['status'] != 'ok' or old['status'] != 'ok':
+            continue
+        if max(new['time'], old['time']) >= min_time and new['time'] > time_threshold * old['time']:
+            regressions.append(f'{key}: time {old["time"]:.3g}s -> {new["time"]:.3g}s')
+        if old['evals'] is not None and new['evals'] is not None and new['evals'] > old['evals']:
+            regressions.append(f'{key}: evaluations {old["evals"]} -> {new["evals"]}')
+        if new['error'] > max(error_threshold * old['error'], error_floor):
+            regressions.append(f'{key}: error {old["error"]:.3g} -> {new["error"]:.3g}')
+
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', '--filter', default='', help='only run cases whose key contains this substring')
+    parser.add_argument('--quick', action='store_true', help='smaller matrix of orders, tolerances and sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case, the best one is kept')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='flag regressions against a JSON baseline')
+    parser.add_argument('--time-threshold', type=float, default=1.5)
+    parser.add_argument('--error-threshold', type=float, default=10.0)
+    parser.add_argument('--error-floor', type=float, default=1e-13)
+    parser.add_argument('--min-time', type=float, default=1e-3)
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f'{"case":<90} {"time [s]":>10} {"evals":>9} {"error":>10}')
+    for case in build_cases(args.quick):
+        if args.filter not in case.key:
+            continue
+        measurement = measure(case, args.repeat)
+        results[case.key] = asdict(measurement)
+        if measurement.status == 'ok':
+            evals = '-' if measurement.evals is None else measurement.evals
+            print(f'{case.key:<90} {measurement.time:>10.3g} {evals:>9} {measurement.error:>10.2e}')
+        else:
+            print(f'{case.key:<90} {measurement.status}')
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=1)
+        print(f'\nSaved {len(results)} results to {args.save}')
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline['results'], args.time_threshold, args.error_threshold,
+                              args.error_floor, args.min_time)
+        print(f'\n{len(regressions)} regression(s) against {args.compare}')
+        for line in regressions:
+            print(f'  {line}')
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Numerical Integration Toolbox.
+
+Every rule is importable from the package root, e.g. ``from source import gauss_legendre``. Modules are only
+loaded the first time one of their functions is accessed, and SymPy is only loaded once a SymPy expression is
+actually passed to a rule.
+
+Most rules live in a submodule of the same name (source.gauss_legendre defines gauss_legendre). The package
+attribute is always the function, so ``import source.gauss_legendre as gl`` binds the function too. Reach such a
+module through ``importlib.import_module('source.gauss_legendre')`` or ``sys.modules``, or import from it directly
+(``from source.gauss_legendre import gauss_legendre``).
+"""
+import importlib
+import sys
+import types
+
+# Public name -> module that defines it
+_LAZY_ATTRS = {
+    'adaptive_composite_simpson': 'adaptive_composite_simpson',
+    'adaptive_midpoint': 'adaptive_midpoint',
+    'adaptive_simpson': 'adaptive_simpson',
+    'adaptive_trapezoidal': 'adaptive_trapezoid',
+    'clenshaw_curtis': 'clenshaw_curtis',
+    'clenshaw_curtis_incremental': 'clenshaw_curtis',
+    'composite_midpoint': 'composite_midpoint',
+    'composite_simpson': 'composite_simpson',
+    'composite_trapezoid': 'composite_trapezoid',
+    'double_gauss_legendre': 'double_gauss_legendre',
+    'tensor_gauss_legendre': 'cubature',
+    'smolyak': 'cubature',
+    'adaptive_cubature': 'adaptive_cubature',
+    'quasi_monte_carlo': 'monte_carlo',
+    'fejer': 'fejer',
+    'fejer_incremental': 'fejer',
+    'gauss_kronrod': 'gauss_kronrod',
+    'gauss_legendre': 'gauss_legendre',
+    'gauss_laguerre': 'gauss_laguerre',
+    'gauss_hermite': 'gauss_hermite',
+    'global_adaptive': 'global_adaptive',
+    'midpoint': 'midpoint',
+    'romberg': 'romberg',
+    'romberg_incremental': 'romberg',
+    'simpson': 'simpson',
+    'trapezoidal': 'trapezoidal',
+    'batch_midpoint': 'batch',
+    'batch_trapezoidal': 'batch',
+    'batch_simpson': 'batch',
+    'batch_composite_midpoint': 'batch',
+    'batch_composite_trapezoid': 'batch',
+    'batch_composite_simpson': 'batch',
+    'batch_gauss_legendre': 'batch',
+    'sampled_trapezoid': 'sampled',
+    'sampled_simpson': 'sampled',
+    'cumulative_trapezoid': 'sampled',
+    'integrate_many': 'parallel',
+    'gauss_legendre_async': 'async_integration',
+    'composite_simpson_async': 'async_integration',
+    'adaptive_async': 'async_integration',
+    'integrate': 'integrate',
+    'IntegrationResult': 'result',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+class _LazyModule(types.ModuleType):
+    """Package module type. Most rules live in a submodule of the same name, and importing a submodule binds
+    it as an attribute of the package; this keeps the function bound under that name instead, so that
+    ``from source import gauss_legendre`` gives the function whichever modules were imported before. The
+    submodule stays in sys.modules.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and _LAZY_ATTRS.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __getattr__(self, name):
+        if name in _LAZY_ATTRS:
+            module = importlib.import_module(f'{__name__}.{_LAZY_ATTRS[name]}')
+            value = getattr(module, name)
+            setattr(self, name, value)  # later lookups skip __getattr__
+            return value
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(__all__))
+
+
+sys.modules[__name__].__class__ = _LazyModule
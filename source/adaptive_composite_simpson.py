@@ -1,47 +1,44 @@
-from typing import Callable
-from sympy import Expr
-import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
+from __future__ import annotations
 
-from source.composite_simpson import composite_simpson
+from typing import TYPE_CHECKING, Callable
 
+from source.lambdify_cache import as_callable
+from source.transforms import transform_interval
+from source.adaptive_engine import composite_simpson_rule, adaptive_integrate, MAX_DEPTH, MAX_EVALS
+from source.result import IntegrationResult
+from source.instrumentation import instrumented
 
-def _adapt_composite_simpson_inner(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float,
-                                   tol: float, int_input: float, n: int) -> float:
-    """(Experimental) Inner function that is used for the recursion in adaptive_composite_simpson.
-    """
-    # Evaluate left and right integrals at midpoint c
-    c = (a + b) / 2
-
-    left_int = composite_simpson(f, a, c, n)
-    right_int = composite_simpson(f, c, b, n)
-    whole_int = left_int + right_int
-    delta = whole_int - int_input
-
-    # Check if error is within desired tolerance, else recursion process
-    if abs(delta) <= 15 * tol:
-        return whole_int + delta / 15
-    else:
-        tol /= 2
-        left_res = _adapt_composite_simpson_inner(f, a, c, tol, left_int, n)
-        right_res = _adapt_composite_simpson_inner(f, c, b, tol, right_int, n)
-        return left_res + right_res
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    import sympy
 
 
+@instrumented
 def adaptive_composite_simpson(f: sympy.Expr | Callable[[float], float], a: float, b: float, tol: float,
-                               n: int = 10) -> float:
-    """Adaptive Composite Simpson's integral approximation. Requires composite_simpson function.
+                               n: int = 10, max_depth: int = MAX_DEPTH, max_evals: int | None = MAX_EVALS,
+                               min_width: float = 0.0, mode: str = 'local', full_output: bool = False,
+                               executor: Executor | None = None) -> float | IntegrationResult:
+    """Adaptive Composite Simpson's integral approximation. Function values are reused across subdivisions.
 
         Parameters:
             f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
-            a (int | float): The lower limit of integration
-            b (int | float): The upper limit of integration
+            a (int | float): The lower limit of integration, may be -np.inf
+            b (int | float): The upper limit of integration, may be np.inf
             tol (int | float): The desired tolerance of the approximation
             n (int = 10): Number of iterations for initial approximation. Default is 10.
+            max_depth (int = MAX_DEPTH): Maximum number of successive bisections. Default is 50.
+            max_evals (int | None = MAX_EVALS): Budget of evaluations of f, None for no limit. Default is 10**6.
+            min_width (float = 0.0): Subintervals narrower than this are not split further
+            mode (str = 'local'): 'local' refines depth-first, halving the tolerance at every split. 'global' always
+                refines the subinterval with the largest error estimate until their sum meets the tolerance. 'sweep'
+                refines like 'local', but level by level, evaluating f at the new points of all pending
+                subintervals in one call.
+            full_output (bool = False): Return an IntegrationResult (value, error estimate, evaluation count,
+                convergence flag) instead of a float
+            executor (Executor | None = None): In 'sweep' mode, spread each batched evaluation over this pool
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -58,9 +55,14 @@ def adaptive_composite_simpson(f: sympy.Expr | Callable[[float], float], a: floa
         raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
+
+    # Map infinite limits onto a finite interval
+    f, a, b = transform_interval(f, a, b)
 
-    int_input = composite_simpson(f, a, b, n)
+    # Compare each estimate with the sum of its halves (with a factor of 15 applied)
+    rule = composite_simpson_rule(n)
+    result = adaptive_integrate(f, a, b, tol, rule, max_depth, max_evals, min_width, mode, executor)
+    result.method = 'adaptive_composite_simpson'
 
-    return _adapt_composite_simpson_inner(f, a, b, tol, int_input, n)
+    return result if full_output else result.value
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+import heapq
+import itertools
+
+import numpy as np
+
+from source.node_cache import get_nodes
+from source.vectorize import evaluate, probe
+from source.double_gauss_legendre import checkfun
+from source.lambdify_cache import as_callable, is_sympy_expr
+from source.gauss_kronrod import _EPMACH, _UFLOW
+from source.adaptive_engine import MAX_DEPTH, MAX_EVALS
+from source import instrumentation
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+
+class _TensorKronrod:
+    """Tensor product of G(n)K(2n+1) with itself on [-1, 1]^2, (2n + 1)^2 points per cell. The product of the Gauss
+    rules is embedded in it, and so are the mixed products (Gauss along one axis, Kronrod along the other), which
+    tell along which axis a cell is least resolved.
+    """
+
+    def __init__(self, n: int):
+        nodes, (kronrod, gauss) = get_nodes('kronrod', n)
+        s, t = np.meshgrid(nodes, nodes, indexing='ij')
+        self.s, self.t = s.ravel(), t.ravel()
+        self.kk = np.outer(kronrod, kronrod).ravel()
+        self.gg = np.outer(gauss, gauss).ravel()
+        self.gk = np.outer(gauss, kronrod).ravel()  # Gauss along s
+        self.kg = np.outer(kronrod, gauss).ravel()  # Gauss along t
+
+    def __len__(self):
+        return len(self.kk)
+
+    def points(self, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Nodes of every cell (s0, s1, t0, t1), one row per cell."""
+        s0, s1, t0, t1 = cells.T
+        s = 0.5 * (s0 + s1)[:, None] + 0.5 * (s1 - s0)[:, None] * self.s
+        t = 0.5 * (t0 + t1)[:, None] + 0.5 * (t1 - t0)[:, None] * self.t
+        return s, t
+
+    def combine(self, cells: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Estimates, error estimates and split axes (0 for s, 1 for t) of every cell from its values."""
+        area = 0.25 * (cells[:, 1] - cells[:, 0]) * (cells[:, 3] - cells[:, 2])
+        area = area.reshape((-1,) + (1,) * (values.ndim - 2))
+
+        contract = lambda weights: np.tensordot(values, weights, axes=([1], [0]))
+        kk = contract(self.kk)
+
+        # QUADPACK's error estimate, per component, with the mean of f over the cell in place of resk / 2
+        resabs = area * np.tensordot(np.abs(values), self.kk, axes=([1], [0]))
+        resasc = area * np.tensordot(np.abs(values - kk[:, None] / 4), self.kk, axes=([1], [0]))
+        error = np.abs(area * (kk - contract(self.gg)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaled = resasc * np.minimum(1.0, (200 * error / resasc) ** 1.5)
+        error = np.where((resasc != 0) & (error != 0), scaled, error)
+        error = np.where(resabs > _UFLOW / (50 * _EPMACH), np.maximum(50 * _EPMACH * resabs, error), error)
+
+        # Largest over the components of a vector-valued f
+        norm = lambda array: np.abs(array).reshape(len(cells), -1).max(axis=1)
+        axes = (norm(kk - contract(self.gk)) < norm(kk - contract(self.kg))).astype(int)
+
+        return area * kk, norm(error), axes
+
+
+def _region_values(f: Callable, c, d, a: float, b: float, s: np.ndarray, t: np.ndarray,
+                   vectorized: bool | None) -> tuple[np.ndarray, bool | None]:
+    """Helper function. f times the jacobian at the points (s, t) of [-1, 1]^2, mapped onto the region
+    a <= y <= b, c(y) <= x <= d(y), all in one call of f. Also returns whether f accepted the array call.
+    """
+    y = 0.5 * (b - a) * t + 0.5 * (b + a)
+    lo = evaluate(c, y, vectorized=vectorized) if callable(c) else np.full(y.shape, float(c))
+    hi = evaluate(d, y, vectorized=vectorized) if callable(d) else np.full(y.shape, float(d))
+    x = 0.5 * (hi - lo) * s + 0.5 * (hi + lo)
+    jacobian = 0.25 * (b - a) * (hi - lo)
+
+    values, vectorized = probe(f, x, y, vectorized=vectorized)
+    return jacobian.reshape(jacobian.shape + (1,) * (values.ndim - jacobian.ndim)) * values, vectorized
+
+
+@instrumented
+def adaptive_cubature(f: sympy.Expr | Callable[[float, float], float],
+                      a: int | float, b: int | float,
+                      c: Callable[[float], float] | int | float,
+                      d: Callable[[float], float] | int | float,
+                      tol: float, n: int = 7, max_depth: int = MAX_DEPTH, max_evals: int | None = MAX_EVALS,
+                      vectorized: bool | None = None, full_output: bool = False) -> float | IntegrationResult:
+    """Globally adaptive double integral approximation over a <= y <= b, c(y) <= x <= d(y).
+
+        The region is mapped onto a square, which is split into cells. Each cell is estimated with the tensor
+        product of G(n)K(2n+1), with the QUADPACK error estimate from the embedded Gauss product. Cells are kept in a
+        heap by error estimate; every sweep bisects the fewest worst cells whose errors, once removed, would bring
+        the total within 'tol', along the axis where the cell is least resolved, and evaluates f at the nodes of all
+        their halves in one call. Limits follow double_gauss_legendre.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float, float], float]): A SymPy expression or lambda expression of x and y
+            a (int | float): The lower limit of integration for the outer integral
+            b (int | float): The upper limit of integration for the outer integral
+            c (Callable[[float], float] | int | float): The lower limit of integration for the inner integral
+            d (Callable[[float], float] | int | float): The upper limit of integration for the inner integral
+            tol (int | float): The desired tolerance of the approximation
+            n (int = 7): Order of the embedded Gauss rule along each axis, (2n + 1)^2 evaluations per cell
+            max_depth (int = MAX_DEPTH): Maximum number of successive bisections of a cell. Default is 50.
+            max_evals (int | None = MAX_EVALS): Budget of evaluations of f, None for no limit. Default is 10**6.
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult (value, error estimate, evaluation count,
+                number of cells, convergence flag) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    if isinstance(d, (int, float)) and isinstance(c, (int, float)):
+        if c > d:
+            raise InvalidIntervalException("The upper limit 'd' must be greater than the lower limit 'c'.")
+
+    if max_depth < 0 or not isinstance(max_depth, int):
+        raise ValueError("'max_depth' must be a non-negative integer.")
+
+    rule = _TensorKronrod(n)
+
+    if max_evals is not None and max_evals < len(rule):
+        raise ValueError(f"'max_evals' must allow at least one cell of {len(rule)} evaluations.")
+
+    # Ensure the functions are evaluated as lambda expressions
+    f = checkfun(f, 2)
+    c = as_callable(c, 'y', instrument=False) if callable(c) or is_sympy_expr(c) else c
+    d = as_callable(d, 'y', instrument=False) if callable(d) or is_sympy_expr(d) else d
+
+    def estimate(cells: np.ndarray):
+        nonlocal vectorized, n_evals
+        s, t = rule.points(cells)
+        values, flag = _region_values(f, c, d, a, b, s.ravel(), t.ravel(), vectorized)
+        if vectorized is None:
+            vectorized = flag
+        n_evals += values.shape[0]
+        return rule.combine(cells, values.reshape(s.shape + values.shape[1:]))
+
+    n_evals = 0
+    cells = np.array([[-1.0, 1.0, -1.0, 1.0]])
+    estimates, errors, axes = estimate(cells)
+
+    # Heap entries are (-error, tiebreak, cell, estimate, axis, depth)
+    counter = itertools.count()
+    heap = [(-errors[0], next(counter), cells[0], estimates[0], axes[0], 0)]
+    total_error = errors[0]
+
+    done_estimate = 0.0
+    done_error = 0.0
+    done_depths = []
+    converged = True
+
+    while heap and total_error > tol:
+        # Cells to split this sweep: the worst ones, until the others alone are within tolerance
+        budget = None if max_evals is None else (max_evals - n_evals) // (2 * len(rule))
+        if budget is not None and budget < 1:
+            converged = False
+            break
+
+        selected = []
+        while heap and total_error > tol and (budget is None or len(selected) < budget):
+            entry = heapq.heappop(heap)
+            total_error += entry[0]
+            if entry[5] >= max_depth:
+                # Worst cell can not be split: set it aside and keep refining the others
+                done_estimate += entry[3]
+                done_error += -entry[0]
+                done_depths.append(entry[5])
+                converged = False
+                continue
+            selected.append(entry)
+
+        if not selected:
+            break
+
+        # Bisect every selected cell along its axis, then estimate all halves with one call of f
+        children, depths = [], []
+        for _, _, cell, _, axis, depth in selected:
+            lo, hi = cell[2 * axis], cell[2 * axis + 1]
+            mid = 0.5 * (lo + hi)
+            left, right = cell.copy(), cell.copy()
+            left[2 * axis + 1] = right[2 * axis] = mid
+            children += [left, right]
+            depths += [depth + 1, depth + 1]
+
+        children = np.array(children)
+        estimates, errors, axes = estimate(children)
+        for cell, cell_estimate, error, axis, depth in zip(children, estimates, errors, axes, depths):
+            heapq.heappush(heap, (-error, next(counter), cell, cell_estimate, axis, depth))
+            total_error += error
+
+    # Sum from scratch to avoid the drift of the running total
+    total = done_estimate + sum(entry[3] for entry in heap)
+    error = done_error + sum(-entry[0] for entry in heap)
+    converged = converged and error <= tol
+
+    if instrumentation.enabled():
+        instrumentation.record_intervals(done_depths + [entry[5] for entry in heap])
+
+    if full_output:
+        return IntegrationResult(total, float(error), n_evals, len(heap) + len(done_depths), converged,
+                                 'adaptive_cubature')
+
+    return total
@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Callable
+import abc
+import heapq
+import itertools
+import os
+
+import numpy as np
+
+from source.node_cache import get_nodes
+from source.vectorize import probe, error_norm
+from source import instrumentation
+from source.result import IntegrationResult
+
+# Default limits shared by every adaptive routine
+MAX_DEPTH = 50
+MAX_EVALS = 1_000_000
+
+
+# Adaptive integrations return the common result type
+AdaptiveResult = IntegrationResult
+
+
+class LocalRule(abc.ABC):
+    """Base class of the local rules driven by the adaptive engine.
+
+        A rule is used through two methods. start(f, a, b) returns the state of the initial interval and the number
+        of evaluations it took. estimate(f, a, b, state) returns (estimate, error, left_state, right_state, n_evals):
+        an estimate of the integral over [a, b] with its error, and the states to hand down to both halves if the
+        interval gets split. States let a rule carry function values from an interval to its halves. For a
+        vector-valued f, values carry the components on their last axis and the error is the largest error of
+        the components (see vectorize.error_norm), so every component has to meet the tolerance.
+
+        Both are split into two phases so that the batched sweep can evaluate f for many intervals at once, or
+        hand the evaluation to someone else: initial_points(a, b) and points(a, b, state) return the abscissae
+        start and estimate need, and initial_state(a, b, values) and combine(a, b, state, values) turn f at
+        those abscissae into their results. Rules only implement these four; points and combine are abstract.
+    """
+
+    def __init__(self):
+        self.vectorized = None
+
+    def _evaluate(self, f: Callable, x: np.ndarray) -> np.ndarray:
+        """Helper function. Evaluates f at x, remembering whether f accepted the array call."""
+        values, vectorized = probe(f, x, vectorized=self.vectorized)
+        if self.vectorized is None:
+            self.vectorized = vectorized
+        return values
+
+    def initial_points(self, a: float, b: float) -> np.ndarray:
+        return np.zeros(0)
+
+    def initial_state(self, a: float, b: float, values: np.ndarray):
+        return None
+
+    def start(self, f: Callable, a: float, b: float):
+        x = self.initial_points(a, b)
+        values = self._evaluate(f, x) if len(x) else x
+        return self.initial_state(a, b, values), len(x)
+
+    @abc.abstractmethod
+    def points(self, a: float, b: float, state) -> np.ndarray:
+        """Abscissae at which estimate needs f on [a, b]."""
+
+    @abc.abstractmethod
+    def combine(self, a: float, b: float, state, values: np.ndarray):
+        """(estimate, error, left_state, right_state, n_evals) of [a, b] from f at its points."""
+
+    def estimate(self, f: Callable, a: float, b: float, state):
+        return self.combine(a, b, state, self._evaluate(f, self.points(a, b, state)))
+
+
+class NestedRule(LocalRule):
+    """Closed rule on k + 1 equally spaced points, refined by bisection with every function value reused.
+
+        The state of an interval is the array of f at its k + 1 points. Estimating [a, b] only evaluates f at the
+        k midpoints of its grid: the resulting 2k + 1 values are exactly the grids of both halves. The error
+        estimate is the difference between the rule on [a, b] and on both halves, divided by 'factor' (15 for
+        Simpson's rule, 3 for the trapezoid rule), which is also added to the halves as a Richardson correction.
+    """
+
+    def __init__(self, weights: np.ndarray, factor: float):
+        super().__init__()
+        self.weights = np.asarray(weights, dtype=float)  # weights for an interval of unit width
+        self.k = len(self.weights) - 1
+        self.factor = factor
+
+    def initial_points(self, a: float, b: float) -> np.ndarray:
+        return np.linspace(a, b, self.k + 1)
+
+    def initial_state(self, a: float, b: float, values: np.ndarray):
+        return values
+
+    def value(self, a: float, b: float, state) -> float:
+        """Returns the rule's own estimate on [a, b] from its state."""
+        return (b - a) * np.dot(self.weights, state)
+
+    def points(self, a: float, b: float, state) -> np.ndarray:
+        # Only the midpoints of the current grid are new
+        return a + (b - a) * (2 * np.arange(self.k) + 1) / (2 * self.k)
+
+    def _halves(self, state, values: np.ndarray) -> tuple:
+        """Helper function. Returns the states of both halves of an interval from its state and the new values."""
+        k = self.k
+        fine = np.empty((2 * k + 1,) + np.shape(state)[1:], dtype=np.result_type(state, values, float))
+        fine[0::2] = state
+        fine[1::2] = values
+
+        return fine[:k + 1], fine[k:]
+
+    def combine(self, a: float, b: float, state, values: np.ndarray):
+        c = (a + b) / 2
+        left_state, right_state = self._halves(state, values)
+
+        left_int = self.value(a, c, left_state)
+        right_int = self.value(c, b, right_state)
+        delta = left_int + right_int - self.value(a, b, state)
+
+        estimate = left_int + right_int + delta / self.factor
+        return estimate, error_norm(delta) / self.factor, left_state, right_state, len(values)
+
+
+class MidpointRule(NestedRule):
+    """Midpoint rule for the adaptive engine. The state of an interval is f at its midpoint, and estimating it
+    evaluates f at the midpoints of both halves, which become their states.
+    """
+
+    def __init__(self):
+        super().__init__(np.array([1.0]), 3)
+
+    def initial_points(self, a: float, b: float) -> np.ndarray:
+        return np.array([(a + b) / 2])
+
+    def points(self, a: float, b: float, state) -> np.ndarray:
+        return np.array([(3 * a + b) / 4, (a + 3 * b) / 4])
+
+    def _halves(self, state, values: np.ndarray) -> tuple:
+        return values[:1], values[1:]
+
+
+class GaussLegendreRule(LocalRule):
+    """n-point Gauss-Legendre rule for the adaptive engine. Gauss nodes are not nested, so the state of an interval
+    is only its estimate, and estimating it evaluates the rule on both halves (2n new points in one call). The
+    difference between both estimates is used as is for the error: the rule's asymptotic factor of 2^(2n) - 1 is
+    far too optimistic on intervals where f is not yet resolved.
+    """
+
+    def __init__(self, n: int = 5):
+        super().__init__()
+        self.nodes, self.weights = get_nodes('legendre', n)
+
+    def _abscissae(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Helper function. Returns the nodes of the rule on the intervals (a[i], b[i]), one row per interval."""
+        return 0.5 * ((b - a)[:, None] * self.nodes + (b + a)[:, None])
+
+    def initial_points(self, a: float, b: float) -> np.ndarray:
+        return self._abscissae(np.array([a]), np.array([b]))[0]
+
+    def initial_state(self, a: float, b: float, values: np.ndarray):
+        return 0.5 * (b - a) * np.dot(self.weights, values)
+
+    def points(self, a: float, b: float, state) -> np.ndarray:
+        c = (a + b) / 2
+        return self._abscissae(np.array([a, c]), np.array([c, b])).ravel()
+
+    def combine(self, a: float, b: float, state, values: np.ndarray):
+        n = len(self.nodes)
+        left_int = 0.25 * (b - a) * np.dot(self.weights, values[:n])
+        right_int = 0.25 * (b - a) * np.dot(self.weights, values[n:])
+        delta = left_int + right_int - state
+
+        return left_int + right_int, error_norm(delta), left_int, right_int, 2 * n
+
+
+def composite_simpson_rule(n: int = 2) -> NestedRule:
+    """Composite Simpson's rule on n subintervals (n = 2 is Simpson's rule) for the adaptive engine."""
+    weights = np.full(n + 1, 2.0)
+    weights[1::2] = 4.0
+    weights[[0, -1]] = 1.0
+    return NestedRule(weights / (3 * n), 15)
+
+
+def trapezoid_rule() -> NestedRule:
+    """Trapezoidal rule for the adaptive engine."""
+    return NestedRule(np.array([0.5, 0.5]), 3)
+
+
+def adaptive_integrate(f: Callable, a: float, b: float, tol: float, rule, max_depth: int = MAX_DEPTH,
+                       max_evals: int | None = MAX_EVALS, min_width: float = 0.0,
+                       mode: str = 'local', executor: Executor | None = None) -> IntegrationResult:
+    """Iterative adaptive integration with an explicit work stack.
+
+        Intervals are refined depth-first, left to right, with the tolerance halved at every split, exactly as
+        the former recursive helpers did. An interval is accepted once its error estimate is within its share
+        of the tolerance, or, without converging, once splitting it further would exceed 'max_depth' or
+        'min_width', or once 'max_evals' evaluations have been spent. Intervals already on the stack when the
+        budget runs out are still estimated once, so the budget can be exceeded by at most one estimate per
+        level of depth.
+
+        Parameters:
+            f (Callable[[float], float]): The integrand
+            a (float): The lower limit of integration
+            b (float): The upper limit of integration
+            tol (float): The desired tolerance of the approximation
+            rule (LocalRule): The local rule, e.g. a NestedRule
+            max_depth (int = MAX_DEPTH): Maximum number of successive bisections of the initial interval
+            max_evals (int | None = MAX_EVALS): Budget of evaluations of f. None means unlimited.
+            min_width (float = 0.0): Intervals narrower than this are not split further
+            mode (str = 'local'): 'local' for the depth-first refinement described above, 'global' to always
+                refine the subinterval with the largest error estimate (see global_integrate), 'sweep' to refine
+                all pending subintervals together with one batched evaluation per level (see sweep_integrate)
+            executor (Executor | None = None): Pool the 'sweep' mode spreads each batched evaluation over
+
+        Returns:
+            result (IntegrationResult): Estimate, error estimate, evaluation count and convergence flag
+    """
+    if mode == 'global':
+        return global_integrate(f, a, b, tol, rule, max_depth, max_evals, min_width)
+
+    if mode == 'sweep':
+        return sweep_integrate(f, a, b, tol, rule, max_depth, max_evals, min_width, executor)
+
+    if mode != 'local':
+        raise ValueError("'mode' must be 'local', 'global' or 'sweep'.")
+
+    if max_depth < 0 or not isinstance(max_depth, int):
+        raise ValueError("'max_depth' must be a non-negative integer.")
+
+    if max_evals is not None and max_evals < 1:
+        raise ValueError("'max_evals' must be a positive integer or None.")
+
+    state, n_evals = rule.start(f, a, b)
+
+    total = 0.0
+    error = 0.0
+    n_intervals = 0
+    converged = True
+
+    # Depths of the accepted intervals, only kept for instrumentation
+    depths = [] if instrumentation.enabled() else None
+
+    # Each entry is (a, b, tol, state, depth)
+    stack = [(a, b, tol, state, 0)]
+
+    while stack:
+        a, b, tol, state, depth = stack.pop()
+
+        estimate, local_error, left_state, right_state, used = rule.estimate(f, a, b, state)
+        n_evals += used
+
+        # Check if error is within desired tolerance, else split the interval
+        if local_error <= tol:
+            total += estimate
+            error += local_error
+            n_intervals += 1
+            if depths is not None:
+                depths.append(depth)
+            continue
+
+        c = (a + b) / 2
+        out_of_budget = max_evals is not None and n_evals >= max_evals
+        if depth >= max_depth or (b - a) / 2 < min_width or not a < c < b or out_of_budget:
+            total += estimate
+            error += local_error
+            n_intervals += 1
+            if depths is not None:
+                depths.append(depth)
+            converged = False
+            continue
+
+        # Push the right half first so the left half is processed next, as the recursion did
+        stack.append((c, b, tol / 2, right_state, depth + 1))
+        stack.append((a, c, tol / 2, left_state, depth + 1))
+
+    if depths is not None:
+        instrumentation.record_intervals(depths)
+
+    return IntegrationResult(total, error, n_evals, n_intervals, converged)
+
+
+def _evaluate_batch(rule: LocalRule, f: Callable, x: np.ndarray, executor: Executor | None) -> np.ndarray:
+    """Helper function. Evaluates f at x with one call, or split over 'executor' in one call per CPU (the
+    Executor interface does not expose its number of workers).
+    """
+    if executor is None:
+        return rule._evaluate(f, x)
+
+    if rule.vectorized is None:
+        # Settle whether f takes arrays on a small slice first, so the workers do not all probe it
+        head = rule._evaluate(f, x[:2])
+        return np.concatenate((head, _evaluate_batch(rule, f, x[2:], executor))) if len(x) > 2 else head
+
+    workers = os.cpu_count() or 1
+    chunks = np.array_split(x, min(workers, len(x)))
+    results = executor.map(rule._evaluate, itertools.repeat(f), chunks)
+
+    return np.concatenate(list(results))
+
+
+def sweep_integrate(f: Callable, a: float, b: float, tol: float, rule, max_depth: int = MAX_DEPTH,
+                    max_evals: int | None = MAX_EVALS, min_width: float = 0.0,
+                    executor: Executor | None = None) -> IntegrationResult:
+    """Adaptive integration refined one level at a time, with a single batched evaluation per level.
+
+        Accepts and splits the same intervals as the depth-first 'local' mode (each interval's share of the
+        tolerance only depends on its depth), but visits them breadth-first: every sweep collects the new abscissae
+        of all pending intervals, evaluates f at all of them in one call, or spread over the workers of 'executor',
+        and then estimates and splits every interval from those values. An integrand that takes arrays is thus
+        called once per level instead of once per interval. The evaluation budget is checked as in 'local' mode,
+        so a sweep started within budget is always completed.
+
+        Parameters: see adaptive_integrate
+
+        Returns:
+            result (IntegrationResult): Estimate, error estimate, evaluation count and convergence flag
+    """
+    steps = sweep_steps(a, b, tol, rule, max_depth, max_evals, min_width)
+    try:
+        x = next(steps)
+        while True:
+            x = steps.send(_evaluate_batch(rule, f, x, executor) if len(x) else x)
+    except StopIteration as stop:
+        return stop.value
+
+
+def sweep_steps(a: float, b: float, tol: float, rule, max_depth: int = MAX_DEPTH,
+                max_evals: int | None = MAX_EVALS, min_width: float = 0.0):
+    """Generator behind sweep_integrate, leaving the evaluation of f to its caller.
+
+        Yields the array of abscissae of each sweep and expects f at those abscissae to be sent back. Returns
+        (through StopIteration.value) the IntegrationResult. This lets callers evaluate f any way they like, e.g.
+        by awaiting an async integrand.
+
+        Parameters: see adaptive_integrate
+    """
+    if max_depth < 0 or not isinstance(max_depth, int):
+        raise ValueError("'max_depth' must be a non-negative integer.")
+
+    if max_evals is not None and max_evals < 1:
+        raise ValueError("'max_evals' must be a positive integer or None.")
+
+    values = yield rule.initial_points(a, b)
+    state = rule.initial_state(a, b, values)
+    n_evals = len(values)
+
+    total = 0.0
+    error = 0.0
+    n_intervals = 0
+    converged = True
+
+    # Depths of the accepted intervals, only kept for instrumentation
+    depths = [] if instrumentation.enabled() else None
+
+    # Each entry is (a, b, tol, state, depth)
+    pending = [(a, b, tol, state, 0)]
+
+    while pending:
+        abscissae = [rule.points(a, b, state) for a, b, _, state, _ in pending]
+        values = yield np.concatenate(abscissae)
+        values = np.split(np.asarray(values), np.cumsum([len(x) for x in abscissae])[:-1])
+
+        next_pending = []
+        for (a, b, tol, state, depth), interval_values in zip(pending, values):
+            estimate, local_error, left_state, right_state, used = rule.combine(a, b, state, interval_values)
+            n_evals += used
+
+            if local_error <= tol:
+                total += estimate
+                error += local_error
+                n_intervals += 1
+                if depths is not None:
+                    depths.append(depth)
+                continue
+
+            c = (a + b) / 2
+            out_of_budget = max_evals is not None and n_evals >= max_evals
+            if depth >= max_depth or (b - a) / 2 < min_width or not a < c < b or out_of_budget:
+                total += estimate
+                error += local_error
+                n_intervals += 1
+                if depths is not None:
+                    depths.append(depth)
+                converged = False
+                continue
+
+            next_pending.append((a, c, tol / 2, left_state, depth + 1))
+            next_pending.append((c, b, tol / 2, right_state, depth + 1))
+
+        pending = next_pending
+
+    if depths is not None:
+        instrumentation.record_intervals(depths)
+
+    return IntegrationResult(total, error, n_evals, n_intervals, converged)
+
+
+def global_integrate(f: Callable, a: float, b: float, tol: float, rule, max_depth: int = MAX_DEPTH,
+                     max_evals: int | None = MAX_EVALS, min_width: float = 0.0) -> IntegrationResult:
+    """Globally adaptive integration, in the manner of QUADPACK's QAG.
+
+        All subintervals are kept in a heap keyed by their local error estimate. The worst one is always bisected
+        next, and the refinement stops as soon as the summed error estimate is within 'tol'. Intervals that can
+        not be split any further ('max_depth', 'min_width') are set aside, and running out of 'max_evals' stops
+        the refinement; both leave the result unconverged.
+
+        Parameters: see adaptive_integrate
+
+        Returns:
+            result (IntegrationResult): Estimate, error estimate, evaluation count and convergence flag
+    """
+    if max_depth < 0 or not isinstance(max_depth, int):
+        raise ValueError("'max_depth' must be a non-negative integer.")
+
+    if max_evals is not None and max_evals < 1:
+        raise ValueError("'max_evals' must be a positive integer or None.")
+
+    state, n_evals = rule.start(f, a, b)
+    estimate, local_error, left_state, right_state, used = rule.estimate(f, a, b, state)
+    n_evals += used
+
+    # Heap entries are (-error, tiebreak, a, b, estimate, depth, left_state, right_state)
+    counter = itertools.count()
+    heap = [(-local_error, next(counter), a, b, estimate, 0, left_state, right_state)]
+    total_error = local_error
+
+    done_estimate = 0.0
+    done_error = 0.0
+    done_depths = []
+    converged = True
+
+    while heap and total_error > tol:
+        if max_evals is not None and n_evals >= max_evals:
+            converged = False
+            break
+
+        neg_error, _, a, b, estimate, depth, left_state, right_state = heapq.heappop(heap)
+        c = (a + b) / 2
+
+        if depth >= max_depth or (b - a) / 2 < min_width or not a < c < b:
+            # Worst interval can not be split: set it aside and keep refining the others
+            done_estimate += estimate
+            done_error += -neg_error
+            done_depths.append(depth)
+            total_error += neg_error
+            converged = False
+            continue
+
+        total_error += neg_error
+
+        # Both halves are evaluated in one call
+        children = ((a, c, left_state), (c, b, right_state))
+        abscissae = [rule.points(lo, hi, child_state) for lo, hi, child_state in children]
+        values = np.split(rule._evaluate(f, np.concatenate(abscissae)), [len(abscissae[0])])
+
+        for (lo, hi, child_state), child_values in zip(children, values):
+            child = rule.combine(lo, hi, child_state, child_values)
+            n_evals += child[4]
+            total_error += child[1]
+            heapq.heappush(heap, (-child[1], next(counter), lo, hi, child[0], depth + 1, child[2], child[3]))
+
+    # Sum from scratch to avoid the drift of the running total
+    total = done_estimate + sum(entry[4] for entry in heap)
+    error = done_error + sum(-entry[0] for entry in heap)
+    converged = converged and error <= tol
+
+    if instrumentation.enabled():
+        instrumentation.record_intervals(done_depths + [entry[5] for entry in heap])
+
+    return IntegrationResult(total, error, n_evals, len(heap) + len(done_depths), converged)
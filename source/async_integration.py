@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Awaitable, Callable
+import asyncio
+import inspect
+
+import numpy as np
+
+from source.node_cache import get_nodes
+from source.lambdify_cache import as_callable
+from source.transforms import transform_interval, _Substituted
+from source.adaptive_engine import sweep_steps, MAX_DEPTH, MAX_EVALS
+from source.result import IntegrationResult
+from source.global_adaptive import RULES
+from source.instrumentation import instrumented
+
+if TYPE_CHECKING:
+    import sympy
+
+# Default number of evaluations of f awaited at the same time
+MAX_CONCURRENCY = 64
+
+
+async def evaluate_async(f: Callable[..., Awaitable | float], x: np.ndarray,
+                         max_concurrency: int | asyncio.Semaphore = MAX_CONCURRENCY,
+                         batch_size: int | None = None) -> np.ndarray:
+    """Evaluate an async integrand at every abscissa, awaiting many evaluations concurrently.
+
+        Parameters:
+            f (Callable): The integrand. Coroutine functions are awaited; plain functions are called directly.
+            x (np.ndarray): The abscissae
+            max_concurrency (int | asyncio.Semaphore = MAX_CONCURRENCY): Maximum number of calls of f in flight.
+                Pass the same Semaphore to several integrals to share one limit between them.
+            batch_size (int | None = None): None calls f once per abscissa with a float. An integer calls f with
+                arrays of up to batch_size abscissae, which f must answer with an array of the same length.
+
+        Returns:
+            values (np.ndarray): f evaluated at every abscissa, with the shape of x followed by the shape of f's
+                values for a vector-valued f
+    """
+    if batch_size is not None and (batch_size < 1 or not isinstance(batch_size, int)):
+        raise ValueError("'batch_size' must be a positive integer or None.")
+
+    x = np.asarray(x, dtype=float)
+    flat = x.ravel()
+    semaphore = max_concurrency if isinstance(max_concurrency, asyncio.Semaphore) \
+        else asyncio.Semaphore(max_concurrency)
+
+    async def call(arg):
+        async with semaphore:
+            value = f(arg)
+            if inspect.isawaitable(value):
+                value = await value
+            return value
+
+    if batch_size is None:
+        values = np.array(await asyncio.gather(*(call(float(xi)) for xi in flat)), dtype=float)
+        return values.reshape(x.shape + values.shape[1:])
+
+    chunks = [flat[i:i + batch_size] for i in range(0, len(flat), batch_size)]
+    values = await asyncio.gather(*(call(chunk) for chunk in chunks))
+    values = [np.asarray(value, dtype=float) for value in values]
+    # Constants come back as 0-d arrays
+    values = [np.broadcast_to(value, chunk.shape) if value.ndim == 0 else value for value, chunk in zip(values, chunks)]
+    values = np.concatenate(values) if values else np.zeros(0)
+
+    return values.reshape(x.shape + values.shape[1:])
+
+
+async def _evaluate_substituted(g: Callable, t: np.ndarray, max_concurrency: int | asyncio.Semaphore,
+                                batch_size: int | None) -> np.ndarray:
+    """Helper function. evaluate_async for an integrand returned by transform_interval. The substitution is applied
+    to the abscissae here, so that an async f is still awaited.
+    """
+    if not isinstance(g, _Substituted):
+        return await evaluate_async(g, t, max_concurrency, batch_size)
+
+    t = np.asarray(t, dtype=float)
+    inner = np.abs(t) < 1
+    x, jacobian = g._substitute(t[inner])
+    inner_values = await evaluate_async(g.f, x, max_concurrency, batch_size)
+    extra = inner_values.shape[x.ndim:]
+
+    # The integrand vanishes at t = -1 and t = 1, which map to infinity
+    values = np.zeros(t.shape + extra)
+    values[inner] = inner_values * jacobian.reshape(jacobian.shape + (1,) * len(extra))
+
+    return values
+
+
+@instrumented
+async def gauss_legendre_async(f: sympy.Expr | Callable[..., Awaitable | float], a: int | float, b: int | float,
+                               n: int, max_concurrency: int | asyncio.Semaphore = MAX_CONCURRENCY,
+                               batch_size: int | None = None, full_output: bool = False) -> float | IntegrationResult:
+    """Gauss-Legendre integral approximation of an async integrand.
+
+        Parameters:
+            f (sympy.Expr | Callable): A SymPy expression, lambda expression or coroutine function
+            a (int | float): The lower limit of integration
+            b (int | float): The upper limit of integration
+            n (int): The number of nodes
+            max_concurrency, batch_size: see evaluate_async
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    nodes, weights = get_nodes('legendre', n)
+    yarr = await evaluate_async(f, 0.5 * ((b - a) * nodes + (b + a)), max_concurrency, batch_size)
+
+    I = np.dot(weights, yarr) * (b - a) * 0.5
+
+    return IntegrationResult(I, n_evals=n, method='gauss_legendre_async') if full_output else I
+
+
+@instrumented
+async def composite_simpson_async(f: sympy.Expr | Callable[..., Awaitable | float], a: int | float, b: int | float,
+                                  n: int, max_concurrency: int | asyncio.Semaphore = MAX_CONCURRENCY,
+                                  batch_size: int | None = None,
+                                  full_output: bool = False) -> float | IntegrationResult:
+    """Composite Simpson's integral approximation of an async integrand.
+
+        Parameters:
+            f (sympy.Expr | Callable): A SymPy expression, lambda expression or coroutine function
+            a (int | float): The lower limit of integration
+            b (int | float): The upper limit of integration
+            n (int): The number of subintervals, even
+            max_concurrency, batch_size: see evaluate_async
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if n % 2 != 0 or not isinstance(n, int):
+        raise ValueError("'n' must be an even integer.")
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    h = (b - a) / n
+    yarr = await evaluate_async(f, np.linspace(a, b, n + 1), max_concurrency, batch_size)
+
+    I = (h / 3) * (yarr[0] + 4 * np.sum(yarr[1:-1:2], axis=0) + 2 * np.sum(yarr[2:-1:2], axis=0) + yarr[-1])
+
+    return IntegrationResult(I, None, n + 1, n, method='composite_simpson_async') if full_output else I
+
+
+@instrumented
+async def adaptive_async(f: sympy.Expr | Callable[..., Awaitable | float], a: float, b: float, tol: float,
+                         rule: str = 'simpson', n: int | None = None, max_depth: int = MAX_DEPTH,
+                         max_evals: int | None = MAX_EVALS, min_width: float = 0.0, full_output: bool = False,
+                         max_concurrency: int | asyncio.Semaphore = MAX_CONCURRENCY,
+                         batch_size: int | None = None) -> float | IntegrationResult:
+    """Adaptive integral approximation of an async integrand.
+
+        Refines level by level like the 'sweep' mode of the adaptive rules: the new abscissae of all pending
+        subintervals are awaited together, so each level costs one round of concurrent calls.
+
+        Parameters:
+            f (sympy.Expr | Callable): A SymPy expression, lambda expression or coroutine function
+            a (int | float): The lower limit of integration, may be -np.inf
+            b (int | float): The upper limit of integration, may be np.inf
+            tol (int | float): The desired tolerance of the approximation
+            rule (str = 'simpson'): The local rule, one of global_adaptive.RULES
+            n (int | None = None): Order of the 'gauss_legendre' or 'gauss_kronrod' rule
+            max_depth, max_evals, min_width, full_output: see adaptive_simpson
+            max_concurrency, batch_size: see evaluate_async
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if rule not in RULES:
+        raise ValueError(f"'rule' must be one of {', '.join(RULES)}.")
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    # Map infinite limits onto a finite interval
+    f, a, b = transform_interval(f, a, b)
+
+    steps = sweep_steps(a, b, tol, RULES[rule](n), max_depth, max_evals, min_width)
+    try:
+        x = next(steps)
+        while True:
+            x = steps.send(await _evaluate_substituted(f, x, max_concurrency, batch_size))
+    except StopIteration as stop:
+        result = stop.value
+
+    result.method = 'adaptive_async'
+
+    return result if full_output else result.value
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+import numpy as np
+
+from source.node_cache import get_nodes
+from source.vectorize import evaluate
+from source.lambdify_cache import as_callable
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+
+# Upper bound on the number of abscissae passed to f in one call when chunk_size is not given
+MAX_BATCH_POINTS = 1 << 20
+
+
+def _batch_rule(f: sympy.Expr | Callable[[float], float], a, b, tnodes: np.ndarray, tweights: np.ndarray,
+                chunk_size: int | None, vectorized: bool | None, full_output: bool = False,
+                method: str | None = None) -> np.ndarray | IntegrationResult:
+    """Helper function. Applies the rule sum_j tweights[j] * f(a + (b - a) * tnodes[j]) * (b - a), defined on
+    [0, 1], to every interval (a[i], b[i]) using one (num_intervals x num_nodes) abscissa matrix per chunk.
+    A vector-valued f gives one row of integrals per interval.
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    shape = a.shape
+    a, b = a.ravel(), b.ravel()
+
+    if np.any(a > b):
+        raise InvalidIntervalException("Every upper limit 'b' must be greater than its lower limit 'a'.")
+
+    if chunk_size is None:
+        chunk_size = max(1, MAX_BATCH_POINTS // len(tnodes))
+    elif chunk_size < 1 or not isinstance(chunk_size, int):
+        raise ValueError("'chunk_size' must be a positive integer.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    h = b - a
+    chunks = []
+
+    for start in range(0, len(a), chunk_size):
+        stop = start + chunk_size
+        xmat = a[start:stop, None] + h[start:stop, None] * tnodes[None, :]
+        ymat = evaluate(f, xmat, vectorized=vectorized)
+
+        # Contract over the nodes, keeping the components of a vector-valued f on the last axis
+        sums = np.tensordot(ymat, tweights, axes=([1], [0]))
+        chunks.append(h[start:stop].reshape((-1,) + (1,) * (sums.ndim - 1)) * sums)
+
+    I = np.concatenate(chunks) if chunks else np.zeros(0)
+    I = I.reshape(shape + I.shape[1:])
+
+    return IntegrationResult(I, None, len(a) * len(tnodes), len(a), method=method) if full_output else I
+
+
+@instrumented
+def batch_midpoint(f: sympy.Expr | Callable[[float], float], a, b, chunk_size: int | None = None,
+                   vectorized: bool | None = None, full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Midpoint integral approximation over many intervals at once.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
+            a (array_like): The lower limits of integration
+            b (array_like): The upper limits of integration, broadcast against 'a'
+            chunk_size (int | None = None): Maximum number of intervals per call to f. Default bounds each
+                call to MAX_BATCH_POINTS abscissae.
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult whose value is the array of integrals, with the
+                total evaluation count and number of intervals
+
+        Returns:
+            I (np.ndarray | IntegrationResult): Approximation of the integral over each interval
+    """
+    return _batch_rule(f, a, b, np.array([0.5]), np.array([1.0]), chunk_size, vectorized, full_output,
+                       'batch_midpoint')
+
+
+@instrumented
+def batch_trapezoidal(f: sympy.Expr | Callable[[float], float], a, b, chunk_size: int | None = None,
+                      vectorized: bool | None = None, full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Trapezoidal integral approximation over many intervals at once. See batch_midpoint for parameters."""
+    return _batch_rule(f, a, b, np.array([0.0, 1.0]), np.array([0.5, 0.5]), chunk_size, vectorized, full_output,
+                       'batch_trapezoidal')
+
+
+@instrumented
+def batch_simpson(f: sympy.Expr | Callable[[float], float], a, b, chunk_size: int | None = None,
+                  vectorized: bool | None = None, full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Simpson's integral approximation over many intervals at once. See batch_midpoint for parameters."""
+    tnodes = np.array([0.0, 0.5, 1.0])
+    tweights = np.array([1.0, 4.0, 1.0]) / 6
+
+    return _batch_rule(f, a, b, tnodes, tweights, chunk_size, vectorized, full_output,
+                       'batch_simpson')
+
+
+@instrumented
+def batch_composite_midpoint(f: sympy.Expr | Callable[[float], float], a, b, n: int,
+                             chunk_size: int | None = None, vectorized: bool | None = None,
+                             full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Composite Midpoint integral approximation over many intervals at once, matching composite_midpoint.
+
+        Parameters:
+            n (int): The number of iterations
+            See batch_midpoint for the remaining parameters.
+
+        Returns:
+            I (np.ndarray | IntegrationResult): Approximation of the integral over each interval
+    """
+    if n % 2 != 0 or not isinstance(n, int):
+        raise ValueError("n must be an even integer.")
+
+    h = 1 / (n + 2)
+    tnodes = np.linspace(h / 2, 1 - h / 2, n + 1)
+    tweights = np.full(n + 1, h)
+
+    return _batch_rule(f, a, b, tnodes, tweights, chunk_size, vectorized, full_output,
+                       'batch_composite_midpoint')
+
+
+@instrumented
+def batch_composite_trapezoid(f: sympy.Expr | Callable[[float], float], a, b, n: int,
+                              chunk_size: int | None = None, vectorized: bool | None = None,
+                              full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Composite Trapezoid integral approximation over many intervals at once, matching composite_trapezoid.
+
+        Parameters:
+            n (int): The number of points, at least 2
+            See batch_midpoint for the remaining parameters.
+
+        Returns:
+            I (np.ndarray | IntegrationResult): Approximation of the integral over each interval
+    """
+    if n < 2 or not isinstance(n, int):
+        raise ValueError("n must be an integer greater than 1.")
+
+    h = 1 / (n - 1)
+    tnodes = np.linspace(0, 1, n)
+    tweights = np.full(n, h)
+    tweights[[0, -1]] = h / 2
+
+    return _batch_rule(f, a, b, tnodes, tweights, chunk_size, vectorized, full_output,
+                       'batch_composite_trapezoid')
+
+
+@instrumented
+def batch_composite_simpson(f: sympy.Expr | Callable[[float], float], a, b, n: int,
+                            chunk_size: int | None = None, vectorized: bool | None = None,
+                            full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Composite Simpson's integral approximation over many intervals at once, matching composite_simpson.
+
+        Parameters:
+            n (int): The number of iterations
+            See batch_midpoint for the remaining parameters.
+
+        Returns:
+            I (np.ndarray | IntegrationResult): Approximation of the integral over each interval
+    """
+    if n % 2 != 0 or not isinstance(n, int):
+        raise ValueError("'n' must be an even integer.")
+
+    h = 1 / n
+    tnodes = np.linspace(0, 1, n + 1)
+    tweights = np.full(n + 1, 2 * h / 3)
+    tweights[1::2] = 4 * h / 3
+    tweights[[0, -1]] = h / 3
+
+    return _batch_rule(f, a, b, tnodes, tweights, chunk_size, vectorized, full_output,
+                       'batch_composite_simpson')
+
+
+@instrumented
+def batch_gauss_legendre(f: sympy.Expr | Callable[[float], float], a, b, n: int,
+                         chunk_size: int | None = None, vectorized: bool | None = None,
+                         full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Gauss-Legendre integral approximation over many intervals at once, matching gauss_legendre.
+
+        Parameters:
+            n (int): The number of iterations
+            See batch_midpoint for the remaining parameters.
+
+        Returns:
+            I (np.ndarray | IntegrationResult): Approximation of the integral over each interval
+    """
+    nodes, weights = get_nodes('legendre', n)
+
+    # Move the rule from [-1, 1] onto [0, 1]
+    tnodes = 0.5 * (nodes + 1)
+    tweights = 0.5 * weights
+
+    return _batch_rule(f, a, b, tnodes, tweights, chunk_size, vectorized, full_output,
+                       'batch_gauss_legendre')
@@ -1,12 +1,20 @@
-from typing import Union, Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
 
+from source.lambdify_cache import as_callable
+from source.vectorize import evaluate
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
+
+@instrumented
 def composite_midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float],
-                       n: int) -> float:
+                       n: int, full_output: bool = False) -> float | IntegrationResult:
     """Composite Midpoint integral approximation.
 
         Parameters:
@@ -14,9 +22,10 @@ def composite_midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, f
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
             n (int): The number of iterations
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -33,17 +42,19 @@ def composite_midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, f
         raise InvalidIntervalException("The upper limit 'a' must be greater than the lower limit 'b'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
     # Get step size
     h = (b - a) / (n + 2)
 
     # Define array of x values and compute yi at xi
     xarr = np.linspace(a + h / 2, b - h / 2, n + 1)
-    yarr = f(xarr)
+    yarr = evaluate(f, xarr)
 
     # Compute approximation I with Composite Midpoint formula
     I = h * sum(yarr)
 
+    if full_output:
+        return IntegrationResult(I, n_evals=n + 1, n_intervals=n + 1, method='composite_midpoint')
+
     return I
@@ -1,12 +1,20 @@
-from typing import Union, Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
 
+from source.lambdify_cache import as_callable
+from source.vectorize import evaluate, error_norm
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
+
+@instrumented
 def composite_simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float],
-                      n: int) -> float:
+                      n: int, full_output: bool = False) -> float | IntegrationResult:
     """Composite Simpson's integral approximation.
 
         Parameters:
@@ -14,9 +22,11 @@ def composite_simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, fl
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
             n (int): The number of iterations
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count and,
+                when n is a multiple of 4, an error estimate) instead of a float
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -33,21 +43,30 @@ def composite_simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, fl
         raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
     # Get step size
     h = (b - a) / n
 
     # Define array of x values and compute yi at xi
     xarr = np.linspace(a, b, n + 1)
-    yarr = f(xarr)
+    yarr = evaluate(f, xarr)
 
     # Get sum of odd and even indexed yi's
-    odd_sum = np.sum(yarr[1:-1:2])
-    even_sum = np.sum(yarr[2:-1:2])
+    odd_sum = np.sum(yarr[1:-1:2], axis=0)
+    even_sum = np.sum(yarr[2:-1:2], axis=0)
 
     # Compute approximation I with Composite Simpson's formula
     I = (h / 3) * (yarr[0] + 4 * odd_sum + 2 * even_sum + yarr[-1])
 
+    if full_output:
+        # Comparing with the rule on every other point costs no evaluations (error of Simpson's rule ~ h^4)
+        error = None
+        if n % 4 == 0:
+            odd_half = np.sum(yarr[2:-1:4], axis=0)
+            even_half = np.sum(yarr[4:-1:4], axis=0)
+            I_half = (2 * h / 3) * (yarr[0] + 4 * odd_half + 2 * even_half + yarr[-1])
+            error = error_norm(I - I_half) / 15
+        return IntegrationResult(I, error, n + 1, n, method='composite_simpson')
+
     return I
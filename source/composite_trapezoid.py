@@ -1,12 +1,20 @@
-from typing import Union, Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
 
+from source.lambdify_cache import as_callable
+from source.vectorize import evaluate, error_norm
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
+
+@instrumented
 def composite_trapezoid(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float],
-                        n: int) -> float:
+                        n: int, full_output: bool = False) -> float | IntegrationResult:
     """Composite Trapezoid integral approximation.
 
         Parameters:
@@ -14,9 +22,11 @@ def composite_trapezoid(f: sympy.Expr | Callable[[float], float], a: Union[int,
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
             n (int): The number of iterations
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count and,
+                when n - 1 is even, an error estimate) instead of a float
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -33,17 +43,24 @@ def composite_trapezoid(f: sympy.Expr | Callable[[float], float], a: Union[int,
         raise InvalidIntervalException("The upper limit 'a' must be greater than the lower limit 'b'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
     # Get step size
     h = (b - a) / (n - 1)
 
     # Define array of x values and compute yi at xi
     xarr = np.linspace(a, b, n)
-    yarr = f(xarr)
+    yarr = evaluate(f, xarr)
 
     # Compute approximation I with Composite Trapezoid formula
     I = (h / 2) * (yarr[0] + 2 * sum(yarr[1:-1]) + yarr[-1])
 
+    if full_output:
+        # Comparing with the rule on every other point costs no evaluations (error of the trapezoid rule ~ h^2)
+        error = None
+        if n > 2 and (n - 1) % 2 == 0:
+            I_half = h * (yarr[0] + 2 * sum(yarr[2:-1:2]) + yarr[-1])
+            error = error_norm(I - I_half) / 3
+        return IntegrationResult(I, error, n, n - 1, method='composite_trapezoid')
+
     return I
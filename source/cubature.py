@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from math import comb
+from typing import TYPE_CHECKING, Callable, Iterator, Sequence
+import numpy as np
+
+from source.node_cache import get_nodes, register_rule
+from source.clenshaw_curtis import _clenshaw_curtis_rule
+from source.vectorize import evaluate, error_norm
+from source.lambdify_cache import as_callable, is_sympy_expr
+from source.lru import LRUCache, CacheInfo
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+# Point sets on [-1, 1]^d, keyed by ('tensor', orders) or ('smolyak', dim, level)
+_grids = LRUCache(maxsize=64)
+
+
+def _nested_clenshaw_curtis(level: int) -> tuple[np.ndarray, np.ndarray]:
+    """Helper function. Clenshaw-Curtis rule of the given level on [-1, 1]: the midpoint for level 1, and the
+    2^(level-1) + 1 extrema of a Chebyshev polynomial after that, so every level contains the nodes of the previous.
+    Nodes are in ascending order.
+    """
+    if level == 1:
+        return np.zeros(1), np.full(1, 2.0)
+
+    return _clenshaw_curtis_rule(2 ** (level - 1) + 1)
+
+
+register_rule('clenshaw_curtis_nested', _nested_clenshaw_curtis)
+
+
+def _variable_names(dim: int) -> tuple[str, ...]:
+    """Helper function. Default argument names for SymPy integrands: x, y, z, then x0, x1, ... beyond 3 dimensions."""
+    return ('x', 'y', 'z')[:dim] if dim <= 3 else tuple(f'x{i}' for i in range(dim))
+
+
+def _readonly(*arrays: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Helper function. Marks the arrays of a cached grid read-only, as they are shared by every caller."""
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def tensor_grid(orders: Sequence[int]) -> tuple[np.ndarray, np.ndarray]:
+    """Cached tensor product of Gauss-Legendre rules on [-1, 1]^d.
+
+        Parameters:
+            orders (Sequence[int]): Number of nodes along each dimension
+
+        Returns:
+            points, weights (tuple[np.ndarray, np.ndarray]): Read-only (prod(orders), d) array of points and the
+                matching weights
+    """
+    orders = tuple(int(n) for n in orders)
+
+    def _build():
+        rules = [get_nodes('legendre', n) for n in orders]
+        points = np.stack(np.meshgrid(*(nodes for nodes, _ in rules), indexing='ij'), axis=-1).reshape(-1, len(orders))
+        weights = np.ones(1)
+        for _, rule_weights in rules:
+            weights = np.outer(weights, rule_weights).ravel()
+        return _readonly(points, weights)
+
+    return _grids.get(('tensor', orders), _build)
+
+
+def _multi_indices(dim: int, low: int, high: int) -> Iterator[tuple[int, ...]]:
+    """Helper function. Yields every tuple of 'dim' positive integers whose sum lies in [low, high]."""
+    if dim == 1:
+        yield from ((l,) for l in range(max(low, 1), high + 1))
+        return
+    for first in range(1, high - dim + 2):
+        for rest in _multi_indices(dim - 1, low - first, high - first):
+            yield (first,) + rest
+
+
+def _smolyak_terms(dim: int, level: int, resolution: int) -> tuple[np.ndarray, np.ndarray]:
+    """Helper function. Points (as integer positions on a grid of 'resolution' Chebyshev extrema) and weights of
+    every tensor product in the combination technique, duplicates not yet merged.
+
+        A(q, d) = sum over q - d + 1 <= |l| <= q of (-1)^(q - |l|) * C(d - 1, q - |l|) * U(l_1) x ... x U(l_d)
+        with q = level + d - 1 and U(l) the nested Clenshaw-Curtis rule of level l.
+    """
+    q = level + dim - 1
+    keys, weights = [], []
+
+    for index in _multi_indices(dim, max(dim, q - dim + 1), q):
+        norm = sum(index)
+        coefficient = (-1) ** (q - norm) * comb(dim - 1, q - norm)
+
+        rule_keys, rule_weights = [], []
+        for l in index:
+            _, w = get_nodes('clenshaw_curtis_nested', l)
+            rule_keys.append(np.array([resolution // 2]) if l == 1 else
+                             np.arange(2 ** (l - 1) + 1) * (resolution // 2 ** (l - 1)))
+            rule_weights.append(w)
+
+        keys.append(np.stack(np.meshgrid(*rule_keys, indexing='ij'), axis=-1).reshape(-1, dim))
+        term_weights = np.full(1, float(coefficient))
+        for w in rule_weights:
+            term_weights = np.outer(term_weights, w).ravel()
+        weights.append(term_weights)
+
+    return np.concatenate(keys), np.concatenate(weights)
+
+
+def smolyak_grid(dim: int, level: int) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Cached Smolyak sparse grid on [-1, 1]^d built from nested Clenshaw-Curtis rules.
+
+        The grid of a level contains the grid of the level below, so the rule of the lower level is also returned,
+        as weights on the same points, for an error estimate that costs no extra evaluations.
+
+        Parameters:
+            dim (int): Number of dimensions
+            level (int): Level of the grid, 1 for the centre point alone. Polynomials of total degree up to
+                2 * level - 1 are integrated exactly.
+
+        Returns:
+            points, weights, coarse_weights (tuple[np.ndarray, np.ndarray, np.ndarray | None]): Read-only (N, d)
+                array of points, their weights, and the weights of the level below (None for level 1)
+    """
+    if dim < 1 or not isinstance(dim, (int, np.integer)):
+        raise ValueError("'dim' must be a positive integer.")
+
+    if level < 1 or not isinstance(level, (int, np.integer)):
+        raise ValueError("'level' must be a positive integer.")
+
+    def _build():
+        # Positions on the finest grid are exact integers, so points shared by several products merge exactly
+        resolution = 2 ** max(level - 1, 1)
+        keys, weights = _smolyak_terms(dim, level, resolution)
+        coarse = level > 1
+        if coarse:
+            coarse_keys, coarse_weights = _smolyak_terms(dim, level - 1, resolution)
+            keys = np.concatenate([keys, coarse_keys])
+
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        fine_part = np.zeros(len(keys))
+        fine_part[:len(weights)] = weights
+        merged = np.bincount(inverse, fine_part, len(unique))
+
+        points = -np.cos(np.pi * unique / resolution)
+        points[2 * unique == resolution] = 0.0
+
+        if not coarse:
+            return _readonly(points, merged) + (None,)
+
+        coarse_part = np.zeros(len(keys))
+        coarse_part[len(weights):] = coarse_weights
+        return _readonly(points, merged, np.bincount(inverse, coarse_part, len(unique)))
+
+    return _grids.get(('smolyak', int(dim), int(level)), _build)
+
+
+def cache_info() -> CacheInfo:
+    """Hit/miss statistics and current size of the cache of cubature grids."""
+    return _grids.info()
+
+
+def _map_to_region(points: np.ndarray, limits: Sequence, vectorized: bool | None) -> tuple[list, np.ndarray]:
+    """Helper function. Maps points of [-1, 1]^d onto the region described by 'limits', from the outermost variable
+    (the last) inwards, so callable limits of a variable can be evaluated at the already mapped outer variables.
+
+        Returns:
+            coords, jacobian (tuple[list[np.ndarray], np.ndarray]): One array of coordinates per variable and the
+                jacobian of the map at every point
+    """
+    dim = len(limits)
+    coords = [None] * dim
+    jacobian = np.ones(len(points))
+
+    for i in reversed(range(dim)):
+        outer = coords[i + 1:]
+        lo, hi = (evaluate(bound, *outer, vectorized=vectorized) if callable(bound)
+                  else np.full(len(points), float(bound)) for bound in limits[i])
+        half_width = 0.5 * (hi - lo)
+        coords[i] = half_width * points[:, i] + 0.5 * (hi + lo)
+        jacobian = jacobian * half_width
+
+    return coords, jacobian
+
+
+def _prepare_bound(bound, variables: Sequence[str]):
+    """Helper function. Compiles a SymPy limit in the given variables; numbers and callables are kept."""
+    if is_sympy_expr(bound):
+        return float(bound) if not bound.free_symbols else as_callable(bound, variables, instrument=False)
+    return bound
+
+
+def _prepare(f, limits: Sequence, variables) -> tuple[Callable, list]:
+    """Helper function. Checks the limits and compiles SymPy integrands and limits. A limit of variable i is a
+    function of the variables after it.
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    limits = [tuple(pair) for pair in limits]
+    if not limits or any(len(pair) != 2 for pair in limits):
+        raise ValueError("'limits' must be a non-empty sequence of (lower, upper) pairs.")
+
+    if variables is None:
+        variables = _variable_names(len(limits))
+    elif isinstance(variables, str):
+        variables = variables.split()
+    if len(variables) != len(limits):
+        raise ValueError("'variables' must name one variable per pair of limits.")
+
+    # Ensure the expressions are evaluated as lambda
+    f = as_callable(f, variables)
+    limits = [tuple(_prepare_bound(bound, variables[i + 1:]) for bound in pair) for i, pair in enumerate(limits)]
+
+    if any(callable(bound) for bound in limits[-1]):
+        raise ValueError("The limits of the last (outermost) variable must be numbers.")
+
+    for i, (lo, hi) in enumerate(limits):
+        if not callable(lo) and not callable(hi) and lo > hi:
+            raise InvalidIntervalException(f"The upper limit of variable {i} must be greater than its lower limit.")
+
+    return f, limits
+
+
+def _apply(f: Callable, limits: list, points: np.ndarray, weights: np.ndarray, vectorized: bool | None):
+    """Helper function. Evaluates f once at every mapped point and returns the weighted sums for each set of
+    weights.
+    """
+    coords, jacobian = _map_to_region(points, limits, vectorized)
+    values = evaluate(f, *coords, vectorized=vectorized)
+
+    return [np.dot(w * jacobian, values) for w in weights]
+
+
+@instrumented
+def tensor_gauss_legendre(f: sympy.Expr | Callable[..., float], limits: Sequence, n: int | Sequence[int],
+                          variables: str | Sequence[str] | None = None, vectorized: bool | None = None,
+                          full_output: bool = False) -> float | IntegrationResult:
+    """N-dimensional tensor-product Gauss-Legendre cubature, for low dimensions.
+
+        The integral of f(x_0, ..., x_{d-1}) with x_i between limits[i][0] and limits[i][1]. As in
+        double_gauss_legendre (and scipy's nquad), the limits of a variable may be functions of the variables
+        after it: limits[0] of x_1, ..., x_{d-1}, and so on, with the last pair constant. The grid of n^d points is
+        evaluated in one call of f.
+
+        Parameters:
+            f (sympy.Expr | Callable[..., float]): A SymPy expression or lambda expression of d variables
+            limits (Sequence): One (lower, upper) pair per variable, innermost first. Each limit is a number or a
+                function of the variables after it.
+            n (int | Sequence[int]): Number of nodes along every dimension, or along each one
+            variables (str | Sequence[str] | None = None): Names of the variables of a SymPy integrand, in order.
+                Default is x, y, z up to 3 dimensions and x0, x1, ... beyond.
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+    f, limits = _prepare(f, limits, variables)
+
+    orders = (n,) * len(limits) if isinstance(n, (int, np.integer)) else tuple(n)
+    if len(orders) != len(limits):
+        raise ValueError("'n' must be an integer or give one order per variable.")
+
+    points, weights = tensor_grid(orders)
+    I, = _apply(f, limits, points, [weights], vectorized)
+
+    return IntegrationResult(I, n_evals=len(points), method='tensor_gauss_legendre') if full_output else I
+
+
+@instrumented
+def smolyak(f: sympy.Expr | Callable[..., float], limits: Sequence, level: int,
+            variables: str | Sequence[str] | None = None, vectorized: bool | None = None,
+            full_output: bool = False) -> float | IntegrationResult:
+    """N-dimensional sparse grid (Smolyak) cubature from nested Clenshaw-Curtis rules, for higher dimensions.
+
+        Where the tensor product of 1-D rules needs n^d points, the sparse grid of a given level only combines
+        products that are fine in a few dimensions at once: in 5 dimensions, level 5 has 801 points and integrates
+        polynomials of total degree 9 exactly. Limits follow tensor_gauss_legendre. Point sets are built once per
+        (dimension, level) and cached.
+
+        Parameters:
+            f (sympy.Expr | Callable[..., float]): A SymPy expression or lambda expression of d variables
+            limits (Sequence): One (lower, upper) pair per variable, innermost first. Each limit is a number or a
+                function of the variables after it.
+            level (int): Level of the sparse grid, 1 for the centre point alone
+            variables (str | Sequence[str] | None = None): Names of the variables of a SymPy integrand, in order.
+                Default is x, y, z up to 3 dimensions and x0, x1, ... beyond.
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count and, from level 2,
+                the difference to the level below as error estimate) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+    f, limits = _prepare(f, limits, variables)
+
+    points, weights, coarse_weights = smolyak_grid(len(limits), level)
+
+    if not full_output:
+        I, = _apply(f, limits, points, [weights], vectorized)
+        return I
+
+    if coarse_weights is None:
+        I, = _apply(f, limits, points, [weights], vectorized)
+        return IntegrationResult(I, None, len(points), method='smolyak')
+
+    # The coarser rule reuses the same evaluations
+    I, I_coarse = _apply(f, limits, points, [weights, coarse_weights], vectorized)
+    return IntegrationResult(I, error_norm(I - I_coarse), len(points), method='smolyak')
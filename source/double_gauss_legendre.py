@@ -1,23 +1,31 @@
-from typing import Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
-from numpy.polynomial import Polynomial, Legendre
-from source.gauss_legendre import gauss_legendre
-
-def checkfun(fun, num_vars):
-    """Helper function. Ensures the function is evaluated as a lambda expression."""
-    if isinstance(fun, sympy.Expr):
-        variables = sympy.symbols('x y')[:num_vars] # Lets checkfun be applied to fun's w/ up to 2 variables (x and y)
-        fun = lambdify(variables, fun, modules=['numpy'])
-    return fun
 
+from source.node_cache import get_nodes
+from source.vectorize import evaluate
+from source.lambdify_cache import as_callable
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+
+def checkfun(fun, num_vars, instrument=True):
+    """Helper function. Ensures the function is evaluated as a lambda expression. Limits pass instrument=False,
+    so their evaluations are not counted as evaluations of the integrand."""
+    variables = ('x', 'y')[:num_vars]  # Lets checkfun be applied to fun's w/ up to 2 variables (x and y)
+    return as_callable(fun, variables, instrument)
+
+@instrumented
 def double_gauss_legendre(f: sympy.Expr | Callable[[float], float],
                           a: int | float, b: int | float,
                           c: Callable[[float], float] | int | float,
                           d: Callable[[float], float] | int | float,
-                          n: int, m: int) -> float:
+                          n: int, m: int, vectorized: bool | None = None,
+                          full_output: bool = False) -> float | IntegrationResult:
     """Gauss-Legendre double integral approximation. Note that the bounds of the inner integral may be real numbers or functions.
 
         Parameters:
@@ -27,9 +35,13 @@ def double_gauss_legendre(f: sympy.Expr | Callable[[float], float],
             c (Callable[[float], float] | int | float): The lower limit of integration for the inner integral
             d (Callable[[float], float] | int | float): The upper limit of integration for the inner integral
             n (int): The number of iterations for the outer integral
+            m (int): The number of iterations for the inner integral
+            vectorized (bool | None = None): True evaluates f (and callable c/d) once on the whole node grid,
+                False evaluates them point by point. None (default) tries the grid call and falls back.
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -48,16 +60,25 @@ def double_gauss_legendre(f: sympy.Expr | Callable[[float], float],
 
     # Ensure the functions are evaluated as lambda expressions
     f = checkfun(f, 2)
-    c = checkfun(c, 1) if callable(c) else c
-    d = checkfun(d, 1) if callable(d) else d
-
-    # Define inner integral
-    def _inner_integral(y):
-        """Inner function for double_gauss_legendre. Computes the inner integral of with respect to x."""
-        cx = c(y) if callable(c) else c
-        dx = d(y) if callable(d) else d
-        return gauss_legendre(lambda x: f(x, y), cx, dx, m)
-
-    # Apply nested integral w/ inner function.
-    I = gauss_legendre(_inner_integral, a, b, n)
-    return I
\ No newline at end of file
+    c = checkfun(c, 1, instrument=False) if callable(c) else c
+    d = checkfun(d, 1, instrument=False) if callable(d) else d
+
+    # Outer (y) and inner (x) nodes on [-1, 1], shared through the node cache
+    ynodes, yweights = get_nodes('legendre', n)
+    xnodes, xweights = get_nodes('legendre', m)
+
+    # Map the outer nodes onto [a, b] and get the inner limits at every one of them
+    yarr = 0.5 * ((b - a) * ynodes + (b + a))
+    carr = evaluate(c, yarr, vectorized=vectorized) if callable(c) else np.full(n, float(c))
+    darr = evaluate(d, yarr, vectorized=vectorized) if callable(d) else np.full(n, float(d))
+
+    # Build the (n, m) grid of inner nodes mapped onto [c(y), d(y)] for each outer node
+    half_width = 0.5 * (darr - carr)
+    xgrid = half_width[:, None] * xnodes[None, :] + 0.5 * (darr + carr)[:, None]
+    ygrid = np.broadcast_to(yarr[:, None], xgrid.shape)
+
+    fgrid = evaluate(f, xgrid, ygrid, vectorized=vectorized)
+
+    # Weighted sum over the grid times both jacobian factors, producing answer
+    I = 0.5 * (b - a) * np.einsum('i,i,j,ij...->...', yweights, half_width, xweights, fgrid)
+    return IntegrationResult(I, n_evals=n * m, method='double_gauss_legendre') if full_output else I
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+import numpy as np
+
+from source.node_cache import register_rule
+from source.clenshaw_curtis import _waldvogel_moments, _fixed_rule, _nested_incremental
+from source.lambdify_cache import as_callable
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+# Per kind: number of nodes of the next nested level, and where the current nodes sit among them
+_REFINEMENT = {
+    1: (lambda n: 3 * n, slice(1, None, 3)),
+    2: (lambda n: 2 * n + 1, slice(1, None, 2)),
+}
+
+
+def _fejer1_rule(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Helper function. Fejer's first rule with n nodes on [-1, 1], the Chebyshev roots -cos((k + 1/2) pi / n), in
+    ascending order. Weights by inverse FFT (Waldvogel, 2006).
+    """
+    m = n - len(range(1, n, 2))
+    K = np.arange(m)
+    v0 = np.concatenate([2 * np.exp(1j * np.pi * K / n) / (1 - 4 * K ** 2), np.zeros(n - m + 1)])
+    v1 = v0[:-1] + np.conj(v0[:0:-1])
+
+    return -np.cos(np.pi * (np.arange(n) + 0.5) / n), np.fft.ifft(v1).real
+
+
+def _fejer2_rule(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Helper function. Fejer's second rule with n nodes on [-1, 1], the interior Chebyshev extrema
+    -cos(k pi / (n + 1)), in ascending order. Weights by inverse FFT (Waldvogel, 2006).
+    """
+    N = n + 1
+    _, _, v2 = _waldvogel_moments(N)
+
+    # The first weight belongs to the endpoint, which is not a node
+    return -np.cos(np.pi * np.arange(1, N) / N), np.fft.ifft(v2).real[1:]
+
+
+register_rule('fejer1', _fejer1_rule)
+register_rule('fejer2', _fejer2_rule)
+
+
+@instrumented
+def fejer(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, n: int, kind: int = 2,
+          vectorized: bool | None = None, full_output: bool = False) -> float | IntegrationResult:
+    """Fejer integral approximation.
+
+        Like Clenshaw-Curtis, but on interior Chebyshev points only, so f is never evaluated at the endpoints and
+        integrable endpoint singularities are fine. The first rule uses the n roots of a Chebyshev polynomial, which
+        are reused by the rule with 3n nodes; the second uses n interior extrema, reused by the rule with 2n + 1.
+        Weights come from an FFT and are cached per n.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
+            a (int | float): The lower limit of integration
+            b (int | float): The upper limit of integration
+            n (int): The number of nodes
+            kind (int = 2): Fejer's first (1) or second (2) rule
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count and, when the nodes
+                contain those of a smaller rule of the same kind, the difference to it as error estimate) instead
+                of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if kind not in _REFINEMENT:
+        raise ValueError("'kind' must be 1 or 2.")
+
+    if n < 1 or not isinstance(n, (int, np.integer)):
+        raise ValueError("n must be a positive integer.")
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    # The smaller rule of the same kind whose nodes are part of these, if any
+    coarse = None
+    if kind == 1 and n % 3 == 0:
+        coarse = (n // 3, _REFINEMENT[1][1])
+    elif kind == 2 and n % 2 == 1 and n > 1:
+        coarse = ((n - 1) // 2, _REFINEMENT[2][1])
+
+    return _fixed_rule(f, a, b, f'fejer{kind}', n, coarse, vectorized, 'fejer', full_output)
+
+
+@instrumented
+def fejer_incremental(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, tol: float,
+                      n: int = 3, kind: int = 2, max_levels: int = 12, min_levels: int = 2,
+                      vectorized: bool | None = None,
+                      full_output: bool = False) -> tuple[float, float] | IntegrationResult:
+    """Fejer integral approximation, refined level by level until successive estimates agree.
+
+        Each level keeps every node of the previous one: the second rule goes from n to 2n + 1 nodes, the first
+        from n to 3n. Only the new nodes are evaluated, and the refinement stops as soon as two successive
+        estimates differ by at most 'tol'.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
+            a (int | float): The lower limit of integration
+            b (int | float): The upper limit of integration
+            tol (int | float): The desired tolerance of the approximation
+            n (int = 3): The number of nodes of the first level
+            kind (int = 2): Fejer's first (1) or second (2) rule
+            max_levels (int = 12): Maximum number of levels
+            min_levels (int = 2): Number of levels computed before convergence is checked
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult (value, error estimate, evaluation count,
+                convergence flag) instead of a tuple
+
+        Returns:
+            I, error (tuple[float, float] | IntegrationResult): Last estimate and its difference to the previous one
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if kind not in _REFINEMENT:
+        raise ValueError("'kind' must be 1 or 2.")
+
+    if n < 1 or not isinstance(n, (int, np.integer)):
+        raise ValueError("n must be a positive integer.")
+
+    if max_levels < 2 or not isinstance(max_levels, int):
+        raise ValueError("'max_levels' must be an integer greater than 1.")
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    grow, positions = _REFINEMENT[kind]
+    return _nested_incremental(f, a, b, tol, f'fejer{kind}', n, grow, positions, max_levels, min_levels,
+                               vectorized, 'fejer_incremental', full_output)
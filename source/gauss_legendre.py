@@ -1,12 +1,21 @@
-from typing import Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
-from numpy.polynomial import Polynomial, Legendre
 
+from source.node_cache import get_nodes
+from source.vectorize import evaluate
+from source.lambdify_cache import as_callable
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
-def gauss_legendre(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, n: int) -> float:
+
+@instrumented
+def gauss_legendre(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, n: int,
+                   vectorized: bool | None = None, full_output: bool = False) -> float | IntegrationResult:
     """Gauss-Legendre integral approximation.
 
         Parameters:
@@ -14,9 +23,12 @@ def gauss_legendre(f: sympy.Expr | Callable[[float], float], a: int | float, b:
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
             n (int): The number of iterations
+            vectorized (bool | None = None): True calls f once with the array of all nodes, False calls f once
+                per node. None (default) tries the array call and falls back to per-node calls.
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -30,20 +42,16 @@ def gauss_legendre(f: sympy.Expr | Callable[[float], float], a: int | float, b:
         raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
-
-    # Find roots/weights w/ np. Could add in an approx routine with Newton's method on Chebyshev nodes
-    nodes, weights = np.polynomial.legendre.leggauss(n)
+    f = as_callable(f)
 
-    px_arr = []
+    # Roots/weights come from the shared node cache, so leggauss only runs once per order
+    nodes, weights = get_nodes('legendre', n)
 
-    for i in range(n):
-        x = 0.5 * ((b - a) * nodes[i] + (b + a))  # is ~x centered on -1 to 1
-        px = weights[i] * f(x)
-        px_arr.append(px)
+    # Map every node from [-1, 1] onto [a, b] and evaluate f at all of them at once
+    xarr = 0.5 * ((b - a) * nodes + (b + a))
+    yarr = evaluate(f, xarr, vectorized=vectorized)
 
-    # Sum the elements of array times the jacobian factor, producing answer
-    I = sum(px_arr) * (b - a) * 0.5
+    # Weighted sum of the values times the jacobian factor, producing answer
+    I = np.dot(weights, yarr) * (b - a) * 0.5
 
-    return I
+    return IntegrationResult(I, n_evals=n, method='gauss_legendre') if full_output else I
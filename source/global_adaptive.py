@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+from source.lambdify_cache import as_callable
+from source.transforms import transform_interval
+from source.adaptive_engine import MidpointRule, GaussLegendreRule, composite_simpson_rule, \
+    trapezoid_rule, global_integrate, MAX_DEPTH, MAX_EVALS
+from source.result import IntegrationResult
+from source.gauss_kronrod import GaussKronrodRule
+from source.instrumentation import instrumented
+
+if TYPE_CHECKING:
+    import sympy
+
+# Local rules available to global_adaptive, by name. Each factory takes the order n, None for the rule's default.
+RULES = {
+    'simpson': lambda n: composite_simpson_rule(2),
+    'midpoint': lambda n: MidpointRule(),
+    'trapezoidal': lambda n: trapezoid_rule(),
+    'gauss_legendre': lambda n: GaussLegendreRule(n or 5),
+    'gauss_kronrod': lambda n: GaussKronrodRule(n or 7),
+}
+
+
+@instrumented
+def global_adaptive(f: sympy.Expr | Callable[[float], float], a: float, b: float, tol: float,
+                    rule: str = 'simpson', n: int | None = None, max_depth: int = MAX_DEPTH,
+                    max_evals: int | None = MAX_EVALS, min_width: float = 0.0,
+                    full_output: bool = False) -> float | IntegrationResult:
+    """Globally adaptive integral approximation (QUADPACK QAG style).
+
+        Keeps a heap of subintervals keyed by their local error estimate, always bisects the worst one and stops
+        once the summed error estimate meets 'tol'. Unlike the depth-first adaptive rules, the tolerance is not
+        split evenly between subintervals, so well-resolved regions are never refined further.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
+            a (int | float): The lower limit of integration, may be -np.inf
+            b (int | float): The upper limit of integration, may be np.inf
+            tol (int | float): The desired tolerance of the approximation
+            rule (str = 'simpson'): The local rule, one of 'simpson', 'midpoint', 'trapezoidal', 'gauss_legendre',
+                'gauss_kronrod'
+            n (int | None = None): Order of the 'gauss_legendre' (default 5) or 'gauss_kronrod' (default 7) rule
+            max_depth (int = MAX_DEPTH): Maximum number of successive bisections. Default is 50.
+            max_evals (int | None = MAX_EVALS): Budget of evaluations of f, None for no limit. Default is 10**6.
+            min_width (float = 0.0): Subintervals narrower than this are not split further
+            full_output (bool = False): Return an IntegrationResult (value, error estimate, evaluation count,
+                convergence flag) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if rule not in RULES:
+        raise ValueError(f"'rule' must be one of {', '.join(RULES)}.")
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    # Map infinite limits onto a finite interval
+    f, a, b = transform_interval(f, a, b)
+
+    result = global_integrate(f, a, b, tol, RULES[rule](n), max_depth, max_evals, min_width)
+    result.method = 'global_adaptive'
+
+    return result if full_output else result.value
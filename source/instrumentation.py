@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Iterator
+import functools
+import inspect
+
+import numpy as np
+
+# Phases whose time is measured. 'reduction' is whatever the entry points spend outside the other three.
+PHASES = ('compile', 'nodes', 'evaluation', 'reduction')
+
+# Statistics currently collecting, innermost last. Empty means instrumentation is off.
+_collectors: ContextVar[tuple] = ContextVar('nit_collectors', default=())
+
+# Number of instrumented entry points on the call stack, so nested calls are not timed twice
+_entry_depth: ContextVar[int] = ContextVar('nit_entry_depth', default=0)
+
+# Callbacks run after every outermost entry point call, with the statistics of that call
+_hooks: list[Callable[[str, 'Stats'], None]] = []
+
+
+class Stats:
+    """Statistics collected while instrumentation is on.
+
+        Attributes:
+            calls (Counter): Number of calls of every entry point, e.g. {'gauss_legendre': 2}
+            n_evals (int): Number of points the integrand was evaluated at
+            n_f_calls (int): Number of calls of the integrand (less than n_evals for array calls)
+            times (dict[str, float]): Seconds spent in every phase of PHASES, and 'total' for whole entry point calls
+            depth_histogram (Counter): Number of final adaptive subintervals by depth of bisection
+            n_intervals (int): Number of final adaptive subintervals
+    """
+    __slots__ = ('calls', 'n_evals', 'n_f_calls', '_times', 'depth_histogram', 'n_intervals')
+
+    def __init__(self):
+        self.calls = Counter()
+        self.n_evals = 0
+        self.n_f_calls = 0
+        self._times = dict.fromkeys(('compile', 'nodes', 'evaluation', 'total'), 0.0)
+        self.depth_histogram = Counter()
+        self.n_intervals = 0
+
+    @property
+    def times(self) -> dict[str, float]:
+        times = dict(self._times)
+        times['reduction'] = max(0.0, times['total'] - times['compile'] - times['nodes'] - times['evaluation'])
+        return times
+
+    def as_dict(self) -> dict:
+        """Plain-dict form, e.g. for logging as JSON."""
+        return {
+            'calls': dict(self.calls),
+            'n_evals': self.n_evals,
+            'n_f_calls': self.n_f_calls,
+            'times': self.times,
+            'depth_histogram': dict(sorted(self.depth_histogram.items())),
+            'n_intervals': self.n_intervals,
+        }
+
+    def __repr__(self):
+        times = ', '.join(f'{phase}={seconds:.3g}s' for phase, seconds in self.times.items())
+        return (f"Stats(calls={dict(self.calls)}, n_evals={self.n_evals}, n_f_calls={self.n_f_calls}, "
+                f"n_intervals={self.n_intervals}, times=({times}))")
+
+
+@contextmanager
+def collect(callback: Callable[[Stats], None] | None = None) -> Iterator[Stats]:
+    """Collect statistics of every integration run inside the block.
+
+        Collectors nest: an outer collector also sees everything an inner one does. Statistics are kept per
+        context, so concurrent asyncio tasks started inside the block are included, but work handed to threads or
+        processes of a pool is not (register a hook with add_hook to see those).
+
+        Parameters:
+            callback (Callable[[Stats], None] | None = None): Called with the statistics when the block exits
+
+        Returns:
+            stats (Stats): Filled in as the block runs
+    """
+    stats = Stats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+        if callback is not None:
+            callback(stats)
+
+
+def add_hook(hook: Callable[[str, Stats], None]) -> None:
+    """Register a callback run after every outermost call of an entry point (in any thread), with the entry point's
+    name and the statistics of that call. While hooks are registered, instrumentation is on everywhere.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[str, Stats], None]) -> None:
+    """Unregister a callback registered with add_hook."""
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    """True if statistics are being collected in the current context."""
+    return bool(_collectors.get())
+
+
+def add_time(phase: str, seconds: float) -> None:
+    """Adds the time spent in a phase to every active collector."""
+    for stats in _collectors.get():
+        stats._times[phase] += seconds
+
+
+def record_intervals(depths) -> None:
+    """Adds the depths of the final subintervals of an adaptive integration to every active collector."""
+    for stats in _collectors.get():
+        stats.depth_histogram.update(depths)
+        stats.n_intervals += len(depths)
+
+
+def _record_evals(args: tuple, seconds: float) -> None:
+    """Helper function. Records one call of the integrand."""
+    collectors = _collectors.get()
+    if not collectors:
+        return
+    n = np.broadcast(*args).size if len(args) > 1 else np.size(args[0])
+    for stats in collectors:
+        stats.n_evals += n
+        stats.n_f_calls += 1
+        stats._times['evaluation'] += seconds
+
+
+class _Instrumented:
+    """Integrand wrapper counting and timing the calls of f. Awaitables returned by async integrands are timed
+    until they complete.
+    """
+    __slots__ = ('f',)
+
+    def __init__(self, f: Callable):
+        self.f = f
+
+    def __call__(self, *args):
+        start = perf_counter()
+        value = self.f(*args)
+        if inspect.isawaitable(value):
+            return self._await(value, args, start)
+        _record_evals(args, perf_counter() - start)
+        return value
+
+    async def _await(self, awaitable, args: tuple, start: float):
+        value = await awaitable
+        _record_evals(args, perf_counter() - start)
+        return value
+
+
+def wrap(f: Callable) -> Callable:
+    """Returns f wrapped for counting and timing if statistics are being collected, else f itself."""
+    if not _collectors.get() or isinstance(f, _Instrumented):
+        return f
+    return _Instrumented(f)
+
+
+@contextmanager
+def _entry(name: str):
+    """Helper function. Counts a call of an entry point and times it if it is not nested in another one."""
+    depth = _entry_depth.get()
+    depth_token = _entry_depth.set(depth + 1)
+
+    # Hooks get the statistics of their own call only
+    call_stats = Stats() if depth == 0 and _hooks else None
+    token = _collectors.set(_collectors.get() + (call_stats,)) if call_stats is not None else None
+
+    collectors = _collectors.get()
+    for stats in collectors:
+        stats.calls[name] += 1
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        if depth == 0:
+            add_time('total', perf_counter() - start)
+        if token is not None:
+            _collectors.reset(token)
+        _entry_depth.reset(depth_token)
+        if call_stats is not None:
+            for hook in list(_hooks):
+                hook(name, call_stats)
+
+
+def instrumented(fun: Callable) -> Callable:
+    """Decorator for the public entry points. Costs one context variable lookup per call while instrumentation is
+    off.
+    """
+    name = fun.__name__
+
+    if inspect.iscoroutinefunction(fun):
+        @functools.wraps(fun)
+        async def async_wrapper(*args, **kwargs):
+            if not _hooks and not _collectors.get():
+                return await fun(*args, **kwargs)
+            with _entry(name):
+                return await fun(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fun)
+    def wrapper(*args, **kwargs):
+        if not _hooks and not _collectors.get():
+            return fun(*args, **kwargs)
+        with _entry(name):
+            return fun(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from math import ceil, log, log2
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from source.node_cache import get_nodes
+from source.vectorize import probe, error_norm
+from source.lambdify_cache import as_callable
+from source.transforms import transform_interval
+from source.gauss_kronrod import gauss_kronrod, _kronrod_estimate
+from source.romberg import romberg, romberg_incremental
+from source.global_adaptive import global_adaptive
+from source.adaptive_engine import MAX_EVALS
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+# Orders n of the two G(n)K(2n+1) probes, and the higher orders the whole-interval rule can be escalated to
+PROBE_ORDERS = (7, 15)
+KRONROD_ORDERS = (20, 25, 30)
+
+# Error ratio between the G7 and G15 probes from which the adaptive path uses G15K31 cells instead of G7K15.
+# Endpoint singularities and kinks gain less than this when the order doubles; analytic integrands gain more.
+SMOOTH_RATIO = 20.0
+
+# Rows of the Romberg probe (trapezoid grids of 1 to 16 subintervals) and of any Romberg run
+ROMBERG_PROBE_LEVELS = 5
+ROMBERG_MAX_LEVELS = 20
+
+# The Romberg probe is only run if it is predicted to cost less than this fraction of the adaptive path
+PROBE_BUDGET = 0.1
+
+# Seconds per abscissa spent by the rules themselves on array arithmetic, on top of the measured cost of f
+ARRAY_COST = 5e-9
+
+_EPMACH = np.finfo(float).eps
+
+
+class _Probe:
+    """Outcome of one G(n)K(2n+1) probe on the whole interval, with the time spent in f and in the rule."""
+    __slots__ = ('n', 'gauss', 'kronrod', 'error', 'resabs', 'resasc', 'f_seconds', 'overhead', 'vectorized')
+
+    def __init__(self, f: Callable, a: float, b: float, n: int, vectorized: bool | None):
+        start = perf_counter()
+        nodes, weights = get_nodes('kronrod', n)
+        half_length = 0.5 * (b - a)
+        xarr = half_length * nodes + 0.5 * (b + a)
+
+        f_start = perf_counter()
+        yarr, flag = probe(f, xarr, vectorized=vectorized)
+        self.f_seconds = perf_counter() - f_start
+
+        self.n = n
+        self.vectorized = vectorized if flag is None else flag
+        self.kronrod, self.error = _kronrod_estimate(yarr, weights, half_length)
+        self.gauss = np.dot(weights[1], yarr) * half_length
+        # Largest over the components of a vector-valued f
+        self.resabs = float(np.max(np.dot(weights[0], np.abs(yarr)))) * abs(half_length)
+        self.resasc = float(np.max(np.dot(weights[0], np.abs(yarr - self.kronrod / (b - a or 1))))) * abs(half_length)
+        self.overhead = perf_counter() - start - self.f_seconds
+
+
+def _predicted_seconds(calls: int, evals: int, steps: int, costs: tuple[float, float, float]) -> float:
+    """Helper function. Time of a path from its number of calls of f, evaluations and Gauss-Kronrod cells."""
+    per_call, per_point, per_step = costs
+    return calls * per_call + evals * per_point + steps * per_step
+
+
+@instrumented
+def integrate(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, tol: float = 1e-8,
+              max_evals: int | None = MAX_EVALS, full_output: bool = False) -> float | IntegrationResult:
+    """Integral approximation with automatic choice of the method.
+
+        The integrand is first probed with G7K15 and G15K31 on the whole interval, which is all a smooth integrand
+        needs. Otherwise a cost model picks the path that is predicted to meet 'tol' in the least time, from the
+        time measured per call and per point of f during the probes and the convergence seen between them:
+
+        - a higher-order Gauss-Kronrod rule on the whole interval, if the error keeps falling geometrically
+          with the order and a tabulated rule (up to G30K61) is predicted to reach the tolerance;
+        - Romberg's method, whose trapezoid grids are nested and cost little per point, if a short Romberg probe
+          shows it converging fast enough (typically cheap, vectorized integrands at moderate tolerances);
+        - global adaptive subdivision with Gauss-Kronrod cells, G15K31 if the probes show a smooth integrand and
+          G7K15 otherwise.
+
+        If the chosen path does not meet the tolerance, the next cheapest is tried, ending with the adaptive one.
+        Tolerances below the rounding error of the integral are raised to it, and convergence is reported
+        against the raised tolerance.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
+            a (int | float): The lower limit of integration, may be -np.inf
+            b (int | float): The upper limit of integration, may be np.inf
+            tol (float = 1e-8): The desired absolute error of the approximation
+            max_evals (int | None = MAX_EVALS): Budget of evaluations of f over all paths, None for no limit.
+                Default is 10**6.
+            full_output (bool = False): Return an IntegrationResult whose method lists the path taken, e.g.
+                'gauss_kronrod(n=7) -> gauss_kronrod(n=15) -> global_adaptive(rule=gauss_kronrod, n=7)', with the
+                error estimate and the evaluations of all steps
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    if tol <= 0:
+        raise ValueError("'tol' must be positive.")
+
+    if max_evals is not None and max_evals < 1:
+        raise ValueError("'max_evals' must be a positive integer or None.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    # Map infinite limits onto a finite interval
+    f, a, b = transform_interval(f, a, b)
+
+    path = []
+    n_evals = 0
+    target = tol  # raised to the rounding error of the integral once the probes know it
+
+    def finish(result: IntegrationResult) -> float | IntegrationResult:
+        result = IntegrationResult(result.value, result.error, n_evals, result.n_intervals,
+                                   result.error is not None and result.error <= target, ' -> '.join(path))
+        return result if full_output else result.value
+
+    # Probes: G7K15, then G15K31
+    probes = []
+    vectorized = None
+    for n in PROBE_ORDERS:
+        current = _Probe(f, a, b, n, vectorized)
+        vectorized = current.vectorized
+        probes.append(current)
+        path.append(f'gauss_kronrod(n={n})')
+        n_evals += 2 * n + 1
+
+        # Below 50 * eps * resabs the error estimate cannot go, however the integral is refined
+        target = max(tol, 50 * _EPMACH * current.resabs)
+        if current.error <= target:
+            return finish(IntegrationResult(current.kronrod, current.error, 2 * n + 1))
+
+    low, high = probes
+    remaining = None if max_evals is None else max_evals - n_evals
+
+    # Cost of f per call and per point, fitted to the two probes, and of the rule per cell
+    per_point = max((high.f_seconds - low.f_seconds) / (2 * (high.n - low.n)), 0.0)
+    per_call = max(low.f_seconds - (2 * low.n + 1) * per_point, 0.0)
+    costs = (per_call, per_point + ARRAY_COST, min(low.overhead, high.overhead))
+
+    # Errors of the two Gauss rules, measured against K31
+    gauss_errors = error_norm(low.gauss - high.kronrod), error_norm(high.gauss - high.kronrod)
+    gain = gauss_errors[0] / gauss_errors[1] if gauss_errors[1] > 0 else np.inf
+
+    # Each path is (predicted seconds, label, run, evaluations)
+    paths = []
+
+    # Whole-interval Gauss-Kronrod: the error falls by 'rate' per Gauss node and is accepted once the QUADPACK
+    # estimate resasc * (200 * |G - K| / resasc)^1.5 is within the target
+    if 1 < gain < np.inf and high.resasc > 0:
+        rate = log(gain) / (high.n - low.n)
+        needed = high.resasc * (target / high.resasc) ** (2 / 3) / 200
+        for n in KRONROD_ORDERS:
+            if gauss_errors[1] * np.exp(-rate * (n - high.n)) <= needed:
+                paths.append((_predicted_seconds(1, 2 * n + 1, 1, costs), f'gauss_kronrod(n={n})',
+                              lambda n=n: gauss_kronrod(f, a, b, n, vectorized=vectorized, full_output=True),
+                              2 * n + 1))
+                break
+
+    # Global adaptive subdivision. Near a singularity x^alpha the G(n) error falls like n^-2(alpha+1) and a
+    # bisection divides the local error by 2^(alpha+1), so the probes also predict the number of bisections.
+    cell = high if gain >= SMOOTH_RATIO else low
+    slope = max(log(gain) / log(high.n / low.n) / 2, 1.0) if gain > 1 else 1.0
+    bisections = max(1, ceil(log2(max(cell.error / target, 2.0)) / slope))
+    evals = (2 * cell.n + 1) * (2 * bisections + 1)
+    adaptive_seconds = _predicted_seconds(bisections + 1, evals, 2 * bisections + 1, costs)
+    paths.append((adaptive_seconds, f'global_adaptive(rule=gauss_kronrod, n={cell.n})',
+                  lambda: global_adaptive(f, a, b, target, rule='gauss_kronrod', n=cell.n, max_evals=remaining,
+                                          full_output=True),
+                  0))
+
+    # Romberg: probed with a few trapezoid grids when that is cheap next to the adaptive path, then predicted from
+    # the convergence of the trapezoid column. A Romberg row costs little on top of its call of f.
+    probe_evals = 2 ** (ROMBERG_PROBE_LEVELS - 1) + 1
+    probe_seconds = _predicted_seconds(ROMBERG_PROBE_LEVELS, probe_evals, 0, costs)
+    table = None
+    if probe_seconds <= PROBE_BUDGET * adaptive_seconds and (remaining is None or probe_evals < remaining):
+        # Unlike the Gauss-Kronrod nodes, the trapezoid grids include the endpoints, where f may be singular
+        try:
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                table = romberg(f, a, b, ROMBERG_PROBE_LEVELS)
+        except (ArithmeticError, ValueError):
+            pass
+        else:
+            path.append(f'romberg(n={ROMBERG_PROBE_LEVELS})')
+            n_evals += probe_evals
+            remaining = None if max_evals is None else max_evals - n_evals
+
+    if table is not None and np.all(np.isfinite(table)):
+        error = error_norm(table[-1, -1] - table[-2, -2])
+        if error <= target:
+            return finish(IntegrationResult(table[-1, -1], error, probe_evals, probe_evals - 1))
+
+        changes = np.abs(np.diff(table[:, 0], axis=0)).reshape(len(table) - 1, -1).max(axis=1)
+        if changes[-1] > 0 and changes[-2] > changes[-1]:
+            order = log2(changes[-2] / changes[-1])
+            levels = ROMBERG_PROBE_LEVELS + max(1, ceil(log2(changes[-1] / ((2 ** order - 1) * target)) / order))
+            if levels < ROMBERG_MAX_LEVELS:
+                # One row more than predicted before giving up on Romberg
+                paths.append((_predicted_seconds(levels, 2 ** (levels - 1) + 1, 0, costs), 'romberg_incremental',
+                              lambda: romberg_incremental(f, a, b, target, max_levels=levels + 1, full_output=True),
+                              2 ** levels + 1))
+
+    # Escalate from the cheapest predicted path until one meets the tolerance
+    best = IntegrationResult(high.kronrod, high.error, 2 * high.n + 1)
+    for _, label, run, evals in sorted(paths, key=lambda entry: entry[0]):
+        if remaining is not None and remaining <= 0:
+            break
+        if remaining is not None and evals > remaining:
+            continue
+        result = run()
+        path.append(label)
+        n_evals += result.n_evals
+        remaining = None if max_evals is None else max_evals - n_evals
+
+        if result.error is not None and result.error < best.error:
+            best = result
+        if result.error is not None and result.error <= target:
+            return finish(result)
+
+    return finish(best)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Sequence
+import sys
+
+from source.lru import LRUCache, CacheInfo
+from source import instrumentation
+
+if TYPE_CHECKING:
+    import sympy
+
+_cache = LRUCache(maxsize=512)
+
+
+def compile_expr(expr: sympy.Expr, variables: str | Sequence[str] = 'x',
+                 modules: Sequence[str] = ('numpy',)) -> Callable:
+    """Lambdify a SymPy expression, reusing the compiled function for structurally equal expressions.
+
+        Parameters:
+            expr (sympy.Expr): The expression to compile
+            variables (str | Sequence[str] = 'x'): Names of the arguments of the compiled function, in order
+            modules (Sequence[str] = ('numpy',)): Modules passed to lambdify
+
+        Returns:
+            fun (Callable): The compiled function, shared with every caller using the same key
+    """
+    # SymPy is only imported once an expression actually has to be compiled
+    import sympy
+    from sympy.utilities.lambdify import lambdify
+
+    if isinstance(variables, str):
+        variables = variables.split()
+    symbols = tuple(sympy.Symbol(name) if isinstance(name, str) else name for name in variables)
+    modules = tuple(modules)
+
+    # SymPy expressions hash and compare structurally, so equal expressions share one entry
+    key = (expr, symbols, modules)
+
+    def _build():
+        start = perf_counter()
+        fun = lambdify(symbols, expr, modules=list(modules))
+        instrumentation.add_time('compile', perf_counter() - start)
+        return fun
+
+    return _cache.get(key, _build)
+
+
+def is_sympy_expr(f) -> bool:
+    """True if f is a SymPy expression. Never imports SymPy: if it is not loaded, f cannot be an expression."""
+    sympy = sys.modules.get('sympy')
+    return sympy is not None and isinstance(f, sympy.Expr)
+
+
+def as_callable(f: sympy.Expr | Callable, variables: str | Sequence[str] = 'x', instrument: bool = True) -> Callable:
+    """Return f unchanged if it is already callable, else its cached compiled form. While instrumentation is on,
+    the result is wrapped to count and time its calls, unless 'instrument' is False (for functions that are not
+    the integrand, such as variable limits).
+    """
+    if is_sympy_expr(f):
+        f = compile_expr(f, variables)
+    return instrumentation.wrap(f) if instrument else f
+
+
+def set_cache_size(maxsize: int | None) -> None:
+    """Set the maximum number of compiled expressions kept. None means unbounded."""
+    _cache.resize(maxsize)
+
+
+def cache_info() -> CacheInfo:
+    """Hit/miss statistics and current size of the compiled-integrand cache."""
+    return _cache.info()
+
+
+def clear_cache() -> None:
+    """Empty the compiled-integrand cache and reset its statistics."""
+    _cache.clear()
@@ -0,0 +1,73 @@
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable
+import threading
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """Thread-safe mapping bounded to 'maxsize' entries with least-recently-used eviction.
+
+        Used by the toolbox's shared caches (quadrature nodes, compiled integrands). A 'maxsize' of None
+        disables eviction, a 'maxsize' of 0 disables caching altogether.
+    """
+
+    def __init__(self, maxsize: int | None = 128):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the value cached under 'key', creating it with 'factory()' on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+
+        # Build outside the lock so a slow factory does not block readers of other keys
+        value = factory()
+
+        with self._lock:
+            if self._maxsize != 0:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                self._evict()
+        return value
+
+    def resize(self, maxsize: int | None) -> None:
+        """Change the maximum number of entries, evicting the oldest ones if necessary."""
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 0):
+            raise ValueError("'maxsize' must be a non-negative integer or None.")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return a CacheInfo(hits, misses, maxsize, currsize) snapshot."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _evict(self) -> None:
+        if self._maxsize is None:
+            return
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
@@ -1,20 +1,29 @@
-from typing import Union, Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
+
+from source.lambdify_cache import as_callable
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
 
-def midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float]) -> float:
+@instrumented
+def midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float],
+             full_output: bool = False) -> float | IntegrationResult:
     """Midpoint integral approximation.
 
         Parameters:
             f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
 
         Returns:
-            M (float): Floating point approximation of the integral
+            M (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -28,8 +37,7 @@ def midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b:
         raise InvalidIntervalException("The upper limit 'a' must be greater than the lower limit 'b'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
     # Get step size and midpoint
     h = (b - a)
@@ -38,4 +46,4 @@ def midpoint(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b:
     # Compute approximation I with Midpoint approximation formula
     M = h * f(c)
 
-    return M
+    return IntegrationResult(M, n_evals=1, method='midpoint') if full_output else M
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Iterator, Sequence
+import numpy as np
+
+from source.vectorize import probe, error_norm
+from source.cubature import _prepare, _map_to_region
+from source.adaptive_engine import MAX_EVALS
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+# Primitive polynomials and initial direction numbers of Joe and Kuo (new-joe-kuo-6.21201) for dimensions 2 to 21,
+# as (degree s, coefficients a, m_1 ... m_s). The first dimension is the van der Corput sequence in base 2.
+_JOE_KUO = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+
+# Bits per Sobol coordinate, i.e. at most 2^BITS points per sequence
+BITS = 32
+
+MAX_SOBOL_DIM = len(_JOE_KUO) + 1
+
+SEQUENCES = ('sobol', 'halton', 'random')
+
+
+def _sobol_directions() -> np.ndarray:
+    """Helper function. Direction numbers V[d, k] of every supported dimension, scaled to BITS bits."""
+    directions = np.zeros((MAX_SOBOL_DIM, BITS), dtype=np.uint64)
+    directions[0] = [1 << (BITS - 1 - k) for k in range(BITS)]
+
+    for d, (s, a, m) in enumerate(_JOE_KUO, start=1):
+        v = [0] * BITS
+        for k in range(min(s, BITS)):
+            v[k] = m[k] << (BITS - 1 - k)
+        for k in range(s, BITS):
+            v[k] = v[k - s] ^ (v[k - s] >> s)
+            for j in range(1, s):
+                if (a >> (s - 1 - j)) & 1:
+                    v[k] ^= v[k - j]
+        directions[d] = v
+
+    return directions
+
+
+_DIRECTIONS = _sobol_directions()
+
+
+def _sobol(dim: int, start: int, count: int) -> np.ndarray:
+    """Helper function. Points start, ..., start + count - 1 of the Sobol sequence as BITS-bit integers, computed
+    directly from the Gray code of their index, so blocks can be generated in any order.
+    """
+    index = np.arange(start, start + count, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    points = np.zeros((count, dim), dtype=np.uint64)
+
+    for k in range(BITS):
+        bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        points[bit] ^= _DIRECTIONS[:dim, k]
+
+    return points
+
+
+def _primes(count: int) -> list[int]:
+    """Helper function. The first 'count' primes."""
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _halton(dim: int, start: int, count: int) -> np.ndarray:
+    """Helper function. Points start, ..., start + count - 1 of the Halton sequence, one prime base per dimension."""
+    points = np.zeros((count, dim))
+
+    for d, base in enumerate(_primes(dim)):
+        index = np.arange(start, start + count)
+        scale = 1.0
+        while np.any(index > 0):
+            scale /= base
+            index, digit = np.divmod(index, base)
+            points[:, d] += digit * scale
+
+    return points
+
+
+def _blocks(sequence: str, dim: int, replicates: int, block_size: int,
+            rng: np.random.Generator) -> Iterator[np.ndarray]:
+    """Helper function. Yields (replicates, block_size, dim) arrays of points in [0, 1)^d, block after block.
+
+        Every replicate is the same low-discrepancy sequence under its own random shift: a digital shift (XOR)
+        for Sobol, which preserves its net structure, and a shift modulo 1 (Cranley-Patterson) for Halton. The
+        replicates are independent and each one is an unbiased estimate, so their spread gives the error.
+    """
+    if sequence == 'sobol':
+        shifts = rng.integers(0, 1 << BITS, size=(replicates, 1, dim), dtype=np.uint64)
+    elif sequence == 'halton':
+        shifts = rng.random((replicates, 1, dim))
+
+    start = 0
+    while True:
+        if sequence == 'sobol':
+            if start + block_size > 1 << BITS:
+                return
+            yield (_sobol(dim, start, block_size)[None] ^ shifts) * 2.0 ** -BITS
+        elif sequence == 'halton':
+            yield (_halton(dim, start, block_size)[None] + shifts) % 1.0
+        else:
+            yield rng.random((replicates, block_size, dim))
+        start += block_size
+
+
+@instrumented
+def quasi_monte_carlo(f: sympy.Expr | Callable[..., float], limits: Sequence, tol: float = 1e-4,
+                      sequence: str = 'sobol', block_size: int = 1024, replicates: int = 8,
+                      max_evals: int | None = MAX_EVALS, seed: int | np.random.SeedSequence | None = None,
+                      variables: str | Sequence[str] | None = None, vectorized: bool | None = None,
+                      full_output: bool = False) -> float | IntegrationResult:
+    """Randomized quasi-Monte Carlo integration, for integrals in many dimensions.
+
+        'replicates' independently shifted copies of a low-discrepancy sequence are evaluated block by block, each
+        block in one call of f. The estimate is the mean of the replicates and its error the standard error of
+        that mean, and the sampling stops as soon as the error is within 'tol'. Only running sums are kept, so
+        memory does not grow with the number of samples. For Sobol points, powers of two for 'block_size' keep
+        every estimate on a balanced net.
+
+        Limits follow tensor_gauss_legendre: one (lower, upper) pair per variable, innermost first, each a number
+        or a function of the variables after it.
+
+        Parameters:
+            f (sympy.Expr | Callable[..., float]): A SymPy expression or lambda expression of d variables
+            limits (Sequence): One (lower, upper) pair per variable, innermost first
+            tol (float = 1e-4): The desired standard error of the approximation
+            sequence (str = 'sobol'): 'sobol' (up to 21 dimensions), 'halton', or 'random' for plain Monte Carlo
+            block_size (int = 1024): Number of points per replicate evaluated in each call of f
+            replicates (int = 8): Number of independently shifted sequences, at least 2
+            max_evals (int | None = MAX_EVALS): Budget of evaluations of f, None for no limit. Default is 10**6.
+            seed (int | np.random.SeedSequence | None = None): Seed of the random shifts. The same seed gives the
+                same result.
+            variables (str | Sequence[str] | None = None): Names of the variables of a SymPy integrand, in order
+            vectorized (bool | None = None): See source.vectorize.evaluate
+            full_output (bool = False): Return an IntegrationResult (value, standard error, evaluation count,
+                convergence flag) instead of a float
+
+        Returns:
+            I (float | IntegrationResult): Floating point approximation of the integral
+    """
+    if sequence not in SEQUENCES:
+        raise ValueError(f"'sequence' must be one of {', '.join(SEQUENCES)}.")
+
+    if block_size < 1 or not isinstance(block_size, int):
+        raise ValueError("'block_size' must be a positive integer.")
+
+    if replicates < 2 or not isinstance(replicates, int):
+        raise ValueError("'replicates' must be an integer greater than 1.")
+
+    if max_evals is not None and max_evals < replicates * block_size:
+        raise ValueError("'max_evals' must allow at least one block of every replicate.")
+
+    f, limits = _prepare(f, limits, variables)
+    dim = len(limits)
+
+    if sequence == 'sobol' and dim > MAX_SOBOL_DIM:
+        raise ValueError(f"Sobol points are available up to {MAX_SOBOL_DIM} dimensions, use sequence='halton'.")
+
+    rng = np.random.default_rng(seed)
+    sums = 0.0
+    n = 0  # points per replicate so far
+    estimates = error = None
+    converged = False
+
+    for block in _blocks(sequence, dim, replicates, block_size, rng):
+        if max_evals is not None and (n + block_size) * replicates > max_evals:
+            break
+
+        # All replicates of the block in one call of f, on points mapped from [-1, 1]^d
+        coords, jacobian = _map_to_region(2 * block.reshape(-1, dim) - 1, limits, vectorized)
+        values, flag = probe(f, *coords, vectorized=vectorized)
+        if vectorized is None:
+            vectorized = flag
+
+        values = (jacobian * 2.0 ** dim).reshape((-1,) + (1,) * (values.ndim - 1)) * values
+        sums = sums + values.reshape((replicates, block_size) + values.shape[1:]).sum(axis=1)
+        n += block_size
+
+        estimates = sums / n
+        error = error_norm(np.std(estimates, axis=0, ddof=1) / np.sqrt(replicates))
+        if error <= tol:
+            converged = True
+            break
+
+    I = np.mean(estimates, axis=0)
+
+    if full_output:
+        return IntegrationResult(I, error, n * replicates, 1, converged, 'quasi_monte_carlo')
+
+    return I
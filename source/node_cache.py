@@ -0,0 +1,110 @@
+from time import perf_counter
+from typing import Callable, Iterable
+import os
+
+import numpy as np
+
+from source.lru import LRUCache, CacheInfo
+from source import instrumentation
+
+# Environment variable read at import time, e.g. "2-32,64" or "legendre=2-32;legendre=64"
+PRECOMPUTE_ENV = 'NIT_PRECOMPUTE_ORDERS'
+
+_RULES = {
+    'legendre': np.polynomial.legendre.leggauss,
+    'laguerre': np.polynomial.laguerre.laggauss,
+    'hermite': np.polynomial.hermite.hermgauss,
+}
+
+_cache = LRUCache(maxsize=256)
+
+
+def register_rule(name: str, generator: Callable[[int], tuple[np.ndarray, np.ndarray]]) -> None:
+    """Register a node/weight generator so its output can be served from the shared cache.
+
+        Parameters:
+            name (str): Name of the rule, used as part of the cache key
+            generator (Callable[[int], tuple]): Function mapping the order n to a (nodes, weights) pair
+    """
+    _RULES[name] = generator
+
+
+def get_nodes(rule: str, n: int, dtype=np.float64) -> tuple[np.ndarray, np.ndarray]:
+    """Cached quadrature nodes and weights for the given rule and order.
+
+        Parameters:
+            rule (str): Name of a registered rule, e.g. 'legendre', 'laguerre' or 'hermite'
+            n (int): The order of the rule
+            dtype (np.dtype = np.float64): Floating point type of the returned arrays
+
+        Returns:
+            nodes, weights (tuple[np.ndarray, np.ndarray]): Read-only arrays shared by every caller
+    """
+    if rule not in _RULES:
+        raise ValueError(f"Unknown quadrature rule '{rule}'.")
+
+    if n < 1 or not isinstance(n, (int, np.integer)):
+        raise ValueError("n must be a positive integer.")
+
+    dtype = np.dtype(dtype)
+
+    def _build():
+        start = perf_counter()
+        nodes, weights = _RULES[rule](int(n))
+        nodes = np.array(nodes, dtype=dtype)
+        weights = np.array(weights, dtype=dtype)
+        nodes.setflags(write=False)
+        weights.setflags(write=False)
+        instrumentation.add_time('nodes', perf_counter() - start)
+        return nodes, weights
+
+    return _cache.get((rule, int(n), dtype), _build)
+
+
+def precompute(rule: str = 'legendre', orders: Iterable[int] = range(1, 65), dtype=np.float64) -> None:
+    """Populate the cache for every order in 'orders' ahead of time."""
+    for n in orders:
+        get_nodes(rule, n, dtype)
+
+
+def set_cache_size(maxsize: int | None) -> None:
+    """Set the maximum number of (rule, n, dtype) entries kept. None means unbounded."""
+    _cache.resize(maxsize)
+
+
+def cache_info() -> CacheInfo:
+    """Hit/miss statistics and current size of the node cache."""
+    return _cache.info()
+
+
+def clear_cache() -> None:
+    """Empty the node cache and reset its statistics."""
+    _cache.clear()
+
+
+def _parse_orders(spec: str) -> list[int]:
+    """Helper function. Parses '2-8,16' into [2, 3, ..., 8, 16]."""
+    orders = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            orders.extend(range(int(lo), int(hi) + 1))
+        else:
+            orders.append(int(part))
+    return orders
+
+
+def _precompute_from_env() -> None:
+    """Helper function. Warms the cache from the PRECOMPUTE_ENV variable, if set."""
+    spec = os.environ.get(PRECOMPUTE_ENV, '')
+    for group in spec.split(';'):
+        if not group.strip():
+            continue
+        rule, _, orders = group.rpartition('=')
+        precompute(rule.strip() or 'legendre', _parse_orders(orders))
+
+
+_precompute_from_env()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence
+import importlib
+import os
+import weakref
+
+from source.instrumentation import instrumented
+
+if TYPE_CHECKING:
+    import sympy
+
+# Number of chunks handed to each worker when chunk_size is not given. More than one keeps the load balanced.
+CHUNKS_PER_WORKER = 4
+
+
+def _resolve(method: str | Callable) -> Callable:
+    """Helper function. Looks a rule up by name in the package registry; callables are returned unchanged."""
+    if callable(method):
+        return method
+
+    package = importlib.import_module('source')
+    if method not in package.__all__:
+        raise ValueError(f"Unknown method '{method}'. Available methods: {', '.join(sorted(package.__all__))}.")
+    return getattr(package, method)
+
+
+def _run_chunk(method: str | Callable, jobs: Sequence[tuple], kwargs: dict) -> list:
+    """Helper function. Runs one chunk of jobs on a worker.
+
+        SymPy expressions arrive as expressions (they pickle, lambdified functions do not) and are compiled by the
+        rule through the worker's own lambdify cache, so every distinct expression is compiled once per worker.
+    """
+    fun = _resolve(method)
+    return [fun(*job, **kwargs) for job in jobs]
+
+
+def _make_executor(executor: str | Executor, max_workers: int | None) -> tuple[Executor, bool]:
+    """Helper function. Returns (executor, owned); owned executors are shut down by integrate_many."""
+    if isinstance(executor, Executor):
+        return executor, False
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers), True
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers), True
+    raise ValueError("'executor' must be 'process', 'thread' or a concurrent.futures.Executor.")
+
+
+@instrumented
+def integrate_many(jobs: Iterable[tuple], method: str | Callable = 'adaptive_simpson',
+                   executor: str | Executor = 'process', max_workers: int | None = None,
+                   chunk_size: int | None = None, ordered: bool = True,
+                   **kwargs: Any) -> list | Iterator[tuple[int, Any]]:
+    """Integrates many independent jobs in parallel over a concurrent.futures pool.
+
+        Each job is a tuple of positional arguments for the rule, e.g. (f, a, b, tol) for 'adaptive_simpson' or
+        (f, a, b, n) for 'romberg'. Jobs are grouped into chunks so each task amortizes its inter-process
+        communication over several integrals. For a process pool, integrands must be picklable: SymPy
+        expressions or module-level functions, not lambdas.
+
+        Parameters:
+            jobs (Iterable[tuple]): Positional arguments of each integration
+            method (str | Callable = 'adaptive_simpson'): Name of a rule exported by the package (e.g. 'romberg',
+                'double_gauss_legendre'), or a callable with the same calling convention
+            executor (str | Executor = 'process'): 'process', 'thread', or an existing Executor, which is left
+                running
+            max_workers (int | None = None): Number of workers of a pool created here, None for the pool's default.
+                With an existing Executor, its number of workers for sizing the chunks (None assumes one per CPU).
+            chunk_size (int | None = None): Jobs per task. None splits the jobs into about CHUNKS_PER_WORKER chunks
+                per worker.
+            ordered (bool = True): Return a list of results in input order. If False, return an iterator of
+                (job index, result) pairs in completion order.
+            **kwargs: Keyword arguments passed to the rule for every job (e.g. full_output=True)
+
+        Returns:
+            results (list | Iterator[tuple[int, Any]]): The results of the rule for every job
+    """
+    jobs = [tuple(job) for job in jobs]
+
+    if chunk_size is None:
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, -(-len(jobs) // (workers * CHUNKS_PER_WORKER)))
+    elif chunk_size < 1 or not isinstance(chunk_size, int):
+        raise ValueError("'chunk_size' must be a positive integer.")
+
+    # Fail on unknown names before any work is submitted
+    if not callable(method):
+        _resolve(method)
+
+    pool, owned = _make_executor(executor, max_workers)
+    starts = range(0, len(jobs), chunk_size)
+    try:
+        futures = {pool.submit(_run_chunk, method, jobs[start:start + chunk_size], kwargs): start
+                   for start in starts}
+    except BaseException:
+        if owned:
+            pool.shutdown(cancel_futures=True)
+        raise
+
+    if ordered:
+        try:
+            results = []
+            for future in futures:  # dicts keep submission order
+                results.extend(future.result())
+            return results
+        finally:
+            if owned:
+                pool.shutdown(cancel_futures=True)
+
+    def completed() -> Iterator[tuple[int, Any]]:
+        try:
+            for future in as_completed(futures):
+                start = futures[future]
+                for offset, result in enumerate(future.result()):
+                    yield start + offset, result
+        finally:
+            if owned:
+                shutdown()
+
+    iterator = completed()
+    if owned:
+        # The generator's cleanup never runs if it is dropped before being started, so tie the pool to its lifetime
+        shutdown = weakref.finalize(iterator, pool.shutdown, wait=False, cancel_futures=True)
+
+    return iterator
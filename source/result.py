@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import operator
+
+import numpy as np
+
+
+def _delegate(op, reflected: bool = False):
+    """Helper function. Builds a binary operator applying 'op' to the value of a result (and of a result operand)."""
+    def method(self, other):
+        if isinstance(other, IntegrationResult):
+            other = other.value
+        return op(other, self.value) if reflected else op(self.value, other)
+    return method
+
+
+def _scalar_only(op):
+    """Helper function. Builds == or != on the value of a result, which must be a scalar so the answer is a bool."""
+    compare = _delegate(op)
+
+    def method(self, other):
+        self._check_scalar(op.__name__)
+        if isinstance(other, IntegrationResult):
+            other._check_scalar(op.__name__)
+        return compare(self, other)
+    return method
+
+
+class IntegrationResult:
+    """Outcome of an integration, returned by every rule when called with full_output=True.
+
+        Behaves like its value in arithmetic, comparisons, float() and NumPy, so it can be used wherever the bare
+        value was. Only results with a scalar value can be hashed or compared with == and !=; for a vector-valued
+        integral, compare 'value' with e.g. np.allclose.
+
+        Attributes:
+            value (float | np.ndarray): Approximation of the integral
+            error (float | None): Estimate of the absolute error of 'value', None if the rule has none. For a
+                vector-valued integral, the largest error estimate of its components.
+            n_evals (int): Number of evaluations of the integrand
+            n_intervals (int): Number of subintervals the rule was applied on
+            converged (bool | None): False if a limit stopped an adaptive refinement before the tolerance was met.
+                None for rules without a tolerance.
+            method (str | None): Name of the rule
+    """
+    __slots__ = ('value', 'error', 'n_evals', 'n_intervals', 'converged', 'method')
+
+    def __init__(self, value, error: float | None = None, n_evals: int = 0, n_intervals: int = 1,
+                 converged: bool | None = None, method: str | None = None):
+        self.value = value
+        self.error = error
+        self.n_evals = n_evals
+        self.n_intervals = n_intervals
+        self.converged = converged
+        self.method = method
+
+    @property
+    def estimate(self):
+        """Alias of 'value', the name used by the adaptive engine."""
+        return self.value
+
+    def __float__(self):
+        return float(self.value)
+
+    def __complex__(self):
+        return complex(self.value)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.value, dtype=dtype)
+
+    def __format__(self, format_spec: str):
+        return format(self.value, format_spec)
+
+    def __round__(self, ndigits: int | None = None):
+        return round(self.value, ndigits)
+
+    def _check_scalar(self, operation: str):
+        """Helper function. Raises TypeError if the value is not a scalar."""
+        if np.ndim(self.value) != 0:
+            raise TypeError(f"'{operation}' needs a scalar integral, this result holds an array of shape "
+                            f"{np.shape(self.value)}. Use its 'value' instead.")
+
+    def __hash__(self):
+        self._check_scalar('hash')
+        return hash(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __neg__(self):
+        return -self.value
+
+    def __pos__(self):
+        return +self.value
+
+    def __abs__(self):
+        return abs(self.value)
+
+    __add__, __radd__ = _delegate(operator.add), _delegate(operator.add, True)
+    __sub__, __rsub__ = _delegate(operator.sub), _delegate(operator.sub, True)
+    __mul__, __rmul__ = _delegate(operator.mul), _delegate(operator.mul, True)
+    __truediv__, __rtruediv__ = _delegate(operator.truediv), _delegate(operator.truediv, True)
+    __pow__, __rpow__ = _delegate(operator.pow), _delegate(operator.pow, True)
+    __eq__, __ne__ = _scalar_only(operator.eq), _scalar_only(operator.ne)
+    __lt__, __le__ = _delegate(operator.lt), _delegate(operator.le)
+    __gt__, __ge__ = _delegate(operator.gt), _delegate(operator.ge)
+
+    def __repr__(self):
+        return (f"IntegrationResult(value={self.value!r}, error={self.error!r}, n_evals={self.n_evals}, "
+                f"n_intervals={self.n_intervals}, converged={self.converged}, method={self.method!r})")
@@ -1,23 +1,54 @@
-from typing import Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Iterator
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
 
-from composite_trapezoid import composite_trapezoid
+from source.lambdify_cache import as_callable
+from source.vectorize import probe, error_norm
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
+
+
+def _trapezoid_levels(f: Callable[[float], float], a: float, b: float) -> Iterator[float]:
+    """Helper function. Yields the composite trapezoid estimates on 1, 2, 4, ... subintervals of [a, b].
+    Each level halves the step size and only evaluates f at the new midpoints, reusing the previous level's sum.
+    """
+    values, vectorized = probe(f, np.array([a, b]))
+    h = b - a
+    T = (h / 2) * (values[0] + values[1])
+    yield T
 
+    m = 1  # number of subintervals of the current level
+    while True:
+        h /= 2
+        new_values, new_vectorized = probe(f, a + h * (2 * np.arange(m) + 1), vectorized=vectorized)
+        if vectorized is None:
+            vectorized = new_vectorized
+        T = T / 2 + h * np.sum(new_values, axis=0)
+        m *= 2
+        yield T
 
-def romberg(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, n: int) -> float:
-    """Romberg's integral approximation. Requires composite_trapezoid function.
+
+@instrumented
+def romberg(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, n: int,
+            full_output: bool = False) -> np.ndarray | IntegrationResult:
+    """Romberg's integral approximation. The trapezoid estimates are built incrementally, so every function value
+    is computed once (2^(n-1) + 1 evaluations in total).
 
         Parameters:
             f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
             n (int): The number of iterations
+            full_output (bool = False): Return an IntegrationResult with R_n,n as value, |R_n,n - R_n-1,n-1| as
+                error estimate and the evaluation count, instead of the table
 
         Returns:
-            R (float): Floating point approximation of the integral, R_n,n, at O(h^2n)
+            rarr (np.ndarray | IntegrationResult): The Romberg table, whose entry R_n,n is the approximation of the
+                integral at O(h^2n)
 
         Author:
             Ryan Bresnahan
@@ -34,17 +65,84 @@ def romberg(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | f
         raise InvalidIntervalException("The upper limit 'a' must be greater than the lower limit 'b'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
-    rarr = np.zeros((n, n))  # Initialize array to store Romberg approx
+    levels = _trapezoid_levels(f, a, b)
+    T = next(levels)
 
-    for i in range(n):  # Obtain first col estimates
-        m = 2 ** i + 1
-        rarr[i, 0] = composite_trapezoid(f, a, b, m)
+    rarr = np.zeros((n, n) + np.shape(T))  # Initialize array to store Romberg approx (one per component)
+    rarr[0, 0] = T
+    for i in range(1, n):  # Obtain first col estimates
+        rarr[i, 0] = next(levels)
 
     for j in range(1, n):  # Extrapolation across matrix
         for k in range(j, n):
             rarr[k, j] = rarr[k, j - 1] + (rarr[k, j - 1] - rarr[k - 1, j - 1]) / (4 ** j - 1)
 
+    if full_output:
+        error = error_norm(rarr[-1, -1] - rarr[-2, -2]) if n > 1 else None
+        return IntegrationResult(rarr[-1, -1], error, 2 ** (n - 1) + 1, 2 ** (n - 1), method='romberg')
+
     return rarr
+
+
+@instrumented
+def romberg_incremental(f: sympy.Expr | Callable[[float], float], a: int | float, b: int | float, tol: float,
+                        max_levels: int = 20, min_levels: int = 3,
+                        full_output: bool = False) -> tuple[float, float] | IntegrationResult:
+    """Romberg's integral approximation, refined level by level until the diagonal converges.
+
+        Each level adds the midpoints of the previous trapezoid grid (so level k costs 2^(k-1) new evaluations)
+        and one row of the Richardson table, of which only the previous row is kept. The refinement stops as soon
+        as two successive diagonal entries R_k,k differ by at most 'tol'.
+
+        Parameters:
+            f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
+            a (int | float): The lower limit of integration
+            b (int | float): The upper limit of integration
+            tol (int | float): The desired tolerance of the approximation
+            max_levels (int = 20): Maximum number of rows of the Romberg table, i.e. at most 2^(max_levels - 1) + 1
+                evaluations of f
+            min_levels (int = 3): Number of rows computed before convergence is checked, which guards against
+                integrands that happen to vanish on the first few grids
+            full_output (bool = False): Return an IntegrationResult (value, error estimate, evaluation count,
+                convergence flag) instead of a tuple
+
+        Returns:
+            R, error (tuple[float, float] | IntegrationResult): Last diagonal entry and its difference to the
+                previous one
+    """
+
+    class InvalidIntervalException(Exception):
+        """Raised when the upper limit is less than the lower limit."""
+        pass
+
+    if max_levels < 2 or not isinstance(max_levels, int):
+        raise ValueError("'max_levels' must be an integer greater than 1.")
+
+    if a > b:
+        raise InvalidIntervalException("The upper limit 'b' must be greater than the lower limit 'a'.")
+
+    # Ensure the expression is evaluated as lambda
+    f = as_callable(f)
+
+    levels = _trapezoid_levels(f, a, b)
+    row = [next(levels)]
+    error = float('inf')
+
+    for k in range(1, max_levels):
+        new_row = [next(levels)]
+        for j in range(1, k + 1):  # Extrapolation along the new row
+            new_row.append(new_row[j - 1] + (new_row[j - 1] - row[j - 1]) / (4 ** j - 1))
+
+        error = error_norm(new_row[k] - row[k - 1])
+        row = new_row
+
+        if k + 1 >= min_levels and error <= tol:
+            break
+
+    if full_output:
+        m = 2 ** (len(row) - 1)  # subintervals of the finest trapezoid grid
+        return IntegrationResult(row[-1], error, m + 1, m, error <= tol, 'romberg_incremental')
+
+    return row[-1], error
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+import os
+
+import numpy as np
+
+from source.instrumentation import instrumented
+
+# Number of samples read per chunk when integrating an array or memmap
+CHUNK_SIZE = 1 << 20
+
+
+def _chunks(y, x, chunk_size: int) -> Iterator[tuple[np.ndarray | None, np.ndarray]]:
+    """Helper function. Yields (x_chunk, y_chunk) float arrays; x_chunk is None for uniformly spaced samples.
+
+        'y' is either an array-like (ndarray, np.memmap, ...), read chunk_size samples at a time, or an iterable of
+        chunks. Chunks of an iterable are y arrays, or (x, y) pairs for non-uniform spacing.
+    """
+    if chunk_size < 1 or not isinstance(chunk_size, int):
+        raise ValueError("'chunk_size' must be a positive integer.")
+
+    if hasattr(y, 'shape') and hasattr(y, '__getitem__'):
+        if np.ndim(y) != 1:
+            raise ValueError("'y' must be one-dimensional.")
+        if x is not None and len(x) != len(y):
+            raise ValueError("'x' and 'y' must have the same length.")
+
+        for start in range(0, len(y), chunk_size):
+            stop = start + chunk_size
+            xchunk = None if x is None else np.asarray(x[start:stop], dtype=float)
+            yield xchunk, np.asarray(y[start:stop], dtype=float)
+        return
+
+    if x is not None:
+        raise ValueError("For an iterable of chunks, pass non-uniform abscissae as (x, y) chunk pairs instead of 'x'.")
+
+    for chunk in y:
+        if isinstance(chunk, tuple):
+            xchunk, ychunk = (np.asarray(part, dtype=float).ravel() for part in chunk)
+            if len(xchunk) != len(ychunk):
+                raise ValueError("Every (x, y) chunk must have matching lengths.")
+            yield xchunk, ychunk
+        else:
+            yield None, np.asarray(chunk, dtype=float).ravel()
+
+
+def _with_carry(chunks: Iterable, dx: float) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Helper function. Yields (x, y) arrays where each chunk is prefixed with its predecessor's last sample, so
+    consecutive buffers overlap by exactly one sample. Uniform chunks get x built from 'dx'.
+    """
+    carry_x = carry_y = None
+    offset = 0.0
+    for xchunk, ychunk in chunks:
+        if len(ychunk) == 0:
+            continue
+        if xchunk is None:
+            xchunk = offset + dx * np.arange(len(ychunk))
+        if carry_y is not None:
+            xchunk = np.concatenate(([carry_x], xchunk))
+            ychunk = np.concatenate(([carry_y], ychunk))
+        carry_x, carry_y = xchunk[-1], ychunk[-1]
+        offset = carry_x + dx
+        yield xchunk, ychunk
+
+
+@instrumented
+def sampled_trapezoid(y, x=None, dx: float = 1.0, chunk_size: int = CHUNK_SIZE) -> float:
+    """Composite Trapezoid integral of sampled data, processed in bounded-memory chunks.
+
+        Parameters:
+            y (array_like | np.memmap | Iterable): The samples, or an iterable of chunks of samples (or of (x, y)
+                chunk pairs for non-uniform spacing)
+            x (array_like | None = None): Sample locations, same length as 'y'. None for uniform spacing 'dx'.
+            dx (float = 1.0): The spacing of uniformly spaced samples
+            chunk_size (int = CHUNK_SIZE): Number of samples read at a time from an array or memmap
+
+        Returns:
+            I (float): Floating point approximation of the integral
+    """
+    I = 0.0
+    for xbuf, ybuf in _with_carry(_chunks(y, x, chunk_size), dx):
+        I += np.sum(np.diff(xbuf) * (ybuf[1:] + ybuf[:-1])) / 2
+
+    return I
+
+
+@instrumented
+def sampled_simpson(y, x=None, dx: float = 1.0, chunk_size: int = CHUNK_SIZE) -> float:
+    """Composite Simpson's integral of sampled data, processed in bounded-memory chunks.
+
+        Intervals are taken in consecutive pairs across chunk boundaries, so the total number of intervals
+        (samples - 1) must be even. Non-uniform spacing uses the three-point Simpson formula for unequal steps.
+
+        Parameters: see sampled_trapezoid
+
+        Returns:
+            I (float): Floating point approximation of the integral
+    """
+    I = 0.0
+    carry_x = np.zeros(0)
+    carry_y = np.zeros(0)
+
+    for xbuf, ybuf in _with_carry(_chunks(y, x, chunk_size), dx):
+        # Prepend the sample left over from an unfinished pair (the shared boundary sample is already in xbuf)
+        xbuf = np.concatenate((carry_x, xbuf))
+        ybuf = np.concatenate((carry_y, ybuf))
+
+        pairs = (len(ybuf) - 1) // 2
+        end = 2 * pairs
+        h0 = xbuf[1:end:2] - xbuf[0:end - 1:2]
+        h1 = xbuf[2:end + 1:2] - xbuf[1:end:2]
+        y0, y1, y2 = ybuf[0:end - 1:2], ybuf[1:end:2], ybuf[2:end + 1:2]
+
+        hsum = h0 + h1
+        I += np.sum(hsum / 6 * ((2 - h1 / h0) * y0 + hsum ** 2 / (h0 * h1) * y1 + (2 - h0 / h1) * y2))
+
+        # Keep the unpaired tail minus its last sample, which the next buffer starts with anyway
+        carry_x, carry_y = xbuf[end:-1], ybuf[end:-1]
+
+    if len(carry_y):
+        raise ValueError("The number of intervals (samples - 1) must be even.")
+
+    return I
+
+
+@instrumented
+def cumulative_trapezoid(y, x=None, dx: float = 1.0, out=None, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """Cumulative Trapezoid integral of sampled data, written chunk by chunk.
+
+        Parameters:
+            y, x, dx, chunk_size: see sampled_trapezoid
+            out (np.ndarray | np.memmap | str | os.PathLike | None = None): Destination with one entry per sample,
+                starting at 0. A path creates a float64 memmap there (requires 'y' to have a length). None
+                allocates an in-memory array.
+
+        Returns:
+            out (np.ndarray | np.memmap): Integral from the first sample up to each sample
+    """
+    if isinstance(out, (str, os.PathLike)):
+        out = np.memmap(out, dtype=np.float64, mode='w+', shape=(len(y),))
+
+    parts = [] if out is None else None
+    running = 0.0
+    position = 0
+
+    for xbuf, ybuf in _with_carry(_chunks(y, x, chunk_size), dx):
+        first = position == 0
+        increments = np.diff(xbuf) * (ybuf[1:] + ybuf[:-1]) / 2
+        values = running + np.cumsum(increments)
+        if first:
+            values = np.concatenate(([0.0], values))
+        running = values[-1] if len(values) else running
+
+        if out is None:
+            parts.append(values)
+        else:
+            out[position:position + len(values)] = values
+        position += len(values)
+
+    if out is None:
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    if position != len(out):
+        raise ValueError(f"'out' has {len(out)} entries for {position} samples.")
+    if isinstance(out, np.memmap):
+        out.flush()
+
+    return out
@@ -1,20 +1,30 @@
-from typing import Union, Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
+
+from source.lambdify_cache import as_callable
+from source.vectorize import evaluate
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
 
-def simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float]) -> float:
+@instrumented
+def simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: Union[int, float],
+            full_output: bool = False) -> float | IntegrationResult:
     """Simpson's integral approximation.
 
         Parameters:
             f (sympy.Expr): A SymPy expression, f(x)
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
 
         Returns:
-            I (float): Floating point approximation of the integral
+            I (float | IntegrationResult): Floating point approximation of the integral
 
         Author:
             Ryan Bresnahan
@@ -28,8 +38,7 @@ def simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: U
         raise InvalidIntervalException("The upper limit 'a' must be greater than the lower limit 'b'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
     # Get step size
     h = (b - a) / 2
@@ -37,9 +46,9 @@ def simpson(f: sympy.Expr | Callable[[float], float], a: Union[int, float], b: U
 
     # Define array of x values and compute yi at xi
     xarr = [a, c, b]
-    yarr = f(xarr)
+    yarr = evaluate(f, xarr)
 
     # Compute approximation I with Simpson's formula
     I = (h / 3) * (yarr[0] + 4 * yarr[1] + yarr[2])
 
-    return I
+    return IntegrationResult(I, n_evals=3, method='simpson') if full_output else I
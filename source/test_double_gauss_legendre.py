@@ -56,6 +56,26 @@ class TestDoubleGaussLegendre(unittest.TestCase):
         result = double_gauss_legendre(f, float(a), float(b), float(c), float(d), n, m)
         self.assertAlmostEqual(result, expected_result, places=6)
 
+    def test_single_grid_call(self):
+        # The whole (n, m) grid, including the mapped nodes for d(y), is evaluated with one call to f
+        shapes = []
+
+        def f(x, y):
+            shapes.append(np.shape(x))
+            return x * y
+
+        d = lambda y: y
+        result = double_gauss_legendre(f, 0, 1, 0, d, 6, 4)
+        self.assertAlmostEqual(result, 1 / 8, places=10)
+        self.assertEqual(shapes, [(6, 4)])
+
+    def test_scalar_only_integrand(self):
+        # Integrands that only take scalars fall back to point-by-point evaluation
+        import math
+        f = lambda x, y: math.exp(x) * y
+        result = double_gauss_legendre(f, 0, 1, 0, 1, 5, 5)
+        self.assertAlmostEqual(result, (np.e - 1) / 2, places=6)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+
+class _Substituted:
+    """Integrand f(x(t)) * x'(t) of an integral over a (semi-)infinite interval after the substitution x = x(t).
+
+        x = c + t / (1 - |t|) maps t in [0, 1] onto [c, inf) and t in [-1, 0] onto (-inf, c], and x = t / (1 - t^2)
+        maps t in [-1, 1] onto the whole real line. The ends t = -1 and t = 1 map to infinity, where the integrand
+        is taken to vanish, so rules that evaluate the endpoints (Simpson's, trapezoid) can be used as well.
+    """
+    __slots__ = ('f', 'shift', 'both', 'extra')
+
+    def __init__(self, f: Callable, shift: float, both: bool):
+        self.f = f
+        self.shift = shift
+        self.both = both
+        # Shape of f's values, () for a scalar integrand. Learned from the first call.
+        self.extra = None
+
+    def _substitute(self, t):
+        if self.both:
+            d = 1 - t * t
+            return t / d, (1 + t * t) / (d * d)
+        d = 1 - np.abs(t)
+        return self.shift + t / d, 1 / (d * d)
+
+    def _zero(self):
+        """Helper function. The value at infinity, shaped like the values of f."""
+        if self.extra is None:
+            # x(0) is the shift for either substitution
+            self.extra = np.shape(self.f(self.shift))
+        return np.zeros(self.extra) if self.extra else 0.0
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+
+        if t.ndim == 0:
+            if abs(t) >= 1:
+                return self._zero()
+            x, jacobian = self._substitute(float(t))
+            value = self.f(x)
+            self.extra = np.shape(value)
+            return value * jacobian
+
+        inner = np.abs(t) < 1
+        if not inner.any():
+            return np.zeros(t.shape + np.shape(self._zero()))
+
+        x, jacobian = self._substitute(t[inner])
+        inner_values = np.asarray(self.f(x))
+        self.extra = inner_values.shape[x.ndim:]
+
+        values = np.zeros(t.shape + self.extra)
+        values[inner] = inner_values * jacobian.reshape(jacobian.shape + (1,) * len(self.extra))
+
+        return values
+
+def transform_interval(f: Callable, a: float, b: float) -> tuple[Callable, float, float]:
+    """Rewrites an integral over a (semi-)infinite interval as one over a finite interval.
+
+        Finite limits are returned unchanged, so every rule can call this unconditionally. Otherwise the
+        integral of f over [a, inf), (-inf, b] or (-inf, inf) becomes the integral of the substituted integrand
+        over [0, 1], [-1, 0] or [-1, 1]. The substituted integrand is smooth wherever f decays at least like 1/x^2.
+
+        Parameters:
+            f (Callable[[float], float]): The integrand
+            a (float): The lower limit of integration, may be -np.inf
+            b (float): The upper limit of integration, may be np.inf
+
+        Returns:
+            f, a, b (tuple[Callable, float, float]): The integrand and limits of the equivalent finite integral
+    """
+    lower, upper = np.isinf(a), np.isinf(b)
+
+    if not (lower or upper):
+        return f, a, b
+
+    if a == b:
+        # Empty interval at infinity
+        return (lambda t: np.zeros(np.shape(t))), 0.0, 0.0
+
+    if lower and upper:
+        return _Substituted(f, 0.0, True), -1.0, 1.0
+    if upper:
+        return _Substituted(f, a, False), 0.0, 1.0
+    return _Substituted(f, b, False), -1.0, 0.0
@@ -1,20 +1,30 @@
-from typing import Union, Callable
-from sympy import Expr
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable
 import numpy as np
-from sympy.utilities.lambdify import lambdify
-import sympy
+
+from source.lambdify_cache import as_callable
+from source.vectorize import evaluate
+from source.instrumentation import instrumented
+from source.result import IntegrationResult
+
+if TYPE_CHECKING:
+    import sympy
 
 
-def trapezoidal(f: Union[sympy.Expr, Callable[[float], float]], a: Union[int, float], b: Union[int, float]) -> float:
+@instrumented
+def trapezoidal(f: Union[sympy.Expr, Callable[[float], float]], a: Union[int, float], b: Union[int, float],
+                full_output: bool = False) -> float | IntegrationResult:
     """Trapezoidal integral approximation.
 
         Parameters:
             f (sympy.Expr | Callable[[float], float]): A SymPy expression or lambda expression
             a (int | float): The lower limit of integration
             b (int | float): The upper limit of integration
+            full_output (bool = False): Return an IntegrationResult (value, evaluation count) instead of a float
 
         Returns:
-            T (float): Floating point approximation of the integral
+            T (float | IntegrationResult): Floating point approximation of the integral
 
     """
 
@@ -26,17 +36,16 @@ def trapezoidal(f: Union[sympy.Expr, Callable[[float], float]], a: Union[int, fl
         raise InvalidIntervalException("The upper limit 'a' must be greater than the lower limit 'b'.")
 
     # Ensure the expression is evaluated as lambda
-    if isinstance(f, sympy.Expr):
-        f = lambdify(sympy.symbols('x'), f, modules=['numpy'])
+    f = as_callable(f)
 
     # Get step size
     h = (b - a)
 
     # Define array of x values and compute yi at xi
     xarr = [a, b]
-    yarr = f(xarr)
+    yarr = evaluate(f, xarr)
 
     # Compute approximation I with Trapezoidal approximation formula
     T = (h / 2) * (yarr[0] + yarr[1])
 
-    return T
+    return IntegrationResult(T, n_evals=2, method='trapezoidal') if full_output else T
@@ -0,0 +1,66 @@
+from typing import Callable
+
+import numpy as np
+
+
+def evaluate(f: Callable, *args, vectorized: bool | None = None) -> np.ndarray:
+    """Evaluate f at every point of the given abscissa arrays, in a single call when f supports it.
+
+        Integrands may be vector-valued: f returns an array of shape (k,) for a single point, or one of shape
+        (npoints, k) for an array of npoints abscissae, i.e. with the components on the last axis.
+
+        Parameters:
+            f (Callable): The integrand, taking one argument per abscissa array
+            *args (array_like): Abscissae, broadcast against each other
+            vectorized (bool | None = None): True calls f once with the full arrays, False calls f once per
+                point with scalars. None tries the array call and falls back to the scalar loop if f raises
+                a TypeError/ValueError or returns an array of the wrong shape.
+
+        Returns:
+            values (np.ndarray): f evaluated at every point, with the broadcast shape of the abscissae followed by
+                the shape of f's values
+    """
+    return probe(f, *args, vectorized=vectorized)[0]
+
+
+def probe(f: Callable, *args, vectorized: bool | None = None) -> tuple[np.ndarray, bool | None]:
+    """Like evaluate, but also reports whether the single array call worked.
+
+        Callers that evaluate the same f repeatedly pass the returned flag as 'vectorized' on later calls, so a
+        scalar-only f does not pay for a failed array call every time.
+
+        Returns:
+            values, vectorized (tuple[np.ndarray, bool | None]): The values of f and whether they came from one
+                call. None if that cannot be told from the call, i.e. a single point and a 0-d result.
+    """
+    args = np.broadcast_arrays(*[np.asarray(arg, dtype=float) for arg in args])
+    shape = args[0].shape
+
+    if vectorized is not False:
+        try:
+            values = np.asarray(f(*args))
+        except (TypeError, ValueError):
+            if vectorized:
+                raise
+        else:
+            if values.shape[:len(shape)] == shape:
+                return values, True
+            if values.ndim == 0:
+                # Constants come back as 0-d arrays. So does a scalar-only f given a single point, which makes a
+                # single point inconclusive about f.
+                return np.broadcast_to(values, shape), True if values.size < np.prod(shape) else None
+            if vectorized:
+                raise ValueError(f"f returned shape {values.shape} for abscissae of shape {shape}.")
+
+    # Scalar fallback: one call per point
+    flat = [arg.ravel() for arg in args]
+    values = np.array([f(*(arg[i] for arg in flat)) for i in range(flat[0].size)])
+
+    return values.reshape(shape + values.shape[1:]), False
+
+
+def error_norm(error) -> float:
+    """Size of an error estimate: its absolute value, or the largest absolute component for vector-valued
+    integrands. Adaptive rules compare it with the tolerance and rank subintervals by it.
+    """
+    return float(np.max(np.abs(error)))
@@ -0,0 +1,77 @@
+import unittest
+from math import e, exp, pi
+
+import numpy as np
+import sympy
+
+from source import adaptive_cubature, double_gauss_legendre, instrumentation
+
+
+def peak(x, y):
+    return 1 / ((x - 0.3) ** 2 + (y - 0.6) ** 2 + 1e-5)
+
+
+class TestAdaptiveCubature(unittest.TestCase):
+
+    def test_smooth_needs_one_cell(self):
+        result = adaptive_cubature(lambda x, y: np.exp(x + y), 0, 1, 0, 1, 1e-10, full_output=True)
+        self.assertAlmostEqual(result.value, (e - 1) ** 2, places=13)
+        self.assertEqual(result.n_evals, 225)
+        self.assertTrue(result.converged)
+
+    def test_peak(self):
+        reference = adaptive_cubature(peak, 0, 1, 0, 1, 1e-11)
+        result = adaptive_cubature(peak, 0, 1, 0, 1, 1e-5, full_output=True)
+        self.assertLess(abs(result.value - reference), 1e-5)
+        self.assertLessEqual(result.error, 1e-5)
+
+        # Fixed orders with as many evaluations fall well short
+        n = int(np.sqrt(result.n_evals))
+        self.assertGreater(abs(double_gauss_legendre(peak, 0, 1, 0, 1, n, n) - reference), 1e-2)
+
+    def test_variable_region(self):
+        # Area of the quarter disk
+        quarter = adaptive_cubature(lambda x, y: np.ones_like(x), 0, 1, 0, lambda y: np.sqrt(1 - y ** 2), 1e-10)
+        self.assertAlmostEqual(quarter, pi / 4, places=9)
+
+        x, y = sympy.symbols('x y')
+        self.assertAlmostEqual(adaptive_cubature(x * y, 0, 1, 0, y, 1e-12), 1 / 8, places=12)
+
+    def test_one_call_per_sweep(self):
+        calls = []
+
+        def f(x, y):
+            calls.append(len(x))
+            return np.sqrt(x * y)
+
+        result = adaptive_cubature(f, 0, 1, 0, 1, 1e-8, full_output=True)
+        self.assertAlmostEqual(result.value, 4 / 9, places=8)
+        self.assertEqual(sum(calls), result.n_evals)
+        self.assertLess(len(calls), result.n_evals // 450)
+        self.assertTrue(all(n % 450 == 0 for n in calls[1:]))
+
+    def test_limits_are_not_counted(self):
+        y = sympy.Symbol('y')
+        for d in (lambda y: y, y):
+            with instrumentation.collect() as stats:
+                result = adaptive_cubature(lambda x, y: x * y, 0, 1, 0, d, 1e-8, full_output=True)
+
+            self.assertEqual(stats.n_evals, result.n_evals)
+
+    def test_vector_valued_and_scalar_integrand(self):
+        np.testing.assert_allclose(adaptive_cubature(lambda x, y: np.array([x, x * y]), 0, 1, 0, lambda y: y, 1e-10),
+                                   [1 / 6, 1 / 8])
+
+    def test_budget(self):
+        result = adaptive_cubature(peak, 0, 1, 0, 1, 1e-12, max_evals=5000, full_output=True)
+        self.assertFalse(result.converged)
+        self.assertLessEqual(result.n_evals, 5000)
+
+    def test_invalid_interval(self):
+        with self.assertRaisesRegex(Exception, 'upper limit') as context:
+            adaptive_cubature(peak, 1, 0, 0, 1, 1e-6)
+        self.assertEqual(type(context.exception).__name__, 'InvalidIntervalException')
+
+
+if __name__ == '__main__':
+    unittest.main()
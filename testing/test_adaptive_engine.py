@@ -0,0 +1,112 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from source.adaptive_engine import AdaptiveResult, LocalRule
+from source.adaptive_midpoint import adaptive_midpoint
+from source.adaptive_simpson import adaptive_simpson
+from source.adaptive_trapezoid import adaptive_trapezoidal
+from source.global_adaptive import global_adaptive
+
+
+class TestAdaptiveEngine(unittest.TestCase):
+
+    def test_matches_known_integral(self):
+        f = lambda x: np.exp(x) * np.sin(3 * np.asarray(x))
+        expected = (np.exp(2) * (np.sin(6) - 3 * np.cos(6)) + 3) / 10
+        for fun in (adaptive_simpson, adaptive_midpoint, adaptive_trapezoidal):
+            self.assertAlmostEqual(fun(f, 0, 2, 1e-8), expected, delta=1e-7)
+
+    def test_full_output(self):
+        result = adaptive_simpson(lambda x: np.cos(x), 0, 1, 1e-10, full_output=True)
+        self.assertIsInstance(result, AdaptiveResult)
+        self.assertTrue(result.converged)
+        self.assertAlmostEqual(float(result), np.sin(1), places=10)
+        self.assertLess(result.error, 1e-10)
+        self.assertGreater(result.n_evals, 0)
+        self.assertGreaterEqual(result.n_intervals, 1)
+
+    def test_function_values_are_reused(self):
+        # Every abscissa is evaluated exactly once, and n_evals counts all of them
+        seen = []
+
+        def f(x):
+            seen.extend(np.atleast_1d(x).tolist())
+            return np.exp(x)
+
+        for fun in (adaptive_simpson, adaptive_trapezoidal, adaptive_midpoint):
+            seen.clear()
+            result = fun(f, 0, 1, 1e-9, full_output=True)
+            self.assertEqual(len(seen), len(set(seen)))
+            self.assertEqual(result.n_evals, len(seen))
+
+    def test_global_mode_uses_fewer_evaluations(self):
+        f = lambda x: np.sqrt(x)
+        local = adaptive_simpson(f, 0, 1, 1e-8, full_output=True)
+        best_first = adaptive_simpson(f, 0, 1, 1e-8, mode='global', full_output=True)
+        self.assertTrue(best_first.converged)
+        self.assertAlmostEqual(best_first.estimate, 2 / 3, delta=1e-8)
+        self.assertLess(best_first.n_evals, local.n_evals)
+
+    def test_global_adaptive_rules(self):
+        f = lambda x: 1 / (1 + 25 * x ** 2)
+        expected = 2 * np.arctan(5) / 5
+        for rule in ('simpson', 'midpoint', 'trapezoidal', 'gauss_legendre'):
+            result = global_adaptive(f, -1, 1, 1e-9, rule=rule, full_output=True)
+            self.assertTrue(result.converged, rule)
+            self.assertAlmostEqual(result.estimate, expected, delta=1e-8)
+
+    def test_sweep_mode_batches_evaluations(self):
+        # Same partition as the depth-first mode, but one call of f per level of refinement
+        calls = []
+
+        def f(x):
+            calls.append(np.size(x))
+            return np.exp(x) * np.sin(3 * np.asarray(x))
+
+        local = adaptive_simpson(f, 0, 2, 1e-10, full_output=True)
+        calls.clear()
+        sweep = adaptive_simpson(f, 0, 2, 1e-10, mode='sweep', full_output=True)
+        self.assertAlmostEqual(sweep.estimate, local.estimate, places=12)
+        self.assertEqual((sweep.n_evals, sweep.n_intervals), (local.n_evals, local.n_intervals))
+        self.assertEqual(sum(calls), sweep.n_evals)
+        self.assertLess(len(calls), 20)
+
+    def test_sweep_mode_executor(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for f in (np.sqrt, lambda x: float(np.sqrt(x))):
+                result = adaptive_trapezoidal(f, 0, 1, 1e-8, mode='sweep', executor=executor, full_output=True)
+                self.assertTrue(result.converged)
+                self.assertAlmostEqual(result.estimate, 2 / 3, delta=1e-8)
+
+    def test_discontinuity_hits_depth_limit(self):
+        # The jump can never be resolved, so refinement stops at max_depth instead of recursing forever
+        f = lambda x: np.sign(np.asarray(x) - 1 / 3)
+        result = adaptive_simpson(f, 0, 1, 1e-14, max_depth=30, full_output=True)
+        self.assertFalse(result.converged)
+        self.assertAlmostEqual(result.estimate, 1 / 3, places=6)
+
+    def test_incomplete_rule_fails_at_construction(self):
+        class PointsOnly(LocalRule):
+            def points(self, a, b, state):
+                return np.array([(a + b) / 2])
+
+        with self.assertRaises(TypeError):
+            PointsOnly()
+
+    def test_eval_budget(self):
+        f = lambda x: np.sin(1 / (np.asarray(x) + 1e-3))
+        result = adaptive_midpoint(f, 0, 1, 1e-12, max_evals=500, full_output=True)
+        self.assertFalse(result.converged)
+        self.assertLess(result.n_evals, 500 + 2 * 50)
+
+    def test_min_width(self):
+        f = lambda x: np.abs(np.asarray(x) - 0.5) ** 0.5
+        result = adaptive_trapezoidal(f, 0, 1, 1e-14, min_width=1e-3, full_output=True)
+        self.assertFalse(result.converged)
+        self.assertLessEqual(result.n_intervals, 2048)
+
+
+if __name__ == '__main__':
+    unittest.main()
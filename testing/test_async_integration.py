@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from source.async_integration import gauss_legendre_async, composite_simpson_async, adaptive_async
+from source.adaptive_simpson import adaptive_simpson
+from source.composite_simpson import composite_simpson
+from source.gauss_legendre import gauss_legendre
+
+
+class MockAsyncIntegrand:
+    """Stands in for a remote model: every call sleeps briefly and the peak number of calls in flight is tracked."""
+
+    def __init__(self, fun=np.exp):
+        self.fun = fun
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, x):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return self.fun(x)
+
+
+class TestAsyncIntegration(unittest.TestCase):
+
+    def test_fixed_rules(self):
+        f = MockAsyncIntegrand()
+        self.assertAlmostEqual(asyncio.run(gauss_legendre_async(f, 0, 1, 8)), gauss_legendre(np.exp, 0, 1, 8))
+        self.assertAlmostEqual(asyncio.run(composite_simpson_async(f, 0, 1, 10)), composite_simpson(np.exp, 0, 1, 10))
+
+    def test_concurrency_limit(self):
+        f = MockAsyncIntegrand()
+        asyncio.run(composite_simpson_async(f, 0, 1, 100, max_concurrency=7))
+        self.assertEqual(f.calls, 101)
+        self.assertEqual(f.peak, 7)
+
+    def test_batching(self):
+        f = MockAsyncIntegrand()
+        result = asyncio.run(composite_simpson_async(f, 0, 1, 100, batch_size=30))
+        self.assertEqual(f.calls, 4)
+        self.assertAlmostEqual(result, composite_simpson(np.exp, 0, 1, 100))
+
+    def test_adaptive_matches_sync(self):
+        f = MockAsyncIntegrand(np.sqrt)
+        result = asyncio.run(adaptive_async(f, 0, 1, 1e-8, full_output=True))
+        expected = adaptive_simpson(np.sqrt, 0, 1, 1e-8, full_output=True)
+        self.assertAlmostEqual(result.estimate, expected.estimate, places=12)
+        self.assertEqual(result.n_evals, f.calls)
+
+    def test_infinite_limits(self):
+        f = MockAsyncIntegrand(lambda x: np.exp(-x ** 2))
+        self.assertAlmostEqual(asyncio.run(adaptive_async(f, -np.inf, np.inf, 1e-9)), np.sqrt(np.pi), places=7)
+        self.assertAlmostEqual(asyncio.run(adaptive_async(f, 0, np.inf, 1e-9, batch_size=64)), np.sqrt(np.pi) / 2,
+                               places=7)
+        self.assertAlmostEqual(asyncio.run(adaptive_async(f, -np.inf, 0, 1e-9, rule='gauss_kronrod')),
+                               np.sqrt(np.pi) / 2, places=7)
+
+    def test_gather_shares_semaphore(self):
+        f = MockAsyncIntegrand()
+
+        async def main():
+            semaphore = asyncio.Semaphore(5)
+            return await asyncio.gather(*(adaptive_async(f, 0, b, 1e-8, rule='gauss_kronrod',
+                                                         max_concurrency=semaphore) for b in (1, 2, 3)))
+
+        np.testing.assert_allclose(asyncio.run(main()), np.exp([1, 2, 3]) - 1, rtol=1e-10)
+        self.assertLessEqual(f.peak, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
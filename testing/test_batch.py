@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+import sympy
+
+from source import (batch_composite_midpoint, batch_composite_simpson, batch_composite_trapezoid,
+                    batch_gauss_legendre, batch_midpoint, batch_simpson, batch_trapezoidal, composite_midpoint,
+                    composite_simpson, composite_trapezoid, gauss_legendre, midpoint, simpson, trapezoidal)
+
+A = np.array([0.0, -1.0, 0.5, 2.0, -3.0, 1.0, 0.0])
+B = np.array([1.0, 1.0, 0.75, 5.0, -2.5, 1.0, 10.0])
+
+# (batch rule, scalar rule, extra arguments)
+RULES = (
+    (batch_midpoint, midpoint, ()),
+    (batch_trapezoidal, trapezoidal, ()),
+    (batch_simpson, simpson, ()),
+    (batch_composite_midpoint, composite_midpoint, (6,)),
+    (batch_composite_trapezoid, composite_trapezoid, (7,)),
+    (batch_composite_simpson, composite_simpson, (8,)),
+    (batch_gauss_legendre, gauss_legendre, (5,)),
+)
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_matches_scalar_rules(self):
+        f = lambda x: np.sin(x) * np.exp(-x / 4)
+        for batch_rule, rule, args in RULES:
+            expected = [rule(f, a, b, *args) for a, b in zip(A, B)]
+            # No chunking, chunks dividing the 7 intervals unevenly, one interval per chunk
+            for chunk_size in (None, 3, 1):
+                np.testing.assert_allclose(batch_rule(f, A, B, *args, chunk_size=chunk_size), expected,
+                                           rtol=1e-13, atol=1e-15, err_msg=f'{batch_rule.__name__} {chunk_size}')
+
+    def test_calls_per_chunk(self):
+        calls = []
+
+        def f(x):
+            calls.append(x.shape)
+            return x ** 2
+
+        result = batch_composite_simpson(f, A, B, 4, chunk_size=3, full_output=True)
+        self.assertEqual(calls, [(3, 5), (3, 5), (1, 5)])
+        self.assertEqual(result.n_evals, 35)
+        self.assertEqual(result.n_intervals, 7)
+
+    def test_broadcasting_and_sympy(self):
+        x = sympy.Symbol('x')
+        I = batch_gauss_legendre(x ** 3, 0, [[1, 2], [3, 4]], 2)
+        np.testing.assert_allclose(I, np.array([[1, 2], [3, 4]]) ** 4 / 4, rtol=1e-14)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            batch_simpson(np.exp, A, B, chunk_size=0)
+        with self.assertRaises(ValueError):
+            batch_composite_simpson(np.exp, A, B, 5)
+        with self.assertRaises(ValueError):
+            batch_composite_trapezoid(np.exp, A, B, 1)
+        with self.assertRaisesRegex(Exception, "upper limit"):
+            batch_midpoint(np.exp, [0, 1], [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
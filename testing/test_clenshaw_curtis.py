@@ -0,0 +1,119 @@
+import unittest
+from math import e, pi
+
+import numpy as np
+import sympy
+
+from source import clenshaw_curtis, clenshaw_curtis_incremental, fejer, fejer_incremental
+from source.cubature import _nested_clenshaw_curtis
+from source.node_cache import cache_info, get_nodes
+
+
+class TestClenshawCurtis(unittest.TestCase):
+
+    def test_exact_for_polynomials(self):
+        # n nodes integrate polynomials of degree n - 1 exactly
+        for n in (2, 3, 8, 33, 64):
+            nodes, weights = get_nodes('clenshaw_curtis', n)
+            self.assertTrue(np.all(np.diff(nodes) > 0))
+            self.assertTrue(np.all(weights > 0))
+            for k in range(n):
+                exact = (1 - (-1) ** (k + 1)) / (k + 1)
+                self.assertAlmostEqual(np.dot(weights, nodes ** k), exact, places=13, msg=(n, k))
+
+    def test_smooth_function(self):
+        self.assertAlmostEqual(clenshaw_curtis(np.exp, 0, 1, 17), e - 1, places=14)
+        x = sympy.Symbol('x')
+        self.assertAlmostEqual(clenshaw_curtis(sympy.sin(x), 0, pi, 21), 2, places=14)
+
+    def test_error_estimate(self):
+        result = clenshaw_curtis(lambda x: 1 / (1 + 25 * x ** 2), -1, 1, 17, full_output=True)
+        self.assertEqual(result.n_evals, 17)
+        self.assertLess(abs(result.value - 0.4 * np.arctan(5)), result.error)
+        self.assertIsNone(clenshaw_curtis(np.exp, 0, 1, 8, full_output=True).error)
+
+    def test_sparse_grid_levels(self):
+        # The levels of the Smolyak construction are the rules with 2^(level - 1) + 1 nodes
+        for level in (2, 3, 6):
+            plain = get_nodes('clenshaw_curtis', 2 ** (level - 1) + 1)
+            for nested_array, plain_array in zip(_nested_clenshaw_curtis(level), plain):
+                np.testing.assert_array_equal(nested_array, plain_array)
+
+    def test_nodes_are_cached(self):
+        get_nodes('clenshaw_curtis', 40)
+        hits = cache_info().hits
+        clenshaw_curtis(np.cos, 0, 1, 40)
+        self.assertEqual(cache_info().hits, hits + 1)
+
+    def test_incremental_reuses_values(self):
+        points = []
+
+        def f(x):
+            points.extend(np.atleast_1d(x))
+            return np.exp(x)
+
+        result = clenshaw_curtis_incremental(f, 0, 1, 1e-14, n=5, max_levels=3, full_output=True)
+        self.assertEqual(result.n_evals, 17)
+        self.assertEqual(len(points), 17)
+        self.assertEqual(len(set(points)), 17)
+        self.assertAlmostEqual(result.value, clenshaw_curtis(np.exp, 0, 1, 17), places=15)
+
+    def test_incremental_converges(self):
+        I, error = clenshaw_curtis_incremental(lambda x: 1 / (1 + 25 * x ** 2), -1, 1, 1e-10)
+        self.assertAlmostEqual(I, 0.4 * np.arctan(5), places=10)
+        self.assertLessEqual(error, 1e-10)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            clenshaw_curtis(np.exp, 0, 1, 1)
+        with self.assertRaises(ValueError):
+            clenshaw_curtis_incremental(np.exp, 0, 1, 1e-6, max_levels=1)
+        with self.assertRaisesRegex(Exception, 'upper limit') as context:
+            clenshaw_curtis(np.exp, 1, 0, 5)
+        self.assertEqual(type(context.exception).__name__, 'InvalidIntervalException')
+
+
+class TestFejer(unittest.TestCase):
+
+    def test_exact_for_polynomials(self):
+        for rule in ('fejer1', 'fejer2'):
+            for n in (1, 2, 7, 30):
+                nodes, weights = get_nodes(rule, n)
+                self.assertTrue(np.all(np.abs(nodes) < 1))
+                self.assertTrue(np.all(weights > 0))
+                for k in range(n):
+                    exact = (1 - (-1) ** (k + 1)) / (k + 1)
+                    self.assertAlmostEqual(np.dot(weights, nodes ** k), exact, places=13, msg=(rule, n, k))
+
+    def test_both_kinds(self):
+        for kind in (1, 2):
+            self.assertAlmostEqual(fejer(np.exp, 0, 1, 16, kind=kind), e - 1, places=14, msg=kind)
+            result = fejer(np.exp, 0, 1, 15, kind=kind, full_output=True)
+            self.assertLess(abs(result.value - (e - 1)), result.error)
+
+    def test_endpoint_singularity(self):
+        # The nodes are interior, so f is never evaluated at the singular endpoint
+        for kind in (1, 2):
+            I, error = fejer_incremental(lambda x: 1 / np.sqrt(x), 0, 1, 1e-6, kind=kind, max_levels=16)
+            self.assertAlmostEqual(I, 2, places=4, msg=kind)
+
+    def test_incremental_reuses_values(self):
+        for kind, n_evals in ((1, 3 + 6 + 18), (2, 3 + 4 + 8)):
+            points = []
+
+            def f(x):
+                points.extend(np.atleast_1d(x))
+                return np.cos(x)
+
+            result = fejer_incremental(f, 0, 1, 1e-14, n=3, kind=kind, max_levels=3, full_output=True)
+            self.assertEqual(result.n_evals, n_evals)
+            self.assertEqual(len(set(points)), n_evals)
+            self.assertAlmostEqual(result.value, np.sin(1), places=12)
+
+    def test_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            fejer(np.exp, 0, 1, 5, kind=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from math import erf, exp, pi, sqrt
+
+import numpy as np
+import sympy
+
+from source import double_gauss_legendre, instrumentation, smolyak, tensor_gauss_legendre
+from source.cubature import cache_info, smolyak_grid
+
+
+class TestTensorGaussLegendre(unittest.TestCase):
+
+    def test_separable(self):
+        f = lambda x, y, z: np.exp(x + y + z)
+        self.assertAlmostEqual(tensor_gauss_legendre(f, [(0, 1)] * 3, 8), (exp(1) - 1) ** 3, places=12)
+
+    def test_matches_double_gauss_legendre(self):
+        f = lambda x, y: np.sin(x * y)
+        c, d = (lambda y: y ** 2), (lambda y: 1 + y)
+        self.assertAlmostEqual(tensor_gauss_legendre(f, [(c, d), (0, 1)], (6, 5)),
+                               double_gauss_legendre(f, 0, 1, c, d, 5, 6), places=14)
+
+    def test_callable_limits(self):
+        # Volume of the unit tetrahedron
+        limits = [(0, lambda y, z: 1 - y - z), (0, lambda z: 1 - z), (0, 1)]
+        self.assertAlmostEqual(tensor_gauss_legendre(lambda x, y, z: np.ones_like(x), limits, 3), 1 / 6, places=14)
+
+    def test_sympy(self):
+        x, y = sympy.symbols('x y')
+        self.assertAlmostEqual(tensor_gauss_legendre(x * y, [(0, y), (0, 1)], 3), 1 / 8, places=14)
+
+        # Evaluations of the limits are not counted as evaluations of the integrand
+        with instrumentation.collect() as stats:
+            result = tensor_gauss_legendre(x * y, [(0, y), (0, 1)], 5, full_output=True)
+        self.assertEqual(stats.n_evals, result.n_evals)
+
+    def test_single_call(self):
+        calls = []
+
+        def f(*x):
+            calls.append(np.shape(x[0]))
+            return np.cos(sum(x))
+
+        result = tensor_gauss_legendre(f, [(0, 1)] * 4, 3, full_output=True)
+        self.assertEqual(calls, [(81,)])
+        self.assertEqual(result.n_evals, 81)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            tensor_gauss_legendre(lambda x, y: x, [(0, 1), (0, lambda x: x)], 3)
+        with self.assertRaisesRegex(Exception, 'upper limit') as context:
+            tensor_gauss_legendre(lambda x, y: x, [(1, 0), (0, 1)], 3)
+        self.assertEqual(type(context.exception).__name__, 'InvalidIntervalException')
+
+
+class TestSmolyak(unittest.TestCase):
+
+    def test_polynomial_exactness(self):
+        # Level 4 is exact up to total degree 7
+        f = lambda *x: x[0] ** 3 * x[1] ** 2 * x[2] ** 2 + x[3] ** 6 + 1
+        self.assertAlmostEqual(smolyak(f, [(0, 1)] * 5, 4), 1 / 36 + 1 / 7 + 1, places=13)
+
+    def test_grid_size_and_cache(self):
+        points, weights, coarse_weights = smolyak_grid(5, 5)
+        self.assertEqual(points.shape, (801, 5))
+        self.assertAlmostEqual(weights.sum(), 32, places=10)
+        self.assertAlmostEqual(coarse_weights.sum(), 32, places=10)
+        self.assertFalse(weights.flags.writeable)
+
+        hits = cache_info().hits
+        smolyak_grid(5, 5)
+        self.assertEqual(cache_info().hits, hits + 1)
+
+    def test_gaussian_expectation(self):
+        exact = (sqrt(pi) * erf(1)) ** 4
+        result = smolyak(lambda *x: np.exp(-sum(xi ** 2 for xi in x)), [(-1, 1)] * 4, 9, full_output=True)
+        self.assertAlmostEqual(result.value, exact, places=4)
+        self.assertLess(abs(result.value - exact), result.error)
+        self.assertLess(result.n_evals, 20 ** 4)
+
+    def test_callable_limits(self):
+        self.assertAlmostEqual(smolyak(lambda x, y: x, [(0, lambda y: y), (0, 1)], 3), 1 / 6, places=14)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from math import sqrt
+
+import numpy as np
+import sympy
+
+from source.gauss_kronrod import gauss_kronrod
+from source.global_adaptive import global_adaptive
+from source.node_cache import get_nodes
+
+
+class TestGaussKronrod(unittest.TestCase):
+
+    def test_tables_are_exact(self):
+        # G(n)K(2n+1) integrates polynomials up to degree 3n + 1 exactly, its Gauss part up to degree 2n - 1
+        for n in (7, 10, 15, 20, 25, 30):
+            nodes, (kronrod_weights, gauss_weights) = get_nodes('kronrod', n)
+            self.assertEqual(len(nodes), 2 * n + 1)
+            self.assertEqual(np.count_nonzero(gauss_weights), n)
+            for k in range(3 * n + 2):
+                exact = 2 / (k + 1) if k % 2 == 0 else 0.0
+                self.assertAlmostEqual(np.dot(kronrod_weights, nodes ** k), exact, places=13)
+                if k < 2 * n:
+                    self.assertAlmostEqual(np.dot(gauss_weights, nodes ** k), exact, places=13)
+
+    def test_gauss_part_matches_legendre(self):
+        nodes, (_, gauss_weights) = get_nodes('kronrod', 10)
+        legendre_nodes, legendre_weights = get_nodes('legendre', 10)
+        np.testing.assert_allclose(nodes[gauss_weights != 0], legendre_nodes, atol=1e-15)
+        np.testing.assert_allclose(gauss_weights[gauss_weights != 0], legendre_weights, atol=1e-15)
+
+    def test_smooth_integrand(self):
+        x = sympy.symbols('x')
+        result, error = gauss_kronrod(sympy.exp(x), 0, 1)
+        self.assertAlmostEqual(result, np.e - 1, places=14)
+        self.assertLess(error, 1e-12)
+
+    def test_error_estimate_is_conservative(self):
+        # sqrt is not smooth at 0, so the estimate must cover the actual error
+        result, error = gauss_kronrod(lambda x: sqrt(x), 0, 1, 15)
+        self.assertGreater(error, abs(result - 2 / 3))
+
+    def test_unknown_order(self):
+        with self.assertRaises(ValueError):
+            gauss_kronrod(np.exp, 0, 1, 8)
+
+    def test_adaptive_local_rule(self):
+        result = global_adaptive(np.sqrt, 0, 1, 1e-10, rule='gauss_kronrod', full_output=True)
+        self.assertTrue(result.converged)
+        self.assertAlmostEqual(result.estimate, 2 / 3, delta=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from math import sin, pi, exp
 from sympy import symbols, sin as sym_sin, exp as sym_exp
 from sympy.utilities.lambdify import lambdify
+import numpy as np
 from source.gauss_legendre import gauss_legendre
 
 class TestGaussLegendre(unittest.TestCase):
@@ -30,5 +31,38 @@ class TestGaussLegendre(unittest.TestCase):
         result = gauss_legendre(expr, 0, 1, 5)
         self.assertAlmostEqual(result, exp(1) - 1, places=5)
 
+    def test_vectorized_single_call(self):
+        calls = []
+
+        def f(x):
+            calls.append(np.shape(x))
+            return np.exp(x)
+
+        result = gauss_legendre(f, 0, 1, 64, vectorized=True)
+        self.assertAlmostEqual(result, exp(1) - 1, places=12)
+        self.assertEqual(calls, [(64,)])
+
+    def test_scalar_fallback(self):
+        # math.sin cannot take arrays, so the automatic mode falls back to one call per node
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return sin(x)
+
+        result = gauss_legendre(f, 0, pi, 8)
+        self.assertAlmostEqual(result, 2, places=8)
+        self.assertEqual(len(calls), 1 + 8)
+
+    def test_scalar_flag(self):
+        with self.assertRaises(TypeError):
+            gauss_legendre(lambda x: sin(x), 0, pi, 8, vectorized=True)
+        result = gauss_legendre(lambda x: sin(x), 0, pi, 8, vectorized=False)
+        self.assertAlmostEqual(result, 2, places=8)
+
+    def test_constant_function(self):
+        result = gauss_legendre(lambda x: 3.0, 0, 2, 4)
+        self.assertAlmostEqual(result, 6.0, places=12)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
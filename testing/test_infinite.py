@@ -0,0 +1,80 @@
+import unittest
+from math import exp, pi, sqrt
+
+import numpy as np
+import sympy
+
+from source import (adaptive_composite_simpson, adaptive_midpoint, adaptive_simpson, adaptive_trapezoidal,
+                    gauss_hermite, gauss_kronrod, gauss_laguerre, global_adaptive, integrate)
+from source.node_cache import cache_info, get_nodes
+from source.transforms import transform_interval
+
+
+class TestGaussLaguerreHermite(unittest.TestCase):
+
+    def test_laguerre_weighted_is_exact(self):
+        # int_1^inf exp(-(x - 1) / 2) x^3 dx = 2 * E[(1 + 2Y)^3] for Y ~ Exp(1)
+        self.assertAlmostEqual(gauss_laguerre(lambda x: x ** 3, 1, 2, scale=2, weighted=True), 158, places=10)
+
+    def test_laguerre_unweighted(self):
+        self.assertAlmostEqual(gauss_laguerre(lambda x: x ** 2 * np.exp(-x), 0, 10), 2, places=12)
+        x = sympy.Symbol('x')
+        self.assertAlmostEqual(gauss_laguerre(sympy.exp(-3 * x), 0, 5, scale=1 / 3), 1 / 3, places=12)
+
+    def test_hermite(self):
+        self.assertAlmostEqual(gauss_hermite(lambda x: np.exp(-x ** 2), 10), sqrt(pi), places=12)
+
+        # E[X^2] for X ~ N(1, 2^2)
+        scale = 2 * sqrt(2)
+        expectation = gauss_hermite(lambda x: x ** 2, 5, loc=1, scale=scale, weighted=True) / (scale * sqrt(pi))
+        self.assertAlmostEqual(expectation, 5, places=12)
+
+    def test_nodes_are_cached(self):
+        get_nodes('hermite', 12)
+        hits = cache_info().hits
+        gauss_hermite(np.cos, 12, weighted=True)
+        self.assertEqual(cache_info().hits, hits + 1)
+
+    def test_invalid_scale(self):
+        with self.assertRaises(ValueError):
+            gauss_laguerre(np.exp, 0, 5, scale=0)
+        with self.assertRaises(ValueError):
+            gauss_hermite(np.exp, 5, scale=-1)
+
+
+class TestInfiniteLimits(unittest.TestCase):
+
+    def test_finite_limits_unchanged(self):
+        f = lambda x: x
+        self.assertEqual(transform_interval(f, 0, 1), (f, 0, 1))
+
+    def test_substitution_vanishes_at_infinity(self):
+        g, a, b = transform_interval(lambda x: 1 / (1 + x ** 2), -np.inf, np.inf)
+        self.assertEqual((a, b), (-1.0, 1.0))
+        np.testing.assert_array_equal(g(np.array([-1.0, 1.0])), [0.0, 0.0])
+        self.assertEqual(g(1.0), 0.0)
+
+    def test_gauss_kronrod(self):
+        f = lambda x: 1 / (1 + x ** 2)
+        I, error = gauss_kronrod(f, 0, np.inf, 15)
+        self.assertAlmostEqual(I, pi / 2, places=8)
+        I, error = gauss_kronrod(f, -np.inf, np.inf, 15)
+        self.assertAlmostEqual(I, pi, places=8)
+        self.assertLess(abs(I - pi), error)
+
+    def test_adaptive_rules(self):
+        f = lambda x: np.exp(-x ** 2)
+        for rule in (adaptive_simpson, adaptive_trapezoidal, adaptive_composite_simpson, global_adaptive, integrate):
+            self.assertAlmostEqual(rule(f, -np.inf, np.inf, 1e-9), sqrt(pi), places=7, msg=rule.__name__)
+            self.assertAlmostEqual(rule(f, -np.inf, 0, 1e-9), sqrt(pi) / 2, places=7, msg=rule.__name__)
+
+        # The midpoint error estimate is optimistic on finite intervals too
+        self.assertAlmostEqual(adaptive_midpoint(f, -np.inf, np.inf, 1e-7), sqrt(pi), places=5)
+
+    def test_sweep_mode_and_scalar_integrand(self):
+        self.assertAlmostEqual(adaptive_simpson(lambda x: np.exp(-x), 0, np.inf, 1e-9, mode='sweep'), 1, places=8)
+        self.assertAlmostEqual(global_adaptive(lambda x: exp(-x), 1, np.inf, 1e-10), exp(-1), places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+
+import numpy as np
+import sympy
+
+from source import instrumentation, lambdify_cache
+from source.adaptive_simpson import adaptive_simpson
+from source.async_integration import gauss_legendre_async
+from source.composite_simpson import composite_simpson
+from source.double_gauss_legendre import double_gauss_legendre
+from source.gauss_legendre import gauss_legendre
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_counts_and_phases(self):
+        x = sympy.Symbol('x')
+        lambdify_cache.clear_cache()
+        with instrumentation.collect() as stats:
+            gauss_legendre(sympy.cos(x) * x, 0, 1, 12)
+            composite_simpson(np.exp, 0, 1, 10)
+
+        self.assertEqual(stats.calls, {'gauss_legendre': 1, 'composite_simpson': 1})
+        self.assertEqual(stats.n_evals, 12 + 11)
+        self.assertEqual(stats.n_f_calls, 2)
+        self.assertGreater(stats.times['compile'], 0)
+        self.assertGreater(stats.times['evaluation'], 0)
+        self.assertGreaterEqual(stats.times['total'], stats.times['compile'] + stats.times['evaluation'])
+
+    def test_adaptive_depths(self):
+        with instrumentation.collect() as stats:
+            result = adaptive_simpson(np.sqrt, 0, 1, 1e-8, full_output=True)
+
+        self.assertEqual(stats.n_evals, result.n_evals)
+        self.assertEqual(stats.n_intervals, result.n_intervals)
+        self.assertEqual(sum(stats.depth_histogram.values()), result.n_intervals)
+
+    def test_limits_are_not_counted(self):
+        with instrumentation.collect() as stats:
+            result = double_gauss_legendre(lambda x, y: x * y, 0, 1, 0, lambda y: y, 6, 4, full_output=True)
+
+        self.assertEqual(stats.n_evals, result.n_evals)
+        self.assertEqual(stats.n_f_calls, 1)
+
+    def test_disabled_leaves_integrand_alone(self):
+        f = lambda x: x
+        self.assertIs(lambdify_cache.as_callable(f), f)
+        with instrumentation.collect():
+            self.assertIsNot(lambdify_cache.as_callable(f), f)
+
+    def test_callback_and_hook(self):
+        seen = []
+        hook = lambda name, stats: seen.append((name, stats.n_evals))
+        instrumentation.add_hook(hook)
+        try:
+            with instrumentation.collect(callback=lambda stats: seen.append(('block', stats.n_evals))):
+                asyncio.run(gauss_legendre_async(np.exp, 0, 1, 6))
+                gauss_legendre(np.exp, 0, 1, 4)
+        finally:
+            instrumentation.remove_hook(hook)
+
+        self.assertEqual(seen, [('gauss_legendre_async', 6), ('gauss_legendre', 4), ('block', 10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
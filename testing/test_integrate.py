@@ -0,0 +1,65 @@
+import unittest
+from math import e, sin
+
+import numpy as np
+import sympy
+
+from source import instrumentation
+from source.integrate import integrate
+
+
+class TestIntegrate(unittest.TestCase):
+
+    def test_smooth_stops_at_first_probe(self):
+        result = integrate(np.exp, 0, 1, 1e-10, full_output=True)
+        self.assertEqual(result.method, 'gauss_kronrod(n=7)')
+        self.assertEqual(result.n_evals, 15)
+        self.assertTrue(result.converged)
+        self.assertAlmostEqual(result, e - 1, places=14)
+
+    def test_oscillatory_escalates_order(self):
+        result = integrate(lambda x: np.cos(30 * x), 0, 1, 1e-10, full_output=True)
+        self.assertTrue(result.method.startswith('gauss_kronrod(n=7) -> gauss_kronrod(n=15)'))
+        self.assertNotIn('global_adaptive', result.method)
+        self.assertAlmostEqual(result, sin(30) / 30, places=12)
+
+    def test_singular_reaches_tolerance(self):
+        for f, exact in ((np.sqrt, 2 / 3), (lambda x: np.abs(x - 0.3), 0.29), (np.log, -1.0)):
+            result = integrate(f, 0, 1, 1e-10, full_output=True)
+            self.assertTrue(result.converged, result.method)
+            self.assertLessEqual(result.error, 1e-10)
+            self.assertLess(abs(result - exact), 1e-10)
+            self.assertGreater(len(result.method.split(' -> ')), 2)
+
+    def test_counts_every_evaluation(self):
+        with instrumentation.collect() as stats:
+            result = integrate(np.sqrt, 0, 1, 1e-9, full_output=True)
+        self.assertEqual(stats.n_evals, result.n_evals)
+        self.assertEqual(stats.calls['integrate'], 1)
+
+    def test_max_evals(self):
+        result = integrate(np.log, 0, 1, 1e-14, max_evals=200, full_output=True)
+        self.assertFalse(result.converged)
+        self.assertLessEqual(result.n_evals, 200 + 2 * 15)
+
+    def test_sympy_expr(self):
+        x = sympy.Symbol('x')
+        self.assertAlmostEqual(integrate(x ** 2 * sympy.exp(x), 0, 1), e - 2, places=10)
+
+    def test_tolerance_below_rounding_error(self):
+        # The tolerance is raised to 50 * eps * |integral|, which the probes meet
+        result = integrate(np.exp, 0, 1, 1e-20, full_output=True)
+        self.assertTrue(result.converged)
+        self.assertEqual(result.method, 'gauss_kronrod(n=7)')
+        self.assertAlmostEqual(result.value, e - 1, places=14)
+
+    def test_invalid_input(self):
+        with self.assertRaisesRegex(Exception, "upper limit") as context:
+            integrate(np.exp, 1, 0)
+        self.assertEqual(type(context.exception).__name__, 'InvalidIntervalException')
+        with self.assertRaises(ValueError):
+            integrate(np.exp, 0, 1, tol=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
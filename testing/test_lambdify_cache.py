@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+import sympy
+
+from source import lambdify_cache
+from source.gauss_legendre import gauss_legendre
+
+
+class TestLambdifyCache(unittest.TestCase):
+
+    def setUp(self):
+        lambdify_cache.clear_cache()
+        lambdify_cache.set_cache_size(512)
+
+    def tearDown(self):
+        lambdify_cache.set_cache_size(512)
+
+    def test_hits_and_misses(self):
+        x = sympy.Symbol('x')
+        gauss_legendre(sympy.exp(x), 0, 1, 5)
+        gauss_legendre(sympy.exp(x), 0, 2, 5)
+        info = lambdify_cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_structural_key(self):
+        # Equal expressions built separately share one entry
+        first = lambdify_cache.compile_expr(sympy.Symbol('x') ** 2 + 1)
+        second = lambdify_cache.compile_expr(1 + sympy.Symbol('x') ** 2)
+        self.assertIs(first, second)
+        self.assertEqual(lambdify_cache.cache_info().currsize, 1)
+
+        # The same expression in other variables does not
+        x, y = sympy.symbols('x y')
+        lambdify_cache.compile_expr(x * y, 'x y')
+        lambdify_cache.compile_expr(x * y, 'y x')
+        info = lambdify_cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 3, 3))
+
+    def test_lru_eviction(self):
+        x = sympy.Symbol('x')
+        lambdify_cache.set_cache_size(2)
+        lambdify_cache.compile_expr(x)
+        lambdify_cache.compile_expr(x ** 2)
+        lambdify_cache.compile_expr(x)  # x is now the most recently used
+        lambdify_cache.compile_expr(x ** 3)  # evicts x ** 2
+
+        self.assertEqual(lambdify_cache.cache_info().currsize, 2)
+        misses = lambdify_cache.cache_info().misses
+        lambdify_cache.compile_expr(x)
+        self.assertEqual(lambdify_cache.cache_info().misses, misses)
+        lambdify_cache.compile_expr(x ** 2)
+        self.assertEqual(lambdify_cache.cache_info().misses, misses + 1)
+
+    def test_clear_cache(self):
+        lambdify_cache.compile_expr(sympy.Symbol('x') ** 4)
+        lambdify_cache.clear_cache()
+        info = lambdify_cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+    def test_compiled_function(self):
+        x = sympy.Symbol('x')
+        fun = lambdify_cache.as_callable(sympy.sin(x))
+        np.testing.assert_allclose(fun(np.array([0.0, np.pi / 2])), [0.0, 1.0], atol=1e-15)
+        f = lambda x: x
+        self.assertIs(lambdify_cache.as_callable(f), f)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Seconds allowed for importing the toolbox on top of numpy. SymPy alone takes several times this long.
+IMPORT_BUDGET = 0.25
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    """Runs code in a fresh interpreter, so modules loaded by the test runner do not leak in."""
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_sympy_not_loaded_for_callables(self):
+        out = _run(
+            "import sys\n"
+            "import source\n"
+            "from source import gauss_legendre, romberg, adaptive_midpoint, double_gauss_legendre\n"
+            "gauss_legendre(lambda x: x ** 2, 0, 1, 5)\n"
+            "adaptive_midpoint(lambda x: x ** 2, 0, 1, 1e-6)\n"
+            "print('sympy' in sys.modules)\n"
+        )
+        self.assertEqual(out, 'False')
+
+    def test_sympy_loaded_on_demand(self):
+        out = _run(
+            "import sympy\n"
+            "from source import gauss_legendre\n"
+            "print(round(gauss_legendre(sympy.Symbol('x') ** 2, 0, 1, 5), 10))\n"
+        )
+        self.assertEqual(out, str(round(1 / 3, 10)))
+
+    def test_package_exposes_functions(self):
+        out = _run(
+            "import source.gauss_legendre\n"
+            "from source import gauss_legendre, batch_simpson\n"
+            "print(callable(gauss_legendre), callable(batch_simpson))\n"
+        )
+        self.assertEqual(out, 'True True')
+
+    def test_same_name_submodule_stays_reachable(self):
+        # The package attribute shadows the submodule of the same name, which sys.modules still holds
+        out = _run(
+            "import importlib, sys, types\n"
+            "import source.gauss_legendre as gl\n"
+            "module = importlib.import_module('source.gauss_legendre')\n"
+            "print(callable(gl), isinstance(module, types.ModuleType), sys.modules['source.gauss_legendre'] is module,"
+            " module.gauss_legendre is gl)\n"
+        )
+        self.assertEqual(out, 'True True True True')
+
+    def test_import_time_budget(self):
+        out = _run(
+            "import time\n"
+            "import numpy\n"
+            "start = time.perf_counter()\n"
+            "import source\n"
+            "for name in source.__all__:\n"
+            "    getattr(source, name)\n"
+            "print(time.perf_counter() - start)\n"
+        )
+        self.assertLess(float(out), IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from math import erf, pi, sqrt
+
+import numpy as np
+
+from source import quasi_monte_carlo
+from source.monte_carlo import BITS, _halton, _sobol
+
+# int over [0, 1]^6 of exp(-|x|^2)
+GAUSSIAN_6D = (sqrt(pi) / 2 * erf(1)) ** 6
+
+
+def gaussian(*x):
+    return np.exp(-sum(xi ** 2 for xi in x))
+
+
+class TestSequences(unittest.TestCase):
+
+    def test_sobol_first_points(self):
+        points = _sobol(3, 0, 8) * 2.0 ** -BITS
+        np.testing.assert_array_equal(points[:, 0], [0, 0.5, 0.75, 0.25, 0.375, 0.875, 0.625, 0.125])
+        np.testing.assert_array_equal(points[:, 1], [0, 0.5, 0.25, 0.75, 0.375, 0.875, 0.125, 0.625])
+        np.testing.assert_array_equal(points[:, 2], [0, 0.5, 0.25, 0.75, 0.625, 0.125, 0.875, 0.375])
+
+    def test_sobol_blocks_are_consistent(self):
+        np.testing.assert_array_equal(_sobol(5, 0, 64)[40:], _sobol(5, 40, 24))
+
+    def test_sobol_stratification(self):
+        # The first 2^m points fill every interval [k / 2^m, (k + 1) / 2^m) of every coordinate once
+        points = _sobol(21, 0, 256) >> np.uint64(BITS - 8)
+        for d in range(21):
+            self.assertEqual(len(np.unique(points[:, d])), 256)
+
+    def test_halton(self):
+        np.testing.assert_allclose(_halton(2, 1, 3), [[1 / 2, 1 / 3], [1 / 4, 2 / 3], [3 / 4, 1 / 9]])
+
+
+class TestQuasiMonteCarlo(unittest.TestCase):
+
+    def test_converges_to_tolerance(self):
+        for sequence in ('sobol', 'halton'):
+            result = quasi_monte_carlo(gaussian, [(0, 1)] * 6, 1e-5, sequence=sequence, seed=0, full_output=True)
+            self.assertTrue(result.converged)
+            self.assertLessEqual(result.error, 1e-5)
+            self.assertAlmostEqual(result.value, GAUSSIAN_6D, places=4, msg=sequence)
+
+    def test_early_stop_and_budget(self):
+        result = quasi_monte_carlo(gaussian, [(0, 1)] * 6, 1e-3, block_size=256, seed=0, full_output=True)
+        self.assertEqual(result.n_evals, 8 * 256)
+
+        result = quasi_monte_carlo(gaussian, [(0, 1)] * 6, 1e-12, sequence='random', block_size=256,
+                                   max_evals=10 ** 4, seed=0, full_output=True)
+        self.assertFalse(result.converged)
+        self.assertLessEqual(result.n_evals, 10 ** 4)
+
+    def test_seed_reproducible(self):
+        run = lambda seed: quasi_monte_carlo(gaussian, [(0, 1)] * 4, 1e-4, seed=seed)
+        self.assertEqual(run(7), run(7))
+        self.assertNotEqual(run(7), run(8))
+
+    def test_block_calls(self):
+        calls = []
+
+        def f(x, y):
+            calls.append(len(x))
+            return x * y
+
+        quasi_monte_carlo(f, [(0, 1), (0, 1)], 1e-3, block_size=128, replicates=4, seed=0)
+        self.assertTrue(all(n == 4 * 128 for n in calls))
+
+    def test_callable_limits_and_vector_values(self):
+        self.assertAlmostEqual(quasi_monte_carlo(lambda x, y: x, [(0, lambda y: y), (0, 1)], 1e-6, seed=0),
+                               1 / 6, places=5)
+        np.testing.assert_allclose(quasi_monte_carlo(lambda x, y: np.stack([x, y], axis=-1), [(0, 1), (0, 2)],
+                                                     1e-5, seed=0), [1, 2], atol=1e-4)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            quasi_monte_carlo(gaussian, [(0, 1)] * 2, sequence='lattice')
+        with self.assertRaises(ValueError):
+            quasi_monte_carlo(gaussian, [(0, 1)] * 22)
+        with self.assertRaises(ValueError):
+            quasi_monte_carlo(gaussian, [(0, 1)] * 2, replicates=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
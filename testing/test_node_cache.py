@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from source import node_cache
+from source.gauss_legendre import gauss_legendre
+
+
+class TestNodeCache(unittest.TestCase):
+
+    def setUp(self):
+        node_cache.clear_cache()
+        node_cache.set_cache_size(256)
+
+    def test_matches_leggauss(self):
+        nodes, weights = node_cache.get_nodes('legendre', 12)
+        expected_nodes, expected_weights = np.polynomial.legendre.leggauss(12)
+        np.testing.assert_array_equal(nodes, expected_nodes)
+        np.testing.assert_array_equal(weights, expected_weights)
+
+    def test_arrays_are_read_only(self):
+        nodes, weights = node_cache.get_nodes('legendre', 4)
+        with self.assertRaises(ValueError):
+            nodes[0] = 0.0
+        with self.assertRaises(ValueError):
+            weights[0] = 0.0
+
+    def test_hits_and_misses(self):
+        gauss_legendre(lambda x: x ** 2, 0, 1, 5)
+        gauss_legendre(lambda x: x ** 3, 0, 1, 5)
+        info = node_cache.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+
+    def test_dtype_is_part_of_key(self):
+        nodes32, _ = node_cache.get_nodes('legendre', 6, np.float32)
+        nodes64, _ = node_cache.get_nodes('legendre', 6)
+        self.assertEqual(nodes32.dtype, np.float32)
+        self.assertEqual(nodes64.dtype, np.float64)
+        self.assertEqual(node_cache.cache_info().currsize, 2)
+
+    def test_lru_eviction(self):
+        node_cache.set_cache_size(2)
+        node_cache.precompute('legendre', [2, 3, 4])
+        info = node_cache.cache_info()
+        self.assertEqual(info.currsize, 2)
+        node_cache.get_nodes('legendre', 2)  # evicted, so this is a miss
+        self.assertEqual(node_cache.cache_info().misses, 4)
+
+    def test_parse_orders(self):
+        self.assertEqual(node_cache._parse_orders('2-4, 8'), [2, 3, 4, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
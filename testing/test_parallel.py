@@ -0,0 +1,61 @@
+import gc
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import sympy
+
+from source.parallel import integrate_many
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        x = sympy.symbols('x')
+        self.jobs = [(sympy.exp(k * x), 0, 1, 1e-10) for k in range(1, 13)]
+        self.expected = [(np.exp(k) - 1) / k for k in range(1, 13)]
+
+    def test_process_pool_sympy(self):
+        results = integrate_many(self.jobs, max_workers=2)
+        np.testing.assert_allclose(results, self.expected, rtol=1e-9)
+
+    def test_thread_pool_as_completed(self):
+        results = dict(integrate_many(self.jobs, executor='thread', max_workers=3, chunk_size=5, ordered=False))
+        self.assertEqual(sorted(results), list(range(len(self.jobs))))
+        np.testing.assert_allclose([results[i] for i in range(len(self.jobs))], self.expected, rtol=1e-9)
+
+    def test_unstarted_iterator_shuts_pool_down(self):
+        pools = []
+
+        class RecordingPool(ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                pools.append(self)
+
+        with mock.patch('source.parallel.ThreadPoolExecutor', RecordingPool):
+            iterator = integrate_many(self.jobs, executor='thread', max_workers=2, ordered=False)
+            del iterator
+            gc.collect()
+
+        self.assertEqual(len(pools), 1)
+        with self.assertRaises(RuntimeError):
+            pools[0].submit(abs, -1)  # a pool that was shut down refuses new work
+
+    def test_existing_executor_is_left_running(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = dict(integrate_many(self.jobs, executor=pool, max_workers=2, ordered=False))
+            self.assertEqual(len(results), len(self.jobs))
+            self.assertEqual(pool.submit(abs, -1).result(), 1)
+
+    def test_method_by_name(self):
+        results = integrate_many([(lambda x: x ** 2, 0, 3, 3)], method='romberg', executor='thread')
+        self.assertAlmostEqual(results[0][-1, -1], 9)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            integrate_many(self.jobs, method='gauss_lobatto', executor='thread')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from math import exp, e
+
+import numpy as np
+
+from source import (IntegrationResult, adaptive_simpson, batch_simpson, composite_simpson, composite_trapezoid,
+                    gauss_kronrod, gauss_legendre, midpoint, romberg, romberg_incremental)
+from source.adaptive_engine import AdaptiveResult
+
+
+class TestIntegrationResult(unittest.TestCase):
+
+    def test_behaves_like_value(self):
+        result = IntegrationResult(2.0, 1e-10, 5, method='test')
+        self.assertEqual(float(result), 2.0)
+        self.assertEqual(result + 1, 3.0)
+        self.assertEqual(1 - result, -1.0)
+        self.assertEqual(result * result, 4.0)
+        self.assertEqual(result, 2.0)
+        self.assertLess(result, 3)
+        self.assertEqual(f'{result:.3f}', '2.000')
+        self.assertEqual(np.sqrt(result), np.sqrt(2.0))
+        self.assertAlmostEqual(result, 2.0)
+        self.assertEqual(result.estimate, 2.0)
+
+    def test_hash_and_equality(self):
+        result = IntegrationResult(2.0)
+        self.assertEqual(hash(result), hash(2.0))
+        self.assertIn(result, {2.0})
+        self.assertIs(result == IntegrationResult(2.0), True)
+        self.assertIs(result != 3.0, True)
+
+        vector = IntegrationResult(np.array([1.0, 2.0]))
+        with self.assertRaisesRegex(TypeError, 'scalar'):
+            hash(vector)
+        with self.assertRaisesRegex(TypeError, 'scalar'):
+            vector == np.array([1.0, 2.0])
+        with self.assertRaisesRegex(TypeError, 'scalar'):
+            result != vector
+        np.testing.assert_array_equal(vector + 1, [2.0, 3.0])
+
+    def test_adaptive_result_alias(self):
+        self.assertIs(AdaptiveResult, IntegrationResult)
+        result = adaptive_simpson(lambda x: np.exp(x), 0, 1, 1e-8, full_output=True)
+        self.assertIsInstance(result, IntegrationResult)
+        self.assertEqual(result.method, 'adaptive_simpson')
+        self.assertTrue(result.converged)
+
+    def test_fixed_rules(self):
+        result = midpoint(lambda x: x ** 2, 0, 1, full_output=True)
+        self.assertEqual((result.n_evals, result.error, result.method), (1, None, 'midpoint'))
+        self.assertEqual(result.value, midpoint(lambda x: x ** 2, 0, 1))
+
+        result = gauss_legendre(lambda x: np.exp(x), 0, 1, 6, full_output=True)
+        self.assertEqual(result.n_evals, 6)
+        self.assertAlmostEqual(result, e - 1, places=10)
+
+        result = gauss_kronrod(lambda x: np.exp(x), 0, 1, full_output=True)
+        self.assertEqual((result.n_evals, result.method), (15, 'gauss_kronrod'))
+        self.assertLessEqual(abs(result - (e - 1)), result.error)
+
+    def test_composite_error_estimates(self):
+        exact = e - 1
+        result = composite_simpson(lambda x: np.exp(x), 0, 1, 8, full_output=True)
+        self.assertEqual((result.n_evals, result.n_intervals), (9, 8))
+        self.assertAlmostEqual(result.error, abs(result.value - exact), delta=abs(result.value - exact) * 0.1)
+
+        result = composite_trapezoid(lambda x: np.exp(x), 0, 1, 9, full_output=True)
+        self.assertEqual((result.n_evals, result.n_intervals), (9, 8))
+        self.assertAlmostEqual(result.error, abs(result.value - exact), delta=abs(result.value - exact) * 0.1)
+
+        # No coarser rule on every other point
+        self.assertIsNone(composite_simpson(lambda x: np.exp(x), 0, 1, 6, full_output=True).error)
+
+    def test_romberg(self):
+        table = romberg(lambda x: np.exp(x), 0, 1, 5)
+        result = romberg(lambda x: np.exp(x), 0, 1, 5, full_output=True)
+        self.assertEqual(result.value, table[-1, -1])
+        self.assertEqual((result.n_evals, result.n_intervals), (17, 16))
+        self.assertLess(abs(result - (e - 1)), result.error)
+
+        result = romberg_incremental(lambda x: np.exp(x), 0, 1, tol=1e-12, full_output=True)
+        self.assertTrue(result.converged)
+        self.assertAlmostEqual(result, exp(1) - 1, places=12)
+
+    def test_batch(self):
+        result = batch_simpson(lambda x: x ** 2, [0, 1, 2], [1, 2, 3], full_output=True)
+        self.assertEqual((result.n_evals, result.n_intervals), (9, 3))
+        np.testing.assert_allclose(result, [1 / 3, 7 / 3, 19 / 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
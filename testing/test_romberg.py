@@ -0,0 +1,81 @@
+import unittest
+from math import e
+
+import numpy as np
+
+from source.composite_trapezoid import composite_trapezoid
+from source.romberg import romberg, romberg_incremental
+
+
+def reference_table(f, a, b, n):
+    """The Romberg table with every trapezoid level computed from scratch."""
+    rarr = np.zeros((n, n))
+    for i in range(n):
+        rarr[i, 0] = composite_trapezoid(f, a, b, 2 ** i + 1)
+    for j in range(1, n):
+        for k in range(j, n):
+            rarr[k, j] = rarr[k, j - 1] + (rarr[k, j - 1] - rarr[k - 1, j - 1]) / (4 ** j - 1)
+    return rarr
+
+
+class CountingIntegrand:
+
+    def __init__(self, fun):
+        self.fun = fun
+        self.points = []
+
+    def __call__(self, x):
+        self.points.extend(np.atleast_1d(x))
+        return self.fun(x)
+
+
+class TestRomberg(unittest.TestCase):
+
+    def test_table_unchanged(self):
+        f = lambda x: np.sin(x) * np.exp(x)
+        for n in (1, 2, 6):
+            np.testing.assert_allclose(romberg(f, 0, 2, n), reference_table(f, 0, 2, n), rtol=1e-14, atol=1e-15)
+
+    def test_every_point_evaluated_once(self):
+        for n in (1, 3, 7):
+            f = CountingIntegrand(np.exp)
+            result = romberg(f, 0, 1, n, full_output=True)
+            self.assertEqual(len(f.points), 2 ** (n - 1) + 1)
+            self.assertEqual(len(set(f.points)), 2 ** (n - 1) + 1)
+            self.assertEqual(result.n_evals, 2 ** (n - 1) + 1)
+
+    def test_incremental_matches_table(self):
+        # With tol = 0 every level is computed, ending on the table's last diagonal entry
+        R, error = romberg_incremental(np.exp, 0, 1, 0.0, max_levels=6)
+        table = romberg(np.exp, 0, 1, 6)
+        self.assertAlmostEqual(R, table[-1, -1], places=15)
+        self.assertAlmostEqual(error, abs(table[-1, -1] - table[-2, -2]), places=15)
+
+    def test_incremental_stops_at_tol(self):
+        f = CountingIntegrand(np.exp)
+        result = romberg_incremental(f, 0, 1, 1e-10, full_output=True)
+        self.assertTrue(result.converged)
+        self.assertLessEqual(result.error, 1e-10)
+        self.assertAlmostEqual(result.value, e - 1, places=10)
+        self.assertEqual(len(f.points), result.n_evals)
+        self.assertLess(result.n_evals, 2 ** 19 + 1)
+
+        # One level earlier the diagonal had not yet converged
+        levels = int(np.log2(result.n_evals - 1)) + 1
+        self.assertGreater(romberg_incremental(np.exp, 0, 1, 1e-10, max_levels=levels - 1)[1], 1e-10)
+
+    def test_min_levels(self):
+        # Vanishes on the first two grids
+        f = lambda x: np.sin(2 * np.pi * x) ** 2
+        self.assertAlmostEqual(romberg_incremental(f, 0, 1, 1e-12, min_levels=2)[0], 0.0)
+        self.assertAlmostEqual(romberg_incremental(f, 0, 1, 1e-12)[0], 0.5, places=12)
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            romberg_incremental(np.exp, 0, 1, 1e-6, max_levels=1)
+        with self.assertRaisesRegex(Exception, "upper limit"):
+            romberg_incremental(np.exp, 1, 0, 1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
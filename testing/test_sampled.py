@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from source.composite_simpson import composite_simpson
+from source.composite_trapezoid import composite_trapezoid
+from source.sampled import sampled_trapezoid, sampled_simpson, cumulative_trapezoid
+
+
+class TestSampled(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.linspace(0, 2, 1001)
+        self.y = np.exp(self.x)
+        self.dx = self.x[1] - self.x[0]
+
+    def test_matches_composite_rules(self):
+        # Chunk sizes that do and do not split the Simpson pairs must give the same result
+        for chunk_size in (1, 2, 7, 8, 5000):
+            self.assertAlmostEqual(sampled_trapezoid(self.y, dx=self.dx, chunk_size=chunk_size),
+                                   composite_trapezoid(np.exp, 0, 2, 1001), places=12)
+            self.assertAlmostEqual(sampled_simpson(self.y, dx=self.dx, chunk_size=chunk_size),
+                                   composite_simpson(np.exp, 0, 2, 1000), places=12)
+
+    def test_non_uniform_chunk_iterator(self):
+        x = np.sort(np.r_[0, 2, np.random.default_rng(0).uniform(0, 2, 999)])
+        chunks = ((x[i:i + 13], np.exp(x[i:i + 13])) for i in range(0, len(x), 13))
+        self.assertAlmostEqual(sampled_simpson(chunks), np.exp(2) - 1, places=8)
+        self.assertAlmostEqual(sampled_simpson(np.exp(x), x=x, chunk_size=5), np.exp(2) - 1, places=8)
+
+    def test_odd_number_of_intervals(self):
+        with self.assertRaises(ValueError):
+            sampled_simpson(iter([self.y[:4], self.y[4:10]]))
+
+    def test_cumulative_to_memmap(self):
+        expected = cumulative_trapezoid(self.y, dx=self.dx)
+        self.assertEqual(expected[0], 0)
+        self.assertAlmostEqual(expected[-1], sampled_trapezoid(self.y, dx=self.dx), places=12)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'y.dat')
+            samples = np.memmap(path, dtype=np.float64, mode='w+', shape=self.y.shape)
+            samples[:] = self.y
+            out = cumulative_trapezoid(samples, dx=self.dx, out=os.path.join(tmp, 'out.dat'), chunk_size=64)
+            self.assertIsInstance(out, np.memmap)
+            np.testing.assert_allclose(out, expected, rtol=1e-14)
+            del samples, out
+
+
+if __name__ == '__main__':
+    unittest.main()
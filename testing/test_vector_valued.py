@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from math import exp, pi, sqrt
+
+import numpy as np
+
+from source import (adaptive_composite_simpson, adaptive_simpson, adaptive_trapezoidal, batch_gauss_legendre,
+                    composite_simpson, composite_trapezoid, double_gauss_legendre, gauss_kronrod, gauss_legendre,
+                    gauss_legendre_async, global_adaptive, integrate, romberg, romberg_incremental, simpson)
+
+MOMENTS = np.array([1, 1 / 2, 1 / 3])
+
+
+def moments(x):
+    """Vectorized integrand returning (npoints, 3) for an array of points."""
+    return np.stack([np.ones_like(x), x, x ** 2], axis=-1)
+
+
+def scalar_moments(x):
+    """Scalar-only integrand returning (3,) for a single point."""
+    return np.array([1.0, x, x * x])
+
+
+class TestVectorValued(unittest.TestCase):
+
+    def test_fixed_rules(self):
+        for f in (moments, scalar_moments):
+            np.testing.assert_allclose(simpson(f, 0, 1), MOMENTS)
+            np.testing.assert_allclose(composite_simpson(f, 0, 1, 8), MOMENTS)
+            np.testing.assert_allclose(gauss_legendre(f, 0, 1, 3), MOMENTS)
+            np.testing.assert_allclose(romberg(f, 0, 1, 3)[-1, -1], MOMENTS)
+
+    def test_error_estimates_are_norms(self):
+        result = composite_trapezoid(moments, 0, 1, 9, full_output=True)
+        self.assertEqual(result.value.shape, (3,))
+        self.assertIsInstance(result.error, float)
+
+        I, error = gauss_kronrod(lambda x: np.stack([np.exp(x), np.cos(30 * x)], axis=-1), 0, 1)
+        _, cos_error = gauss_kronrod(lambda x: np.cos(30 * x), 0, 1)
+        self.assertAlmostEqual(I[0], exp(1) - 1, places=12)
+        self.assertEqual(error, cos_error)
+
+    def test_adaptive_modes(self):
+        f = lambda x: np.stack([np.sqrt(x), np.exp(x)], axis=-1)
+        exact = [2 / 3, exp(1) - 1]
+        for mode in ('local', 'global', 'sweep'):
+            result = adaptive_simpson(f, 0, 1, 1e-9, mode=mode, full_output=True)
+            np.testing.assert_allclose(result.value, exact, atol=1e-8, err_msg=mode)
+            self.assertTrue(result.converged)
+
+        # The refinement is driven by the hardest component: exp(x) alone needs far fewer evaluations
+        self.assertGreater(adaptive_simpson(f, 0, 1, 1e-9, full_output=True).n_evals,
+                           adaptive_simpson(np.exp, 0, 1, 1e-9, full_output=True).n_evals)
+
+        for rule in (adaptive_trapezoidal, adaptive_composite_simpson, global_adaptive, integrate):
+            np.testing.assert_allclose(rule(f, 0, 1, 1e-9), exact, atol=1e-7, err_msg=rule.__name__)
+        np.testing.assert_allclose(global_adaptive(scalar_moments, 0, 1, 1e-10, rule='gauss_kronrod'), MOMENTS)
+        np.testing.assert_allclose(romberg_incremental(f, 0, 1, 1e-9)[0], exact, atol=1e-6)
+
+    def test_single_set_of_evaluations(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return moments(x)
+
+        gauss_legendre(f, 0, 1, 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_batch_and_double(self):
+        I = batch_gauss_legendre(moments, [[0, 0], [0, 1]], 2, 3)
+        self.assertEqual(I.shape, (2, 2, 3))
+        np.testing.assert_allclose(I[0, 0], [2, 2, 8 / 3])
+        np.testing.assert_allclose(I[1, 1], [1, 3 / 2, 7 / 3])
+
+        I = double_gauss_legendre(lambda x, y: np.stack([x * y, x + y], axis=-1), 0, 1, 0, 1, 3, 3)
+        np.testing.assert_allclose(I, [1 / 4, 1])
+
+    def test_infinite_limits(self):
+        f = lambda x: np.stack([np.exp(-x ** 2), x ** 2 * np.exp(-x ** 2)], axis=-1)
+        np.testing.assert_allclose(global_adaptive(f, -np.inf, np.inf, 1e-10), [sqrt(pi), sqrt(pi) / 2])
+        np.testing.assert_allclose(adaptive_simpson(lambda x: np.array([exp(-x), 1 / (1 + x * x)]), 0, np.inf, 1e-9),
+                                   [1, pi / 2], atol=1e-7)
+
+    def test_async(self):
+        np.testing.assert_allclose(asyncio.run(gauss_legendre_async(scalar_moments, 0, 1, 3)), MOMENTS)
+        np.testing.assert_allclose(asyncio.run(gauss_legendre_async(moments, 0, 1, 3, batch_size=2)), MOMENTS)
+
+
+if __name__ == '__main__':
+    unittest.main()